@@ -0,0 +1,81 @@
+"""
+Per-flip memory allocation: copy-on-write flip_card vs in-place flips inside
+a SessionTransaction, measured with tracemalloc.
+
+Run from backend/:  python -m benchmarks.bench_alloc
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from benchmarks.bench_board import CARD_COUNTS, _flip_script, _settings
+from src.domain.game import create_game, flip_card, flip_card_in_place
+from src.domain.transaction import SessionTransaction
+
+
+def _flip_copy_on_write(session, card_id):
+    updated, _ = flip_card(session, card_id, now=1.0)
+    return updated
+
+
+def _flip_in_place(session, card_id):
+    with SessionTransaction(session):
+        flip_card_in_place(session, card_id, now=1.0)
+    return session
+
+
+MODES = {"copy-on-write": _flip_copy_on_write, "in-place": _flip_in_place}
+
+
+def _games(card_count: int, games: int):
+    random.seed(card_count)
+    sessions = [create_game(f"g{i}", _settings(card_count), now=0.0) for i in range(games)]
+    return [(s, _flip_script(s)) for s in sessions]
+
+
+def measure_alloc(mode, card_count: int, games: int) -> float:
+    """Average tracemalloc peak bytes above the live baseline per flip."""
+    prepared = _games(card_count, games)
+    total_peak = 0
+    flips = 0
+    tracemalloc.start()
+    try:
+        for session, script in prepared:
+            for card_id in script:
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                session = mode(session, card_id)
+                _, peak = tracemalloc.get_traced_memory()
+                total_peak += peak - before
+                flips += 1
+    finally:
+        tracemalloc.stop()
+    return total_peak / flips
+
+
+def measure_speed(mode, card_count: int, games: int) -> float:
+    prepared = _games(card_count, games)
+    flips = sum(len(script) for _, script in prepared)
+    start = time.perf_counter()
+    for session, script in prepared:
+        for card_id in script:
+            session = mode(session, card_id)
+    return flips / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'cards':>5}  {'mode':<14}  {'bytes/flip':>10}  {'flips/s':>10}")
+    for card_count in CARD_COUNTS:
+        for name, mode in MODES.items():
+            alloc = measure_alloc(mode, card_count, args.games)
+            speed = measure_speed(mode, card_count, args.games * 10)
+            print(f"{card_count:>5}  {name:<14}  {alloc:>10.0f}  {speed:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
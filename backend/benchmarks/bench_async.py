@@ -0,0 +1,136 @@
+"""
+Sync routes on the threadpool vs async routes on AsyncGameService, at high concurrency:
+throughput and p50/p99 latency for a mix of game reads and flips on the in-memory store.
+
+Run from backend/:  python -m benchmarks.bench_async [--requests N] [--concurrency N ...]
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from fastapi import APIRouter, Depends, FastAPI, Response
+
+from benchmarks.bench_board import _settings
+from src.api.encoding import encode_flip, encode_game, json_response
+from src.api.games import router as games_router
+from src.api.schemas import FlipRequest
+from src.app import invalid_flip_handler
+from src.deps import get_game_service
+from src.errors import InvalidFlip
+from src.services.game import GameService
+
+CARD_COUNT = 16
+READ_SHARE = 0.8  # the rest are flips of a random card
+
+
+def _threadpool_router() -> APIRouter:
+    """The game routes as they were before: sync defs, run on the AnyIO threadpool."""
+    router = APIRouter(prefix="/api/games")
+
+    @router.get("/{game_id}")
+    def get(game_id: str, service: GameService = Depends(get_game_service)) -> Response:
+        return json_response(encode_game(service.get_game(game_id)))
+
+    @router.post("/{game_id}/flip")
+    def flip(
+        game_id: str, body: FlipRequest, service: GameService = Depends(get_game_service)
+    ) -> Response:
+        return json_response(encode_flip(service.flip_card(game_id, body.card_id)))
+
+    return router
+
+
+def _app(router: APIRouter, prefix: str = "") -> FastAPI:
+    app = FastAPI()
+    app.include_router(router, prefix=prefix)
+    app.add_exception_handler(InvalidFlip, invalid_flip_handler)
+    return app
+
+
+async def _request(app: FastAPI, method: str, path: str, body: bytes = b"") -> int:
+    """One request straight into the ASGI app (no HTTP client in the measurement)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = 0
+
+    async def receive() -> dict:
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _worker(app: FastAPI, game_id: str, requests: int, latencies: list[float]) -> None:
+    rng = random.Random(game_id)
+    for _ in range(requests):
+        # Latency counts from arrival: the request first queues behind everything
+        # already runnable on the loop, as if it had just come off the network.
+        start = time.perf_counter()
+        await asyncio.sleep(0)
+        if rng.random() < READ_SHARE:
+            await _request(app, "GET", f"/api/games/{game_id}")
+        else:
+            body = json.dumps({"cardId": f"card-{rng.randrange(CARD_COUNT)}"}).encode()
+            await _request(app, "POST", f"/api/games/{game_id}/flip", body)
+        latencies.append(time.perf_counter() - start)
+
+
+async def _run(app: FastAPI, game_ids: list[str], requests: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    per_worker = requests // len(game_ids)
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker(app, game_id, per_worker, latencies) for game_id in game_ids))
+    elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, latencies
+
+
+def _p(latencies: list[float], q: int) -> float:
+    return statistics.quantiles(latencies, n=100)[q - 1] * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    args = parser.parse_args()
+
+    service = get_game_service()
+    apps = {
+        "threadpool": _app(_threadpool_router()),
+        "async": _app(games_router, prefix="/api"),
+    }
+    for concurrency in args.concurrency:
+        game_ids = [f"bench-{concurrency}-{i}" for i in range(concurrency)]
+        for game_id in game_ids:
+            service.create_game(game_id, _settings(CARD_COUNT))
+        for name, app in apps.items():
+            throughput, latencies = asyncio.run(_run(app, game_ids, args.requests))
+            print(
+                f"{concurrency:>5} concurrent  {name:<10} {throughput:8,.0f} req/s   "
+                f"p50 {_p(latencies, 50):6.2f} ms   p99 {_p(latencies, 99):6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
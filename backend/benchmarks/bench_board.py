@@ -0,0 +1,85 @@
+"""
+Flip throughput of the domain engine at several board sizes.
+
+Run from backend/:  python -m benchmarks.bench_board
+"""
+import argparse
+import random
+import time
+
+from src.domain.game import build_public_view, create_game, flip_card
+from src.domain.types import Settings
+
+CARD_COUNTS = (4, 20, 100)
+
+
+def _settings(card_count: int) -> Settings:
+    return Settings(
+        user_name="bench",
+        card_count=card_count,
+        countdown_seconds=120,
+        flip_back_delay_ms=0,
+    )
+
+
+def _flip_script(session) -> list[str]:
+    """Flips that play the whole game: one mismatch per pair, then the match."""
+    emoji_of = {card.id: card.emoji for card in session.board}
+    positions: dict[str, list[str]] = {}
+    for card_id, emoji in emoji_of.items():
+        positions.setdefault(emoji, []).append(card_id)
+    pairs = [
+        (ids[i], ids[i + 1])
+        for ids in positions.values()
+        for i in range(0, len(ids), 2)
+    ]
+    script: list[str] = []
+    for n, (a, b) in enumerate(pairs):
+        later = pairs[n + 1:]
+        decoy = next((c for c, _ in later if emoji_of[c] != emoji_of[a]), None)
+        if decoy is not None:
+            script += [a, decoy]
+        script += [a, b]
+    return script
+
+
+def run(card_count: int, games: int, with_view: bool, repeat: int = 5) -> float:
+    """Best-of-repeat flips/sec over `games` complete games."""
+    random.seed(card_count)
+    prepared = []
+    for i in range(games):
+        session = create_game(f"g{i}", _settings(card_count), now=0.0)
+        prepared.append((session, _flip_script(session)))
+
+    flips = sum(len(script) for _, script in prepared)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for session, script in prepared:
+            for card_id in script:
+                session, mismatch_pair = flip_card(session, card_id, now=1.0)
+                if with_view:
+                    build_public_view(
+                        session,
+                        reveal_emoji=dict(mismatch_pair) if mismatch_pair else None,
+                    )
+        best = min(best, time.perf_counter() - start)
+    return flips / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'cards':>5}  {'flips/s':>12}  {'flips/s (+view)':>16}")
+    for card_count in CARD_COUNTS:
+        games = max(1, args.games * 4 // card_count)
+        bare = run(card_count, games, with_view=False, repeat=args.repeat)
+        viewed = run(card_count, games, with_view=True, repeat=args.repeat)
+        print(f"{card_count:>5}  {bare:>12,.0f}  {viewed:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
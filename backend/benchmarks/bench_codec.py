@@ -0,0 +1,89 @@
+"""
+Session encodings compared: size and encode/decode time of the binary codec
+(src/storage/codec.py), pickle and JSON of the session's fields, for a game
+half played at several board sizes.
+
+Run from backend/:  python -m benchmarks.bench_codec [--card-counts N ...] [--ops N]
+"""
+import argparse
+import json
+import pickle
+import random
+import time
+from collections.abc import Callable
+
+from benchmarks.bench_board import _settings
+from src.domain.board import InternalCard
+from src.domain.game import create_game, flip_card
+from src.domain.types import GameSession, Settings
+from src.storage.codec import decode_session, encode_session
+
+
+def _half_played(card_count: int) -> GameSession:
+    random.seed(card_count)
+    session = create_game("s0-3f2b9c1e-6d4a-4e8b-9a57-0c1d2e3f4a5b", _settings(card_count), now=0.0)
+    for i in range(card_count // 2 + 1):
+        session, _ = flip_card(session, f"card-{i}", now=float(i))
+    return session
+
+
+def _to_json(session: GameSession) -> bytes:
+    """What storing the dataclasses as JSON takes: every card as an id and an emoji."""
+    return json.dumps({
+        "game_id": session.game_id,
+        "user_name": session.user_name,
+        "settings": vars(session.settings),
+        "board": [{"id": card.id, "emoji": card.emoji} for card in session.board],
+        "status": session.status,
+        "started_at": session.started_at,
+        "turns": session.turns,
+        "bad_guesses": session.bad_guesses,
+        "flipped_card_ids": list(session.flipped_card_ids),
+        "matched_card_ids": list(session.matched_card_ids),
+        "version": session.version,
+    }).encode()
+
+
+def _from_json(data: bytes) -> GameSession:
+    fields = json.loads(data)
+    fields["settings"] = Settings(**fields["settings"])
+    fields["board"] = [InternalCard(card["id"], card["emoji"]) for card in fields["board"]]
+    return GameSession(**fields)
+
+
+def _per_op_us(func: Callable[[], object], ops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ops):
+        func()
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def _run(card_count: int, ops: int) -> None:
+    session = _half_played(card_count)
+    codecs = {
+        "codec": (encode_session, lambda data: decode_session(data)[0]),
+        "pickle": (lambda s: pickle.dumps(s, pickle.HIGHEST_PROTOCOL), pickle.loads),
+        "json": (_to_json, _from_json),
+    }
+    for name, (encode, decode) in codecs.items():
+        data = encode(session)
+        assert decode(data) == session
+        encode_us = _per_op_us(lambda: encode(session), ops)
+        decode_us = _per_op_us(lambda: decode(data), ops)
+        print(
+            f"{card_count:>4} cards  {name:<7} {len(data):>6,} bytes  "
+            f"encode {encode_us:7.2f} us  decode {decode_us:7.2f} us"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--card-counts", type=int, nargs="+", default=[4, 20, 100])
+    parser.add_argument("--ops", type=int, default=20_000)
+    args = parser.parse_args()
+    for card_count in args.card_counts:
+        _run(card_count, args.ops)
+
+
+if __name__ == "__main__":
+    main()
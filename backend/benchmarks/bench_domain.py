@@ -0,0 +1,214 @@
+"""
+Microbenchmarks of the domain functions and response serializers: ns/op and bytes
+allocated per op (tracemalloc peak above the live baseline) for each operation at
+several board sizes, compared against a saved baseline.
+
+Run from backend/:
+    python -m benchmarks.bench_domain --save       # record the baseline
+    python -m benchmarks.bench_domain              # compare; exit 1 on regressions
+Options: --cards N ... --threshold PERCENT --alloc-threshold PERCENT --baseline PATH
+         --min-time SECONDS --repeats N
+Timings are best-of-repeats but still move with machine load; allocation sizes are
+stable run to run, so they get their own, tighter threshold.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import replace
+
+from benchmarks.bench_board import _settings
+from src.api.encoding import encode_flip, encode_game
+from src.api.schemas import build_flip_response, build_response
+from src.domain.constants import CARD_COUNT_MAX
+from src.domain.game import (
+    _build_board,
+    apply_countdown_if_expired,
+    build_public_view,
+    create_game,
+    flip_card,
+    restart_game,
+)
+from src.domain.types import GameSession
+
+CARD_COUNTS = (4, 20, 52, CARD_COUNT_MAX)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "bench_domain_baseline.json")
+NOW = 1000.0  # games start here; their countdown is 120 s
+
+
+def _pairs(session: GameSession) -> list[tuple[str, str]]:
+    by_symbol: dict[int, list[str]] = {}
+    for index in range(len(session.board)):
+        by_symbol.setdefault(session.board.symbol(index), []).append(session.board.card_id(index))
+    return [(ids[i], ids[i + 1]) for ids in by_symbol.values() for i in range(0, len(ids), 2)]
+
+
+def _flipped(session: GameSession, card_id: str) -> GameSession:
+    return flip_card(session, card_id, now=NOW)[0]
+
+
+def _cases(card_count: int) -> dict[str, Callable[[], object]]:
+    """Zero-argument calls per operation. The domain functions are copy-on-write, so
+    each call sees the same input."""
+    random.seed(card_count)
+    settings = _settings(card_count)
+    session = create_game("bench", settings, now=NOW)
+    pairs = _pairs(session)
+    first, partner = pairs[0]
+    symbol = session.board.symbol(session.board.index_of(first))
+    other = next(a for a, _ in pairs if session.board.symbol(session.board.index_of(a)) != symbol)
+    one_up = _flipped(session, first)
+    last_pair_left = replace(
+        _flipped(session, pairs[-1][0]),
+        matched_card_ids=[card_id for pair in pairs[:-1] for card_id in pair],
+    )
+    mid_game = _flipped(_flipped(one_up, other), partner)  # a mismatch revealed
+    view = build_public_view(mid_game)
+    expired = NOW + settings.countdown_seconds + 1
+    return {
+        "build_board": lambda: _build_board(settings),
+        "create_game": lambda: create_game("bench", settings, now=NOW),
+        "flip_first": lambda: flip_card(session, first, now=NOW),
+        "flip_match": lambda: flip_card(one_up, partner, now=NOW),
+        "flip_mismatch": lambda: flip_card(one_up, other, now=NOW),
+        "flip_win": lambda: flip_card(last_pair_left, pairs[-1][1], now=NOW),
+        "countdown_running": lambda: apply_countdown_if_expired(mid_game, now=NOW),
+        "countdown_expired": lambda: apply_countdown_if_expired(mid_game, now=expired),
+        "public_view": lambda: build_public_view(mid_game),
+        "restart_game": lambda: restart_game(mid_game, now=NOW),
+        "build_response": lambda: build_response(view),
+        "build_flip_response": lambda: build_flip_response(view),
+        "encode_game": lambda: encode_game(view),
+        "encode_flip": lambda: encode_flip(view),
+    }
+
+
+def measure_ns(call: Callable[[], object], min_time: float, repeats: int = 5) -> float:
+    """Best-of-repeats ns/op, with loops sized so each repeat takes about min_time."""
+    loops = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            call()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_time * 1e9 / 10:
+            break
+        loops *= 2
+    loops = max(1, int(loops * min_time * 1e9 / max(elapsed, 1)))
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            call()
+        best = min(best, (time.perf_counter_ns() - start) / loops)
+    return best
+
+
+def measure_alloc(call: Callable[[], object], ops: int = 200) -> float:
+    """Average tracemalloc peak bytes above the live baseline per op."""
+    call()  # warm caches so they do not count against the first op
+    total_peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(ops):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+            total_peak += peak - before
+    finally:
+        tracemalloc.stop()
+    return total_peak / ops
+
+
+def run(card_counts: list[int], min_time: float, repeats: int) -> dict[str, dict[str, float]]:
+    """{"<operation>/<cards>": {"ns_per_op": ..., "alloc_bytes_per_op": ...}}"""
+    results = {}
+    for card_count in card_counts:
+        for name, call in _cases(card_count).items():
+            results[f"{name}/{card_count}"] = {
+                "ns_per_op": measure_ns(call, min_time, repeats),
+                "alloc_bytes_per_op": measure_alloc(call),
+            }
+    return results
+
+
+def regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    thresholds: dict[str, float],
+) -> list[str]:
+    """Every metric more than its threshold (a fraction) above its baseline value."""
+    found = []
+    for key, metrics in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        for metric, value in metrics.items():
+            limit = before[metric] * (1 + thresholds[metric])
+            if value > limit:
+                found.append(
+                    f"{key} {metric}: {value:,.0f} vs baseline {before[metric]:,.0f} "
+                    f"(+{(value / before[metric] - 1) * 100:.0f}%)"
+                )
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--cards", type=int, nargs="+", default=list(CARD_COUNTS))
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per repeat")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the results as the baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=15.0, help="allowed slowdown, in percent"
+    )
+    parser.add_argument(
+        "--alloc-threshold", type=float, default=5.0, help="allowed allocation growth, in percent"
+    )
+    args = parser.parse_args()
+
+    results = run(args.cards, args.min_time, args.repeats)
+    baseline = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'operation':<28} {'ns/op':>12} {'bytes/op':>10} {'vs baseline':>12}")
+    for key, metrics in results.items():
+        before = baseline.get(key)
+        change = ""
+        if before is not None:
+            change = f"{(metrics['ns_per_op'] / before['ns_per_op'] - 1) * 100:+.0f}%"
+        print(
+            f"{key:<28} {metrics['ns_per_op']:>12,.0f} "
+            f"{metrics['alloc_bytes_per_op']:>10,.0f} {change:>12}"
+        )
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --save first")
+        return 0
+    found = regressions(
+        results,
+        baseline,
+        {"ns_per_op": args.threshold / 100, "alloc_bytes_per_op": args.alloc_threshold / 100},
+    )
+    for line in found:
+        print(f"REGRESSION {line}")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Leaderboard cost as boards grow: time per recorded win and per top-10 read at 10k,
+100k and 1M ranked games, unbounded and with the top 1000 kept.
+
+Run from backend/:  python -m benchmarks.bench_leaderboard [--sizes N ...] [--ops N]
+"""
+import argparse
+import random
+import time
+from dataclasses import replace
+
+from benchmarks.bench_board import _settings
+from src.domain.game import create_game
+from src.services.leaderboard import Leaderboard
+
+CARD_COUNT = 16
+
+
+def _wins(count: int, rng: random.Random) -> list:
+    """Won sessions with random results (sharing one board)."""
+    template = create_game("bench", _settings(CARD_COUNT), now=0.0)
+    sessions = []
+    for i in range(count):
+        turns = rng.randint(CARD_COUNT // 2, CARD_COUNT * 3)
+        bad_guesses = rng.randint(0, turns - CARD_COUNT // 2)
+        sessions.append(
+            replace(template, game_id=f"g{i}", status="won", turns=turns, bad_guesses=bad_guesses)
+        )
+    return sessions
+
+
+def _run(size: int, ops: int, max_entries: int, rng: random.Random) -> None:
+    leaderboard = Leaderboard(max_entries)
+    for session in _wins(size, rng):
+        leaderboard.record_win(session, now=rng.uniform(10, 120))
+    extra = _wins(ops, rng)
+    start = time.perf_counter()
+    for session in extra:
+        leaderboard.record_win(session, now=60.0)
+    insert_us = (time.perf_counter() - start) / ops * 1e6
+    start = time.perf_counter()
+    for _ in range(ops):
+        leaderboard.top(CARD_COUNT, 10)
+    top_us = (time.perf_counter() - start) / ops * 1e6
+    kept = f"top {max_entries:,}" if max_entries else "all"
+    print(
+        f"{size:>10,} wins  keep {kept:<10} ranked {leaderboard.size(CARD_COUNT):>10,}  "
+        f"record {insert_us:6.2f} us  top-10 {top_us:6.2f} us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=5_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for size in args.sizes:
+        for max_entries in (0, 1000):
+            _run(size, args.ops, max_entries, rng)
+
+
+if __name__ == "__main__":
+    main()
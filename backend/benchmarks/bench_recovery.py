@@ -0,0 +1,74 @@
+"""
+Journal recovery time: replaying the full event log vs loading a snapshot plus a short tail.
+
+Run from backend/:  python -m benchmarks.bench_recovery [--games N] [--flips N] [--cards N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_board import _flip_script, _settings
+from src.services.game import GameService
+from src.storage.journal import GameJournal
+from src.storage.memory import MemoryGameRepository
+
+
+def _populate(
+    directory: str, games: int, flips_per_game: int, card_count: int
+) -> MemoryGameRepository:
+    random.seed(card_count)
+    repo = MemoryGameRepository()
+    journal = GameJournal(directory, sync_commit=False)
+    journal.start()
+    service = GameService(repo, journal=journal)
+    now = time.time()
+    for i in range(games):
+        service.create_game(f"g{i}", _settings(card_count), now=now)
+    for i in range(games):
+        game_id = f"g{i}"
+        for card_id in _flip_script(repo.find_by_id(game_id))[:flips_per_game]:
+            service.flip_card(game_id, card_id, now=now)
+    journal.close()
+    return repo
+
+
+def _recover(directory: str, label: str) -> None:
+    stats = GameJournal(directory).recover(MemoryGameRepository())
+    size = sum(entry.stat().st_size for entry in os.scandir(directory))
+    print(
+        f"{label:<16} {stats.seconds:6.2f}s  sessions {stats.sessions:,}  "
+        f"from snapshot {stats.snapshot_sessions:,}  events {stats.events_replayed:,}  "
+        f"on disk {size / 1e6:,.1f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--flips", type=int, default=10, help="flips per game")
+    parser.add_argument("--cards", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        repo = _populate(tmp, args.games, args.flips, args.cards)
+        print(f"journaled {args.games:,} games in {time.perf_counter() - start:.2f}s")
+        _recover(tmp, "log only")
+
+        journal = GameJournal(tmp, sync_commit=False)
+        journal.start()
+        service = GameService(repo, journal=journal)
+        start = time.perf_counter()
+        service.checkpoint()
+        print(f"snapshot written in {time.perf_counter() - start:.2f}s")
+        now = time.time()
+        for i in range(0, args.games, 100):  # a short tail after the snapshot
+            service.restart_game(f"g{i}", now=now)
+        journal.close()
+        _recover(tmp, "snapshot + tail")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Response serialization: response models validated and dumped by FastAPI vs the direct
+PublicGameView -> JSON bytes encoder, per board size and per endpoint, plus full vs
+delta flip responses.
+
+Run from backend/:  python -m benchmarks.bench_serialization [--requests N] [--cards N]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI, status
+from pydantic import TypeAdapter
+
+from benchmarks.bench_board import CARD_COUNTS, _settings
+from src.api.encoding import encode_flip, encode_flip_delta, encode_game
+from src.api.schemas import (
+    CreateGameRequest,
+    FlipRequest,
+    FlipResponse,
+    GameResponse,
+    build_flip_response,
+    build_response,
+)
+from src.api.games import router as games_router
+from src.deps import get_game_service
+from src.domain.game import build_public_delta, build_public_view, create_game, flip_card
+from src.domain.types import Settings
+from src.services.game import GameService
+
+
+def _model_path_router() -> APIRouter:
+    """The game routes as they were before the fast path: return response models."""
+    router = APIRouter(prefix="/api/games")
+
+    @router.post("", response_model=GameResponse, status_code=status.HTTP_201_CREATED)
+    def create(body: CreateGameRequest, service: GameService = Depends(get_game_service)):
+        settings = Settings(
+            user_name=body.user_name,
+            card_count=body.card_count,
+            countdown_seconds=body.countdown_seconds,
+            flip_back_delay_ms=body.flip_back_delay_ms,
+            max_bad_guesses=body.max_bad_guesses,
+        )
+        return build_response(service.create_game(str(uuid.uuid4()), settings))
+
+    @router.get("/{game_id}", response_model=GameResponse)
+    def get(game_id: str, service: GameService = Depends(get_game_service)):
+        return build_response(service.get_game(game_id))
+
+    @router.post("/{game_id}/flip", response_model=FlipResponse)
+    def flip(game_id: str, body: FlipRequest, service: GameService = Depends(get_game_service)):
+        return build_flip_response(service.flip_card(game_id, body.card_id))
+
+    @router.post("/{game_id}/restart", response_model=GameResponse)
+    def restart(game_id: str, service: GameService = Depends(get_game_service)):
+        return build_response(service.restart_game(game_id))
+
+    return router
+
+
+def _best_us(op: Callable[[], object], number: int, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+def bench_encoding(number: int) -> None:
+    adapter = TypeAdapter(GameResponse)
+    for card_count in CARD_COUNTS:
+        random.seed(card_count)
+        view = build_public_view(create_game("g", _settings(card_count), now=time.time()))
+        models = _best_us(
+            lambda: adapter.dump_json(adapter.validate_python(build_response(view)), by_alias=True),
+            number,
+        )
+        fast = _best_us(lambda: encode_game(view), number)
+        print(f"encode {card_count:>3} cards   models {models:7.1f} us   direct {fast:6.1f} us")
+
+    for card_count in CARD_COUNTS:
+        random.seed(card_count)
+        session, _ = flip_card(create_game("g", _settings(card_count), now=time.time()), "card-0")
+        full = _best_us(lambda: encode_flip(build_public_view(session)), number)
+        delta = _best_us(
+            lambda: encode_flip_delta(build_public_delta(session, 1, base_version=0)), number
+        )
+        full_size = len(encode_flip(build_public_view(session)))
+        delta_size = len(encode_flip_delta(build_public_delta(session, 1, base_version=0)))
+        print(
+            f"flip   {card_count:>3} cards   full {full:6.1f} us {full_size:>6,} B   "
+            f"delta {delta:5.1f} us {delta_size:>4,} B"
+        )
+
+
+async def _p50_us(
+    client: httpx.AsyncClient, method: str, url: Callable[[], str], body, n: int
+) -> float:
+    samples = []
+    for _ in range(n):
+        target = url()
+        start = time.perf_counter()
+        await client.request(method, target, json=body)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+async def _bench_app(name: str, target: FastAPI, requests: int, card_count: int) -> None:
+    body = {
+        "userName": "bench",
+        "cardCount": card_count,
+        "countdownSeconds": 120,
+        "flipBackDelayMs": 0,
+    }
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        game_ids = [
+            (await client.post("/api/games", json=body)).json()["gameId"] for _ in range(requests)
+        ]
+        flips = iter(game_ids)
+        results = {
+            "create": await _p50_us(client, "POST", lambda: "/api/games", body, requests),
+            "get": await _p50_us(client, "GET", lambda: f"/api/games/{game_ids[0]}", None, requests),
+            "flip": await _p50_us(
+                client, "POST", lambda: f"/api/games/{next(flips)}/flip", {"cardId": "card-0"},
+                requests,
+            ),
+            "restart": await _p50_us(
+                client, "POST", lambda: f"/api/games/{game_ids[0]}/restart", None, requests
+            ),
+        }
+    print(
+        f"{name:<7} p50 (us) "
+        + "  ".join(f"{endpoint} {us:7.1f}" for endpoint, us in results.items())
+    )
+
+
+def bench_endpoints(requests: int, card_count: int) -> None:
+    models = FastAPI()
+    models.include_router(_model_path_router())
+    direct = FastAPI()
+    direct.include_router(games_router, prefix="/api")
+    asyncio.run(_bench_app("models", models, requests, card_count))
+    asyncio.run(_bench_app("direct", direct, requests, card_count))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--cards", type=int, default=100)
+    args = parser.parse_args()
+
+    bench_encoding(number=2000)
+    bench_endpoints(args.requests, args.cards)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Service flip throughput over the shared-memory store with 1, 2, 4 and 8 worker
+processes (as with uvicorn --workers N), against one process on the in-memory store.
+Scaling past one worker needs as many free cores; the core count is printed first.
+
+Run from backend/:  python -m benchmarks.bench_shared [--games N] [--cards N] [--workers N ...]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_board import _flip_script, _settings
+from src.domain.game import create_game
+from src.services.game import GameService
+from src.storage.memory import MemoryGameRepository
+from src.storage.repository import GameRepository
+from src.storage.shared import SharedMemoryGameRepository
+
+SLOTS = 65_536
+
+
+def _play(repo: GameRepository, sessions: list) -> int:
+    service = GameService(repo)
+    flips = 0
+    for session in sessions:
+        for card_id in _flip_script(session):
+            service.flip_card(session.game_id, card_id)
+            flips += 1
+    return flips
+
+
+def _worker(path: str, sessions: list, start, results) -> None:
+    repo = SharedMemoryGameRepository(path, slots=SLOTS)
+    start.wait()
+    began = time.perf_counter()
+    flips = _play(repo, sessions)
+    results.put((began, time.perf_counter(), flips))
+    repo.close()
+
+
+def _sessions(count: int, card_count: int, prefix: str) -> list:
+    return [
+        create_game(f"{prefix}-{i}", _settings(card_count), now=time.time()) for i in range(count)
+    ]
+
+
+def bench_shared(path: str, workers: int, games: int, card_count: int) -> float:
+    repo = SharedMemoryGameRepository(path, slots=SLOTS)
+    shares = [_sessions(games // workers, card_count, f"w{workers}-{n}") for n in range(workers)]
+    for share in shares:
+        repo.save_many(share)
+    start = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_worker, args=(path, share, start, results))
+        for share in shares
+    ]
+    for process in processes:
+        process.start()
+    start.set()
+    spans = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    for share in shares:
+        for session in share:
+            repo.delete(session.game_id)
+    repo.close()
+    elapsed = max(end for _, end, _ in spans) - min(began for began, _, _ in spans)
+    return sum(flips for _, _, flips in spans) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=4000)
+    parser.add_argument("--cards", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    random.seed(args.cards)
+
+    print(f"{os.cpu_count()} CPU cores")
+    memory = MemoryGameRepository()
+    sessions = _sessions(args.games, args.cards, "memory")
+    memory.save_many(sessions)
+    start = time.perf_counter()
+    flips = _play(memory, sessions)
+    print(f"memory  workers=1  {flips / (time.perf_counter() - start):10,.0f} flips/s")
+
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as tmp:
+        path = os.path.join(tmp, "games.slots")
+        for workers in args.workers:
+            flips_per_sec = bench_shared(path, workers, args.games, args.cards)
+            print(f"shared  workers={workers}  {flips_per_sec:10,.0f} flips/s")
+
+
+if __name__ == "__main__":
+    main()
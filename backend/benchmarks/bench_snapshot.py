@@ -0,0 +1,59 @@
+"""
+Shutdown snapshot and startup restore of the in-memory store: time to write the
+snapshot file and to load it back (decode, expire, bulk index) at 10k-100k games,
+a third of them past their countdown.
+
+Run from backend/:  python -m benchmarks.bench_snapshot [--games N ...] [--cards N]
+"""
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_board import _settings
+from src.domain.game import create_game
+from src.services.game import GameService
+from src.sharding import new_game_id
+from src.storage.memory import MemoryGameRepository
+from src.storage.repository import RetentionPolicy
+from src.storage.snapshot import restore_snapshot
+
+_RETENTION = RetentionPolicy(finished_ttl_seconds=1800, idle_ttl_seconds=3600)
+
+
+def _run(games: int, card_count: int, path: str) -> None:
+    random.seed(games)
+    now = time.time()
+    repo = MemoryGameRepository(_RETENTION)
+    settings = _settings(card_count)
+    for i in range(games):
+        started_at = now - settings.countdown_seconds - 1 if i % 3 == 0 else now
+        repo.save(create_game(new_game_id(0), settings, now=started_at))
+    start = time.perf_counter()
+    GameService(repo).save_snapshot(path)
+    write_s = time.perf_counter() - start
+    del repo
+    gc.collect()
+
+    stats = restore_snapshot(path, MemoryGameRepository(_RETENTION), now=now)
+    print(
+        f"{games:>8,} games  snapshot {os.path.getsize(path) / 1e6:6.1f} MB  "
+        f"write {write_s:5.2f}s  restore {stats.seconds:5.2f}s "
+        f"({stats.seconds / games * 1e6:4.1f} us/game, {stats.expired:,} expired)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    parser.add_argument("--cards", type=int, default=20)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for games in args.games:
+            _run(games, args.cards, os.path.join(tmp, "games.snap"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Repository latency and service flip throughput: in-memory vs SQLite (WAL).
+
+Run from backend/:  python -m benchmarks.bench_storage [--games N] [--cards N]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+
+from benchmarks.bench_board import _flip_script, _settings
+from src.domain.game import create_game
+from src.services.game import GameService
+from src.storage.memory import MemoryGameRepository
+from src.storage.repository import GameRepository
+from src.storage.sqlite import SqliteGameRepository
+
+
+def _latencies_us(op: Callable[[int], object], n: int) -> list[float]:
+    samples = []
+    for i in range(n):
+        start = time.perf_counter_ns()
+        op(i)
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return samples
+
+
+def _summary(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2]
+    p99 = samples[int(len(samples) * 0.99)]
+    return f"mean {statistics.fmean(samples):8.1f}  p50 {p50:8.1f}  p99 {p99:8.1f}"
+
+
+def bench(name: str, repo: GameRepository, games: int, card_count: int) -> None:
+    random.seed(card_count)
+    sessions = [create_game(f"g{i}", _settings(card_count), now=time.time()) for i in range(games)]
+
+    saves = _latencies_us(lambda i: repo.save(sessions[i]), games)
+    finds = _latencies_us(lambda i: repo.find_by_id(sessions[i].game_id), games)
+
+    service = GameService(repo)
+    scripts = [(s.game_id, _flip_script(s)) for s in sessions]
+    flips = sum(len(script) for _, script in scripts)
+    start = time.perf_counter()
+    for game_id, script in scripts:
+        for card_id in script:
+            service.flip_card(game_id, card_id)
+    flips_per_sec = flips / (time.perf_counter() - start)
+
+    print(f"{name:<7} save (us)  {_summary(saves)}")
+    print(f"{name:<7} find (us)  {_summary(finds)}")
+    print(f"{name:<7} service flips/s {flips_per_sec:,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--cards", type=int, default=20)
+    args = parser.parse_args()
+
+    bench("memory", MemoryGameRepository(), args.games, args.cards)
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = SqliteGameRepository(os.path.join(tmp, "games.db"))
+        bench("sqlite", repo, args.games, args.cards)
+        repo.close()
+
+
+if __name__ == "__main__":
+    main()
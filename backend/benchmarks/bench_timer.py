@@ -0,0 +1,90 @@
+"""
+CPU cost of timer sockets: one polling loop per socket (get_game every second) vs the
+shared TimerHub ticker. Sockets are in-process fakes that JSON-encode each message.
+
+Run from backend/:  python -m benchmarks.bench_timer [--sockets N] [--per-game N] [--seconds N]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.bench_board import _settings
+from src.services.game import GameService
+from src.services.timer_hub import TimerHub
+from src.storage.memory import MemoryGameRepository
+
+
+class _FakeSocket:
+    def __init__(self) -> None:
+        self.sent = 0
+
+    async def send_json(self, data: dict) -> None:
+        json.dumps(data)
+        self.sent += 1
+
+
+async def _polling_socket(service: GameService, game_id: str, ws: _FakeSocket) -> None:
+    """The per-socket loop the timer endpoint used before the hub."""
+    while True:
+        state = service.get_game(game_id).state
+        await ws.send_json({"remainingSeconds": state.remaining_seconds, "status": state.status})
+        await asyncio.sleep(1)
+
+
+async def _hub_socket(hub: TimerHub, service: GameService, game_id: str, ws: _FakeSocket) -> None:
+    state = service.get_timer(game_id)
+    queue = hub.subscribe(game_id)
+    try:
+        while True:
+            await ws.send_json({"remainingSeconds": state.remaining_seconds, "status": state.status})
+            state = await queue.get()
+    finally:
+        hub.unsubscribe(game_id, queue)
+
+
+async def _run(mode: str, sockets: int, per_game: int, seconds: float, card_count: int) -> None:
+    service = GameService(MemoryGameRepository())
+    games = max(1, sockets // per_game)
+    now = time.time()
+    for i in range(games):
+        service.create_game(f"g{i}", _settings(card_count), now=now)
+    hub = TimerHub(service)
+    fakes = [_FakeSocket() for _ in range(sockets)]
+    tasks = []
+    for i, ws in enumerate(fakes):
+        game_id = f"g{i % games}"
+        if mode == "polling":
+            tasks.append(asyncio.create_task(_polling_socket(service, game_id, ws)))
+        else:
+            tasks.append(asyncio.create_task(_hub_socket(hub, service, game_id, ws)))
+
+    await asyncio.sleep(0)
+    cpu, wall = time.process_time(), time.perf_counter()
+    sent = sum(ws.sent for ws in fakes)
+    await asyncio.sleep(seconds)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    sent = sum(ws.sent for ws in fakes) - sent
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    print(
+        f"{mode:<8} {sockets:,} sockets / {games:,} games  "
+        f"CPU {100 * cpu / wall:5.1f}%  messages/s {sent / wall:,.0f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sockets", type=int, default=10_000)
+    parser.add_argument("--per-game", type=int, default=1, help="sockets watching each game")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--cards", type=int, default=20)
+    args = parser.parse_args()
+
+    for mode in ("polling", "hub"):
+        asyncio.run(_run(mode, args.sockets, args.per_game, args.seconds, args.cards))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# HTTP validators for game state. A game's ETag is its state version, which changes
+# with every committed change (flips, restarts, expiry on read). remainingSeconds is
+# not part of it: it is derived from state.startedAt and settings.countdownSeconds,
+# and the version moves when the countdown runs out because the status changes.
+# The ETag is therefore weak: equal versions mean the same game state, not the
+# same bytes.
+
+# Game responses may be stored but must be revalidated before reuse.
+REVALIDATE = "no-cache"
+
+
+def etag(version: int) -> str:
+    return f'W/"{version}"'
+
+
+def etag_matches(if_none_match: str | None, version: int) -> bool:
+    """Whether an If-None-Match header value matches the ETag of version (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = f'"{version}"'
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == current:
+            return True
+    return False
+
+
+def version_headers(version: int) -> dict[str, str]:
+    return {"ETag": etag(version), "Cache-Control": REVALIDATE}
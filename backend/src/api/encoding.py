@@ -0,0 +1,149 @@
+import time
+from collections.abc import Callable
+from functools import lru_cache, wraps
+from json.encoder import encode_basestring
+from typing import TypeVar
+
+from starlette.responses import Response
+
+from src.domain.types import (
+    GameSession,
+    GameState,
+    PublicCard,
+    PublicGameDelta,
+    PublicGameView,
+    Settings,
+)
+from src.metrics import SERIALIZE_SECONDS
+
+# Writes GameResponse / FlipResponse / FlipDeltaResponse JSON straight from the domain
+# views, without building the response models. Output matches what FastAPI produces
+# from those models (same keys and order, compact separators, non-ASCII left
+# unescaped), so the routes keep response_model for the OpenAPI schema only.
+
+_BOOL = ("false", "true")
+
+T = TypeVar("T")
+
+
+def _timed(response: str) -> Callable[[Callable[[T], bytes]], Callable[[T], bytes]]:
+    """Record the encoder's run time under memory_game_serialize_seconds{response}."""
+    series = SERIALIZE_SECONDS.labels(response)
+
+    def decorate(encode: Callable[[T], bytes]) -> Callable[[T], bytes]:
+        @wraps(encode)
+        def timed(value: T) -> bytes:
+            start = time.perf_counter()
+            body = encode(value)
+            series.observe(time.perf_counter() - start)
+            return body
+
+        return timed
+
+    return decorate
+
+
+@lru_cache(maxsize=4096)
+def _card_head(card_id: str) -> str:
+    return '{"id":' + encode_basestring(card_id) + ',"isFaceUp":'
+
+
+@lru_cache(maxsize=1024)
+def _emoji_tail(emoji: str | None) -> str:
+    return ',"emoji":' + ("null" if emoji is None else encode_basestring(emoji)) + "}"
+
+
+def _cards(cards: list[PublicCard]) -> str:
+    return ",".join([
+        _card_head(card.id)
+        + _BOOL[card.is_face_up]
+        + ',"isMatched":'
+        + _BOOL[card.is_matched]
+        + _emoji_tail(card.emoji)
+        for card in cards
+    ])
+
+
+@lru_cache(maxsize=4096)
+def _settings(settings: Settings) -> str:
+    # Settings never change during a game (and most games share a preset), so each
+    # distinct block is serialized once.
+    max_bad = settings.max_bad_guesses
+    seed = settings.seed
+    return (
+        '{"userName":' + encode_basestring(settings.user_name)
+        + ',"cardCount":' + str(settings.card_count)
+        + ',"countdownSeconds":' + str(settings.countdown_seconds)
+        + ',"flipBackDelayMs":' + str(settings.flip_back_delay_ms)
+        + ',"maxBadGuesses":' + ("null" if max_bad is None else str(max_bad))
+        + ',"seed":' + ("null" if seed is None else str(seed))
+        + "}"
+    )
+
+
+def _state(state: GameState) -> str:
+    return (
+        '{"status":' + encode_basestring(state.status)
+        + ',"turns":' + str(state.turns)
+        + ',"badGuesses":' + str(state.bad_guesses)
+        + ',"startedAt":' + float.__repr__(float(state.started_at))
+        + ',"remainingSeconds":' + str(state.remaining_seconds)
+        + "}"
+    )
+
+
+@_timed("game")
+def encode_game(view: PublicGameView) -> bytes:
+    """GameResponse JSON for view."""
+    return (
+        '{"gameId":' + encode_basestring(view.game_id)
+        + ',"board":[' + _cards(view.board)
+        + '],"settings":' + _settings(view.settings)
+        + ',"state":' + _state(view.state)
+        + ',"version":' + str(view.version)
+        + "}"
+    ).encode()
+
+
+@_timed("flip")
+def encode_flip(view: PublicGameView) -> bytes:
+    """FlipResponse JSON for view."""
+    return (
+        '{"gameId":' + encode_basestring(view.game_id)
+        + ',"board":[' + _cards(view.board)
+        + '],"state":' + _state(view.state)
+        + ',"version":' + str(view.version)
+        + "}"
+    ).encode()
+
+
+@_timed("flip_delta")
+def encode_flip_delta(delta: PublicGameDelta) -> bytes:
+    """FlipDeltaResponse JSON for delta."""
+    return (
+        '{"gameId":' + encode_basestring(delta.game_id)
+        + ',"version":' + str(delta.version)
+        + ',"baseVersion":' + str(delta.base_version)
+        + ',"cards":[' + _cards(delta.cards)
+        + '],"state":' + _state(delta.state)
+        + "}"
+    ).encode()
+
+
+@_timed("bulk_created")
+def encode_bulk_created(sessions: list[GameSession]) -> bytes:
+    """BulkCreatedGame NDJSON lines, one per session."""
+    return "".join([
+        '{"gameId":' + encode_basestring(session.game_id)
+        + ',"userName":' + encode_basestring(session.user_name)
+        + "}\n"
+        for session in sessions
+    ]).encode()
+
+
+def json_response(
+    content: bytes, status_code: int = 200, *, headers: dict[str, str] | None = None
+) -> Response:
+    return Response(
+        content, status_code=status_code, headers=headers, media_type="application/json"
+    )
@@ -0,0 +1,239 @@
+import asyncio
+import re
+from collections.abc import Sequence
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from starlette.websockets import WebSocketDisconnect
+
+from src.api.schemas import ErrorResponse
+from src.sharding import shard_of
+
+try:  # the "cluster" extra
+    import httpx
+    from websockets.asyncio.client import ClientConnection, connect
+    from websockets.exceptions import ConnectionClosed, InvalidHandshake
+except ImportError:
+    httpx = None
+
+_GAME_PATH = re.compile(r"/api/games/([^/]+)")
+
+# Set on forwarded requests: the receiving node serves them itself, so nodes with
+# disagreeing SHARD_NODES cannot bounce a request between them.
+FORWARDED_HEADER = b"x-forwarded-by-shard"
+
+_HOP_BY_HOP = frozenset({
+    b"connection",
+    b"host",
+    b"keep-alive",
+    b"proxy-authenticate",
+    b"proxy-authorization",
+    b"te",
+    b"trailer",
+    b"transfer-encoding",
+    b"upgrade",
+})
+# Handshake headers the WebSocket client generates for its own connection.
+_WEBSOCKET_HANDSHAKE = frozenset({
+    b"sec-websocket-extensions",
+    b"sec-websocket-key",
+    b"sec-websocket-protocol",
+    b"sec-websocket-version",
+})
+# Close codes that are never sent in a close frame.
+_RESERVED_CLOSE_CODES = frozenset({1005, 1006, 1015})
+
+
+class ShardForwardingMiddleware:
+    """
+    Sends requests for games another shard owns to that shard's node. Game ids carry
+    their shard (src/sharding.py); requests under /api/games/{gameId} whose shard is
+    not this node's are proxied to nodes[shard], WebSocket upgrades included, and
+    everything else goes to the wrapped app. Ids without a shard, or with one that
+    has no node, are served locally.
+
+    HTTP requests share one pooled client, so each pair of nodes keeps a few
+    keep-alive connections open instead of connecting per request. A node that cannot
+    be reached answers 502 SHARD_UNAVAILABLE.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        shard: int,
+        nodes: Sequence[str],
+        max_connections: int = 100,
+        timeout_seconds: float = 10.0,
+    ) -> None:
+        if httpx is None:
+            raise RuntimeError("Forwarding between shards needs the 'cluster' extra (httpx)")
+        self.app = app
+        self._shard = shard
+        self._nodes = list(nodes)
+        self._timeout_seconds = timeout_seconds
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            timeout=timeout_seconds,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self.app(scope, self._closing_on_shutdown(receive), send)
+            return
+        node = self._owner(scope)
+        if node is None:
+            await self.app(scope, receive, send)
+        elif scope["type"] == "http":
+            await self._forward_http(node, scope, receive, send)
+        else:
+            await self._forward_websocket(node, scope, receive, send)
+
+    def _owner(self, scope: Scope) -> str | None:
+        """Base URL of the node owning the request's game, if it is another node."""
+        if scope["type"] not in ("http", "websocket"):
+            return None
+        match = _GAME_PATH.match(scope["path"])
+        if match is None:
+            return None
+        shard = shard_of(match.group(1))
+        if shard is None or shard == self._shard or shard >= len(self._nodes):
+            return None
+        if any(name == FORWARDED_HEADER for name, _ in scope["headers"]):
+            return None
+        return self._nodes[shard]
+
+    def _closing_on_shutdown(self, receive: Receive) -> Receive:
+        async def receive_and_close() -> Message:
+            message = await receive()
+            if message["type"] == "lifespan.shutdown":
+                await self._client.aclose()
+            return message
+
+        return receive_and_close
+
+    def _headers(self, scope: Scope, skip: frozenset[bytes]) -> list[tuple[bytes, bytes]]:
+        headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in _HOP_BY_HOP and name not in skip
+        ]
+        headers.append((FORWARDED_HEADER, str(self._shard).encode()))
+        return headers
+
+    async def _forward_http(self, node: str, scope: Scope, receive: Receive, send: Send) -> None:
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+        request = self._client.build_request(
+            scope["method"],
+            node + _target(scope),
+            headers=self._headers(scope, frozenset({b"content-length"})),
+            content=bytes(body),
+        )
+        try:
+            response = await self._client.send(request, stream=True)
+        except httpx.TransportError:
+            await _unavailable(node, send)
+            return
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (name, value)
+                    for name, value in response.headers.raw
+                    if name.lower() not in _HOP_BY_HOP
+                ],
+            })
+            async for chunk in response.aiter_raw():
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await response.aclose()
+
+    async def _forward_websocket(
+        self, node: str, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        await receive()  # websocket.connect
+        try:
+            upstream = await connect(
+                "ws" + node.removeprefix("http") + _target(scope),
+                additional_headers=[
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in self._headers(scope, _WEBSOCKET_HANDSHAKE)
+                ],
+                subprotocols=scope.get("subprotocols") or None,
+                open_timeout=self._timeout_seconds,
+            )
+        except (OSError, TimeoutError, InvalidHandshake):
+            await send({"type": "websocket.close", "code": 1011})  # rejects the handshake
+            return
+        async with upstream:
+            await send({"type": "websocket.accept", "subprotocol": upstream.subprotocol})
+            client_to_upstream = asyncio.create_task(_pump_to_upstream(receive, upstream))
+            try:
+                async for data in upstream:
+                    key = "text" if isinstance(data, str) else "bytes"
+                    await send({"type": "websocket.send", key: data})
+            except ConnectionClosed:
+                pass
+            finally:
+                client_to_upstream.cancel()
+                (relayed,) = await asyncio.gather(client_to_upstream, return_exceptions=True)
+            if isinstance(relayed, BaseException) and not isinstance(
+                relayed, (asyncio.CancelledError, ConnectionClosed, WebSocketDisconnect)
+            ):
+                raise relayed
+            if relayed is not True:  # the client is still connected
+                await send({
+                    "type": "websocket.close",
+                    "code": _close_code(upstream.close_code),
+                    "reason": upstream.close_reason or "",
+                })
+
+
+def _target(scope: Scope) -> str:
+    """Path and query string of the request, as received."""
+    path = scope.get("raw_path") or scope["path"].encode()
+    query = scope["query_string"]
+    return (path + b"?" + query if query else path).decode("latin-1")
+
+
+async def _pump_to_upstream(receive: Receive, upstream: "ClientConnection") -> bool:
+    """Relay client messages upstream. True once the client has disconnected."""
+    try:
+        while True:
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                await upstream.close(_close_code(message.get("code")))
+                return True
+            text = message.get("text")
+            await upstream.send(text if text is not None else message["bytes"])
+    except ConnectionClosed:
+        return False
+
+
+def _close_code(code: int | None) -> int:
+    return 1000 if code is None or code in _RESERVED_CLOSE_CODES else code
+
+
+async def _unavailable(node: str, send: Send) -> None:
+    body = ErrorResponse(
+        error=f"The node owning this game ({node}) is unavailable", code="SHARD_UNAVAILABLE"
+    ).model_dump_json().encode()
+    await send({
+        "type": "http.response.start",
+        "status": 502,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
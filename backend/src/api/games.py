@@ -1,73 +1,173 @@
-import asyncio
-import uuid
-
-from fastapi import APIRouter, Depends, status, WebSocket, WebSocketDisconnect
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    Query,
+    Response,
+    status,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
 
+from src.api.caching import etag, etag_matches, version_headers
+from src.api.encoding import (
+    encode_bulk_created,
+    encode_flip,
+    encode_flip_delta,
+    encode_game,
+    json_response,
+)
 from src.api.schemas import (
+    BulkCreateGamesRequest,
+    BulkCreatedGame,
     CreateGameRequest,
+    FlipDeltaResponse,
     FlipRequest,
     FlipResponse,
     GameResponse,
-    build_flip_response,
+    TurnRequest,
     build_response,
 )
-from src.deps import get_game_service
-from src.domain.types import Settings
+from src.config import config
+from src.deps import get_async_game_service, get_timer_hub
+from src.domain.types import TimerState
 from src.errors import GameNotFound
-from src.services.game import GameService
+from src.services.async_game import AsyncGameService
+from src.services.events import GameEvent
+from src.services.timer_hub import GAME_GONE, TimerHub, TimerUpdate
+from src.sharding import new_game_id
 
 router = APIRouter(prefix="/games", tags=["Games"])
 
+# Routes return pre-encoded JSON (src/api/encoding.py); response_model only documents it.
+# They are async and use AsyncGameService, so in-memory games are served on the event
+# loop without a hop to the threadpool.
+
 @router.post(
     "",
     response_model=GameResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Create a new game",
 )
-def create_game(
+async def create_game(
     body: CreateGameRequest,
-    game_service: GameService = Depends(get_game_service),
-) -> GameResponse:
+    game_service: AsyncGameService = Depends(get_async_game_service),
+) -> Response:
     """Create a new game with the given settings. Returns 201 with the public game view."""
-    game_id = str(uuid.uuid4())
-    settings = Settings(
-        user_name=body.user_name,
-        card_count=body.card_count,
-        countdown_seconds=body.countdown_seconds,
-        flip_back_delay_ms=body.flip_back_delay_ms,
-        max_bad_guesses=body.max_bad_guesses,
+    game_id = new_game_id(config.shard_id)
+    view = await game_service.create_game(game_id, body.to_settings())
+    return json_response(
+        encode_game(view), status.HTTP_201_CREATED, headers={"ETag": etag(view.version)}
+    )
+
+
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_class=StreamingResponse,
+    responses={
+        201: {
+            "description": "One JSON object per created game, in request order",
+            "content": {
+                "application/x-ndjson": {"schema": BulkCreatedGame.model_json_schema()}
+            },
+        }
+    },
+    summary="Create many games",
+)
+async def create_games(
+    body: BulkCreateGamesRequest,
+    game_service: AsyncGameService = Depends(get_async_game_service),
+) -> StreamingResponse:
+    """
+    Create one game per entry. All entries are validated first (400 naming the first
+    invalid one, nothing created); games are then saved in batches and each batch's
+    ids are streamed as newline-delimited JSON as soon as it is stored.
+    """
+    batches = game_service.create_games(
+        [(new_game_id(config.shard_id), entry.to_settings()) for entry in body.games]
+    )
+    return StreamingResponse(
+        (encode_bulk_created(batch) async for batch in batches),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/x-ndjson",
     )
-    view = game_service.create_game(game_id, settings)
-    return build_response(view)
 
 
 @router.get(
     "/{game_id}",
     response_model=GameResponse,
+    responses={304: {"description": "Not modified since the ETag in If-None-Match"}},
     summary="Get game state",
 )
-def get_game(
+async def get_game(
     game_id: str,
-    game_service: GameService = Depends(get_game_service),
-) -> GameResponse:
-    """Return the public state of the game. 404 if not found."""
-    view = game_service.get_game(game_id)
-    return build_response(view)
+    if_none_match: str | None = Header(
+        None, description="ETag from an earlier response; 304 if the game is unchanged"
+    ),
+    game_service: AsyncGameService = Depends(get_async_game_service),
+) -> Response:
+    """
+    Return the public state of the game. 404 if not found.
+    The ETag is the game's state version; with a matching If-None-Match the answer is
+    304 without a body. remainingSeconds is a snapshot: clients count down from
+    state.startedAt + settings.countdownSeconds, and expiry changes the version.
+    """
+    version, view = await game_service.get_game_if_changed(
+        game_id, lambda v: etag_matches(if_none_match, v)
+    )
+    if view is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=version_headers(version))
+    return json_response(encode_game(view), headers=version_headers(version))
 
 
 @router.post(
     "/{game_id}/flip",
-    response_model=FlipResponse,
+    response_model=FlipResponse | FlipDeltaResponse,
     summary="Flip a card",
 )
-def flip_card(
+async def flip_card(
     game_id: str,
     body: FlipRequest,
-    game_service: GameService = Depends(get_game_service),
-) -> FlipResponse:
-    """Flip a card by id. 400/409 on invalid flip, 404 if game not found."""
-    view = game_service.flip_card(game_id, body.card_id)
-    return build_flip_response(view)
+    delta: bool = Query(
+        False,
+        description="Return only the changed cards (FlipDeltaResponse) instead of the whole board",
+    ),
+    game_service: AsyncGameService = Depends(get_async_game_service),
+) -> Response:
+    """
+    Flip a card by id. 400/409 on invalid flip, 404 if game not found.
+    With ?delta=true, returns only the cards the flip changed; the client applies it
+    when its version equals baseVersion and otherwise refetches the game.
+    """
+    if delta:
+        delta_view = await game_service.flip_card_delta(game_id, body.card_id)
+        return json_response(
+            encode_flip_delta(delta_view), headers={"ETag": etag(delta_view.version)}
+        )
+    view = await game_service.flip_card(game_id, body.card_id)
+    return json_response(encode_flip(view), headers={"ETag": etag(view.version)})
+
+
+@router.post(
+    "/{game_id}/turns",
+    response_model=FlipResponse,
+    summary="Play a whole turn",
+)
+async def play_turn(
+    game_id: str,
+    body: TurnRequest,
+    game_service: AsyncGameService = Depends(get_async_game_service),
+) -> Response:
+    """
+    Flip both cards of a turn in one request; the turn is applied atomically.
+    Returns the same body as the second flip would (mismatched cards revealed).
+    400 on invalid flip (nothing applied), 404 if game not found.
+    """
+    first_card_id, second_card_id = body.card_ids
+    view = await game_service.play_turn(game_id, first_card_id, second_card_id)
+    return json_response(encode_flip(view), headers={"ETag": etag(view.version)})
 
 
 @router.post(
@@ -75,53 +175,70 @@ def flip_card(
     response_model=GameResponse,
     summary="Restart the game",
 )
-def restart_game(
+async def restart_game(
     game_id: str,
-    game_service: GameService = Depends(get_game_service),
-) -> GameResponse:
+    game_service: AsyncGameService = Depends(get_async_game_service),
+) -> Response:
     """Restart the game (same id, new board and state). 404 if not found."""
-    view = game_service.restart_game(game_id)
-    return build_response(view)
+    view = await game_service.restart_game(game_id)
+    return json_response(encode_game(view), headers={"ETag": etag(view.version)})
+
+
+def _timer_message(update: TimerState | GameEvent) -> dict:
+    if isinstance(update, GameEvent):
+        state = update.view.state
+        return {
+            "remainingSeconds": state.remaining_seconds,
+            "status": state.status,
+            "event": update.kind,
+            "version": update.version,
+            "game": build_response(update.view).model_dump(mode="json"),
+        }
+    return {"remainingSeconds": update.remaining_seconds, "status": update.status}
 
 
 @router.websocket("/{game_id}/timer")
 async def game_timer_websocket(
     websocket: WebSocket,
     game_id: str,
-    game_service: GameService = Depends(get_game_service),
+    game_service: AsyncGameService = Depends(get_async_game_service),
+    timer_hub: TimerHub = Depends(get_timer_hub),
 ) -> None:
     """
     Push timer updates every second while the game is playing.
     Sends JSON: { "remainingSeconds": int, "status": "playing"|"won"|"lost" }.
+    State changes are pushed as they happen, as the same message plus
+    "event" ("flipped"|"matched"|"mismatched"|"won"|"lost"|"restarted"),
+    "version" and "game" (the full game response).
     When status is not "playing", sends one final message and closes.
     On game not found, sends { "error": "NOT_FOUND" } and closes.
+    Updates come from the shared TimerHub ticker, not a loop per socket.
     """
     await websocket.accept()
+    queue = None
     try:
-        game_service.get_game(game_id)
-    except GameNotFound:
-        await websocket.send_json({"error": "NOT_FOUND"})
-        await websocket.close()
-        return
-
-    try:
+        update: TimerUpdate
+        try:
+            update = await game_service.get_timer(game_id)
+        except GameNotFound:
+            update = GAME_GONE
+        else:
+            queue = timer_hub.subscribe(game_id)
         while True:
-            view = game_service.get_game(game_id)
-            state = view.state
-            await websocket.send_json(
-                {
-                    "remainingSeconds": state.remaining_seconds,
-                    "status": state.status,
-                }
-            )
-            if state.status != "playing":
+            if update is GAME_GONE:
+                await websocket.send_json({"error": "NOT_FOUND"})
                 break
-            await asyncio.sleep(1)
+            message = _timer_message(update)
+            await websocket.send_json(message)
+            if message["status"] != "playing":
+                break
+            update = await queue.get()
     except WebSocketDisconnect:
         pass
     finally:
+        if queue is not None:
+            timer_hub.unsubscribe(game_id, queue)
         try:
             await websocket.close()
         except Exception:
             pass
-
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Path, Query
+
+from src.api.schemas import LeaderboardResponse, build_leaderboard_response
+from src.deps import get_leaderboard
+from src.domain.constants import CARD_COUNT_MAX, CARD_COUNT_MIN, LEADERBOARD_LIMIT_MAX
+from src.services.leaderboard import Leaderboard
+
+router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
+
+
+@router.get(
+    "/{card_count}",
+    response_model=LeaderboardResponse,
+    summary="Best won games for a card count",
+)
+async def get_leaderboard_top(
+    card_count: int = Path(..., ge=CARD_COUNT_MIN, le=CARD_COUNT_MAX),
+    limit: int = Query(10, ge=1, le=LEADERBOARD_LIMIT_MAX),
+    leaderboard: Leaderboard = Depends(get_leaderboard),
+) -> LeaderboardResponse:
+    """
+    The best won games played with card_count cards: fewest turns first, then fewest
+    bad guesses, then fastest. Games are ranked when their winning flip is made.
+    """
+    return build_leaderboard_response(
+        card_count, leaderboard.size(card_count), leaderboard.top(card_count, limit)
+    )
@@ -0,0 +1,67 @@
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.metrics import HTTP_REQUEST_SECONDS, Histogram
+
+# Methods outside this set share one label, so arbitrary request methods cannot grow
+# the number of series.
+_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """
+    Records each HTTP request's duration in memory_game_http_request_duration_seconds,
+    labelled with the route template (/api/games/{game_id}, not the game id) so the
+    number of series stays bounded. Requests the router did not match are labelled
+    "unmatched".
+
+    The router leaves the matched route in scope["route"], but for routes of an
+    included router its path lacks the include prefix, so the template is built once
+    per route from the prefix of the first request it matched and the route's path
+    format. Recording then costs a few dict lookups and a bisect.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # id(route) -> method -> series; routes live as long as the app (and are not
+        # hashable).
+        self._series: dict[int, dict[str, Histogram]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            method = scope["method"]
+            if method not in _METHODS:
+                method = "OTHER"
+            self._histogram(scope, method).observe(time.perf_counter() - start)
+
+    def _histogram(self, scope: Scope, method: str) -> Histogram:
+        route = scope.get("route")
+        by_method = self._series.get(id(route))
+        if by_method is None:
+            by_method = self._series[id(route)] = {}
+        series = by_method.get(method)
+        if series is None:
+            template = UNMATCHED_ROUTE if route is None else route_template(scope)
+            series = by_method[method] = HTTP_REQUEST_SECONDS.labels(method, template)
+        return series
+
+
+def route_template(scope: Scope) -> str:
+    """
+    The matched route's path format (/games/{game_id}) after the prefix of the
+    routers it was included through (/api), which is the part of the request path
+    in front of the route's own path.
+    """
+    route = scope["route"]
+    own_path = route.url_path_for(route.name, **scope.get("path_params", {}))
+    path = scope["path"]
+    prefix = path[: len(path) - len(own_path)] if path.endswith(own_path) else ""
+    return prefix + route.path_format
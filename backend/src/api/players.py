@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Path, Query
+
+from src.api.schemas import PlayerGamesResponse, build_player_games_response
+from src.deps import get_async_game_service
+from src.domain.constants import PLAYER_GAMES_LIMIT_MAX, USER_NAME_MAX
+from src.services.async_game import AsyncGameService
+
+router = APIRouter(prefix="/players", tags=["Players"])
+
+
+@router.get(
+    "/{user_name}/games",
+    response_model=PlayerGamesResponse,
+    summary="List a player's games",
+)
+async def list_player_games(
+    user_name: str = Path(..., min_length=1, max_length=USER_NAME_MAX),
+    cursor: str | None = Query(None, description="nextCursor from the previous page"),
+    limit: int = Query(20, ge=1, le=PLAYER_GAMES_LIMIT_MAX),
+    game_service: AsyncGameService = Depends(get_async_game_service),
+) -> PlayerGamesResponse:
+    """
+    The games stored for user_name, without their boards, in game id order and
+    limit at a time; follow nextCursor until it is null. Pages are read from a
+    per-player index, so their cost does not grow with the number of stored games.
+    Each node lists only its own shard's games.
+    """
+    games, next_cursor = await game_service.list_player_games(
+        user_name, after=cursor, limit=limit
+    )
+    return build_player_games_response(games, next_cursor)
@@ -0,0 +1,129 @@
+import cProfile
+import itertools
+import logging
+import os
+import random
+import re
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src import profiling
+from src.api.metrics import UNMATCHED_ROUTE, route_template
+
+logger = logging.getLogger(__name__)
+
+# Requests carrying this header (with any value but 0) are always profiled.
+PROFILE_HEADER = b"x-profile"
+
+# Module-level functions the request path calls through its modules' globals.
+_DOMAIN_SPANS = (
+    "apply_countdown_in_place",
+    "build_public_delta",
+    "build_public_view",
+    "flip_card_in_place",
+    "play_turn_in_place",
+    "restart_game_in_place",
+)
+_SERIALIZER_SPANS = (
+    "build_response",
+    "encode_bulk_created",
+    "encode_flip",
+    "encode_flip_delta",
+    "encode_game",
+)
+
+
+def instrument_handlers() -> None:
+    """Time the domain steps of every game update and the response serializers."""
+    from src.api import games
+    from src.services import updates
+
+    profiling.instrument(updates, _DOMAIN_SPANS, "domain.", session_arg=True)
+    profiling.instrument(games, _SERIALIZER_SPANS, "serialize.")
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests that carry an X-Profile header, and a random sample_rate of the
+    others. A profiled request collects the spans set up by instrument() (service,
+    repository, domain and serializer calls); when it takes longer than slow_ms, a
+    log line gives its route, the game's card count and the span breakdown, and its
+    cProfile stats are written to directory (open them with python -m pstats or
+    snakeviz).
+
+    cProfile runs on the event loop thread, one request at a time: it also sees other
+    requests' coroutines that run while the profiled one is suspended, and misses work
+    the request hands to other threads (the sqlite store). Spans have neither problem.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        directory: str,
+        sample_rate: float = 0.0,
+        slow_ms: float = 100.0,
+    ) -> None:
+        self.app = app
+        self._directory = directory
+        self._sample_rate = sample_rate
+        self._slow_seconds = slow_ms / 1e3
+        self._profiler_busy = False
+        self._dumps = itertools.count()
+        os.makedirs(directory, exist_ok=True)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._sampled(scope):
+            await self.app(scope, receive, send)
+            return
+        profile, token = profiling.start()
+        profiler = None
+        if not self._profiler_busy:
+            self._profiler_busy = True
+            profiler = cProfile.Profile()
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                self._profiler_busy = False
+            profiling.stop(token)
+            if elapsed >= self._slow_seconds:
+                self._report(scope, elapsed, profile, profiler)
+
+    def _sampled(self, scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return value != b"0"
+        return self._sample_rate > 0 and random.random() < self._sample_rate
+
+    def _report(
+        self,
+        scope: Scope,
+        elapsed: float,
+        profile: profiling.RequestProfile,
+        profiler: cProfile.Profile | None,
+    ) -> None:
+        route = UNMATCHED_ROUTE if scope.get("route") is None else route_template(scope)
+        dump = ""
+        if profiler is not None:
+            name = re.sub(r"[^A-Za-z0-9]+", "_", f"{scope['method']} {route}").strip("_")
+            path = os.path.join(
+                self._directory,
+                f"{time.strftime('%Y%m%dT%H%M%S')}-{next(self._dumps)}-{name}.prof",
+            )
+            profiler.dump_stats(path)
+            dump = f"; cProfile stats in {path}"
+        logger.warning(
+            "Slow request %s %s took %.1fms (card_count=%s): %s%s",
+            scope["method"],
+            route,
+            elapsed * 1e3,
+            "-" if profile.card_count is None else profile.card_count,
+            profile.breakdown() or "no spans",
+            dump,
+        )
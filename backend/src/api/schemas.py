@@ -3,29 +3,63 @@ from typing import TYPE_CHECKING
 from pydantic import BaseModel, ConfigDict, Field
 
 from src.domain.constants import (
+    BOARD_SEED_MAX,
+    BULK_CREATE_MAX,
     CARD_COUNT_MAX,
     CARD_COUNT_MIN,
     COUNTDOWN_SECONDS_MAX,
     COUNTDOWN_SECONDS_MIN,
+    FLIP_BACK_DELAY_MS_MAX,
+    MAX_BAD_GUESSES_MAX,
+    USER_NAME_MAX,
 )
 
+from src.domain.types import Settings
+
 if TYPE_CHECKING:
-    from src.domain.types import PublicGameView
+    from src.domain.types import GameSummary, PublicGameDelta, PublicGameView
+    from src.services.leaderboard import LeaderboardEntry
 
 # --- Requests ---
 
 class CreateGameRequest(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
-    user_name: str = Field(..., alias="userName", min_length=1)
+    user_name: str = Field(..., alias="userName", min_length=1, max_length=USER_NAME_MAX)
     card_count: int = Field(
         ..., alias="cardCount", ge=CARD_COUNT_MIN, le=CARD_COUNT_MAX
     )
     countdown_seconds: int = Field(
         ..., alias="countdownSeconds", ge=COUNTDOWN_SECONDS_MIN, le=COUNTDOWN_SECONDS_MAX
     )
-    flip_back_delay_ms: int = Field(..., alias="flipBackDelayMs", ge=0)
-    max_bad_guesses: int | None = Field(None, alias="maxBadGuesses", gt=0)
+    flip_back_delay_ms: int = Field(
+        ..., alias="flipBackDelayMs", ge=0, le=FLIP_BACK_DELAY_MS_MAX
+    )
+    max_bad_guesses: int | None = Field(
+        None, alias="maxBadGuesses", gt=0, le=MAX_BAD_GUESSES_MAX
+    )
+    seed: int | None = Field(
+        None,
+        ge=0,
+        le=BOARD_SEED_MAX,
+        description="Daily-challenge seed: games with the same seed and cardCount share one board",
+    )
+
+    def to_settings(self) -> Settings:
+        return Settings(
+            user_name=self.user_name,
+            card_count=self.card_count,
+            countdown_seconds=self.countdown_seconds,
+            flip_back_delay_ms=self.flip_back_delay_ms,
+            max_bad_guesses=self.max_bad_guesses,
+            seed=self.seed,
+        )
+
+
+class BulkCreateGamesRequest(BaseModel):
+    """One entry per game to create (player name and settings)."""
+
+    games: list[CreateGameRequest] = Field(..., min_length=1, max_length=BULK_CREATE_MAX)
 
 
 class FlipRequest(BaseModel):
@@ -33,8 +67,25 @@ class FlipRequest(BaseModel):
 
     card_id: str = Field(..., alias="cardId", min_length=1)
 
+
+class TurnRequest(BaseModel):
+    """Both cards of one turn, in flip order."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    card_ids: list[str] = Field(..., alias="cardIds", min_length=2, max_length=2)
+
 # --- Responses ---
 
+class BulkCreatedGame(BaseModel):
+    """One line of the bulk create response (application/x-ndjson)."""
+
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    game_id: str = Field(..., alias="gameId")
+    user_name: str = Field(..., alias="userName")
+
+
 class PublicCardResponse(BaseModel):
     model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
 
@@ -52,6 +103,7 @@ class SettingsResponse(BaseModel):
     countdown_seconds: int = Field(..., alias="countdownSeconds")
     flip_back_delay_ms: int = Field(..., alias="flipBackDelayMs")
     max_bad_guesses: int | None = Field(None, alias="maxBadGuesses")
+    seed: int | None = None
 
 
 class GameStateResponse(BaseModel):
@@ -71,6 +123,7 @@ class GameResponse(BaseModel):
     board: list[PublicCardResponse]
     settings: SettingsResponse
     state: GameStateResponse
+    version: int
 
 
 class FlipResponse(BaseModel):
@@ -81,6 +134,65 @@ class FlipResponse(BaseModel):
     game_id: str = Field(..., alias="gameId")
     board: list[PublicCardResponse]
     state: GameStateResponse
+    version: int
+
+
+class FlipDeltaResponse(BaseModel):
+    """
+    Game state after a flip with only the cards it changed (?delta=true).
+    Apply when the client's version equals baseVersion; otherwise GET the full game.
+    """
+
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    game_id: str = Field(..., alias="gameId")
+    version: int
+    base_version: int = Field(..., alias="baseVersion")
+    cards: list[PublicCardResponse]
+    state: GameStateResponse
+
+
+class LeaderboardEntryResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    rank: int
+    game_id: str = Field(..., alias="gameId")
+    user_name: str = Field(..., alias="userName")
+    turns: int
+    bad_guesses: int = Field(..., alias="badGuesses")
+    seconds: float
+
+
+class LeaderboardResponse(BaseModel):
+    """Best won games for one card count, best first."""
+
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    card_count: int = Field(..., alias="cardCount")
+    total: int = Field(..., description="Games ranked on this board")
+    entries: list[LeaderboardEntryResponse]
+
+
+class GameSummaryResponse(BaseModel):
+    """A game without its board."""
+
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    game_id: str = Field(..., alias="gameId")
+    settings: SettingsResponse
+    state: GameStateResponse
+    version: int
+
+
+class PlayerGamesResponse(BaseModel):
+    """One page of a player's games, in game id order."""
+
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    games: list[GameSummaryResponse]
+    next_cursor: str | None = Field(
+        None, alias="nextCursor", description="Pass as cursor for the next page; null on the last"
+    )
 
 # --- Error response ---
 
@@ -107,6 +219,7 @@ def build_response(view: "PublicGameView") -> GameResponse:
         countdown_seconds=view.settings.countdown_seconds,
         flip_back_delay_ms=view.settings.flip_back_delay_ms,
         max_bad_guesses=view.settings.max_bad_guesses,
+        seed=view.settings.seed,
     )
     state = GameStateResponse(
         status=view.state.status,
@@ -120,6 +233,37 @@ def build_response(view: "PublicGameView") -> GameResponse:
         board=cards,
         settings=settings,
         state=state,
+        version=view.version,
+    )
+
+
+def build_player_games_response(
+    games: "list[GameSummary]", next_cursor: str | None
+) -> PlayerGamesResponse:
+    return PlayerGamesResponse(
+        games=[
+            GameSummaryResponse(
+                game_id=game.game_id,
+                settings=SettingsResponse(
+                    user_name=game.settings.user_name,
+                    card_count=game.settings.card_count,
+                    countdown_seconds=game.settings.countdown_seconds,
+                    flip_back_delay_ms=game.settings.flip_back_delay_ms,
+                    max_bad_guesses=game.settings.max_bad_guesses,
+                    seed=game.settings.seed,
+                ),
+                state=GameStateResponse(
+                    status=game.state.status,
+                    turns=game.state.turns,
+                    bad_guesses=game.state.bad_guesses,
+                    started_at=game.state.started_at,
+                    remaining_seconds=game.state.remaining_seconds,
+                ),
+                version=game.version,
+            )
+            for game in games
+        ],
+        next_cursor=next_cursor,
     )
 
 
@@ -140,4 +284,50 @@ def build_flip_response(view: "PublicGameView") -> "FlipResponse":
         started_at=view.state.started_at,
         remaining_seconds=view.state.remaining_seconds,
     )
-    return FlipResponse(game_id=view.game_id, board=cards, state=state)
+    return FlipResponse(game_id=view.game_id, board=cards, state=state, version=view.version)
+
+
+def build_flip_delta_response(delta: "PublicGameDelta") -> FlipDeltaResponse:
+    cards = [
+        PublicCardResponse(
+            id=c.id,
+            is_face_up=c.is_face_up,
+            is_matched=c.is_matched,
+            emoji=c.emoji,
+        )
+        for c in delta.cards
+    ]
+    state = GameStateResponse(
+        status=delta.state.status,
+        turns=delta.state.turns,
+        bad_guesses=delta.state.bad_guesses,
+        started_at=delta.state.started_at,
+        remaining_seconds=delta.state.remaining_seconds,
+    )
+    return FlipDeltaResponse(
+        game_id=delta.game_id,
+        version=delta.version,
+        base_version=delta.base_version,
+        cards=cards,
+        state=state,
+    )
+
+
+def build_leaderboard_response(
+    card_count: int, total: int, entries: "list[LeaderboardEntry]"
+) -> LeaderboardResponse:
+    return LeaderboardResponse(
+        card_count=card_count,
+        total=total,
+        entries=[
+            LeaderboardEntryResponse(
+                rank=rank,
+                game_id=entry.game_id,
+                user_name=entry.user_name,
+                turns=entry.turns,
+                bad_guesses=entry.bad_guesses,
+                seconds=entry.seconds,
+            )
+            for rank, entry in enumerate(entries, start=1)
+        ],
+    )
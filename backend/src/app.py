@@ -1,19 +1,112 @@
+import asyncio
+import contextlib
+import logging
+
 from starlette.requests import Request
 
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
+from src.api.forwarding import ShardForwardingMiddleware
 from src.api.games import router as games_router
+from src.api.leaderboard import router as leaderboard_router
+from src.api.metrics import RequestMetricsMiddleware
+from src.api.players import router as players_router
+from src.api.profiling import ProfilingMiddleware, instrument_handlers
 from src.api.schemas import ErrorResponse
-from src.errors import GameNotFound, InvalidFlip, InvalidSettings
+from src.config import config
+from src.deps import (
+    get_board_pool,
+    get_game_service,
+    get_journal,
+    get_repository,
+    get_snapshot_path,
+)
+from src.errors import GameNotFound, InvalidFlip, InvalidSettings, StoreFull, VersionConflict
+from src.metrics import REGISTRY
+from src.services.checkpointer import run_checkpointer
+from src.sharding import parse_nodes
+from src.storage.snapshot import restore_snapshot
+from src.storage.sweeper import run_sweeper
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """
+    Run the session eviction sweeper (and the board pool filler) for the lifetime of
+    the app. With a journal, recover sessions before serving, snapshot periodically
+    and once more on shutdown. With a snapshot path, restore the snapshot before
+    serving and write it on shutdown.
+    """
+    journal = get_journal()
+    snapshot_path = get_snapshot_path()
+    board_pool = get_board_pool()
+    if board_pool is not None:
+        board_pool.start()
+    if snapshot_path is not None:
+        restored = restore_snapshot(snapshot_path, get_repository())
+        logger.info(
+            "Restored %d game sessions (%d expired while down) in %.2fs",
+            restored.sessions,
+            restored.expired,
+            restored.seconds,
+        )
+    tasks = [
+        asyncio.create_task(run_sweeper(get_repository(), config.eviction_sweep_interval_seconds))
+    ]
+    if journal is not None:
+        stats = journal.recover(get_repository())
+        logger.info(
+            "Recovered %d game sessions (%d from snapshot, %d events) in %.2fs",
+            stats.sessions,
+            stats.snapshot_sessions,
+            stats.events_replayed,
+            stats.seconds,
+        )
+        journal.start()
+        tasks.append(
+            asyncio.create_task(
+                run_checkpointer(
+                    get_game_service(),
+                    journal,
+                    config.journal_snapshot_interval_seconds,
+                    config.journal_snapshot_min_events,
+                )
+            )
+        )
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if journal is not None:
+            get_game_service().checkpoint()
+            journal.close()
+        if snapshot_path is not None:
+            try:
+                saved = get_game_service().save_snapshot(snapshot_path)
+            except Exception:
+                logger.exception("Saving the game snapshot to %s failed", snapshot_path)
+            else:
+                logger.info("Saved %d game sessions to %s", saved, snapshot_path)
+        if board_pool is not None:
+            board_pool.close()
+
 
 app = FastAPI(
     title="Memory Game API",
     version="0.1.0",
     openapi_tags=[
         {"name": "Games", "description": "Create, get, flip, and restart games"},
+        {"name": "Leaderboard", "description": "Best won games per card count"},
+        {"name": "Players", "description": "Games by player"},
     ],
+    lifespan=lifespan,
 )
 
 import os
@@ -38,13 +131,33 @@ app.add_middleware(
 
 @app.middleware("http")
 async def no_store_games(request: Request, call_next):
-    """Prevent caching of game endpoints so refetches after restart always get fresh state."""
+    """
+    Prevent caching of game endpoints unless the route opted into revalidation
+    (GET game state sets an ETag and no-cache, so refetches still see every change).
+    """
     response = await call_next(request)
     if request.url.path.startswith("/api/games"):
-        response.headers["Cache-Control"] = "no-store"
+        response.headers.setdefault("Cache-Control", "no-store")
     return response
 
 
+app.add_middleware(RequestMetricsMiddleware)
+
+if config.profile_dir is not None:
+    instrument_handlers()
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=config.profile_dir,
+        sample_rate=config.profile_sample_rate,
+        slow_ms=config.profile_slow_ms,
+    )
+
+# Outermost, so requests for other shards' games leave before any local handling.
+shard_nodes = parse_nodes(config.shard_nodes)
+if shard_nodes:
+    app.add_middleware(ShardForwardingMiddleware, shard=config.shard_id, nodes=shard_nodes)
+
+
 api_router = APIRouter()
 
 
@@ -56,6 +169,8 @@ def api_root():
 
 
 api_router.include_router(games_router)
+api_router.include_router(leaderboard_router)
+api_router.include_router(players_router)
 
 
 @app.get("/health", include_in_schema=False)
@@ -64,14 +179,33 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/health/storage", include_in_schema=False)
+def storage_health():
+    """Game store size and eviction counters for monitoring."""
+    stats = get_repository().stats()
+    return {
+        "size": stats.size,
+        "evictedFinished": stats.evicted_finished,
+        "evictedIdle": stats.evicted_idle,
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Request latency, flip, view-building and store metrics in the Prometheus text format."""
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/", include_in_schema=False)
 def root():
     """Root redirects to docs."""
     return {"docs": "/docs", "health": "/health"}
 
 
+# Async so error responses stay on the event loop (Starlette runs sync handlers in the
+# threadpool).
 @app.exception_handler(GameNotFound)
-def game_not_found_handler(_request, exc: GameNotFound):
+async def game_not_found_handler(_request, exc: GameNotFound):
     return JSONResponse(
         status_code=404,
         content=ErrorResponse(error=str(exc), code="NOT_FOUND").model_dump(by_alias=False),
@@ -79,7 +213,7 @@ def game_not_found_handler(_request, exc: GameNotFound):
 
 
 @app.exception_handler(InvalidFlip)
-def invalid_flip_handler(_request, exc: InvalidFlip):
+async def invalid_flip_handler(_request, exc: InvalidFlip):
     return JSONResponse(
         status_code=400,
         content=ErrorResponse(error=str(exc), code="INVALID_FLIP").model_dump(by_alias=False),
@@ -87,11 +221,27 @@ def invalid_flip_handler(_request, exc: InvalidFlip):
 
 
 @app.exception_handler(InvalidSettings)
-def invalid_settings_handler(_request, exc: InvalidSettings):
+async def invalid_settings_handler(_request, exc: InvalidSettings):
     return JSONResponse(
         status_code=400,
         content=ErrorResponse(error=str(exc), code="VALIDATION").model_dump(by_alias=False),
     )
 
 
+@app.exception_handler(VersionConflict)
+async def version_conflict_handler(_request, exc: VersionConflict):
+    return JSONResponse(
+        status_code=409,
+        content=ErrorResponse(error=str(exc), code="CONFLICT").model_dump(by_alias=False),
+    )
+
+
+@app.exception_handler(StoreFull)
+async def store_full_handler(_request, exc: StoreFull):
+    return JSONResponse(
+        status_code=503,
+        content=ErrorResponse(error=str(exc), code="STORE_FULL").model_dump(by_alias=False),
+    )
+
+
 app.include_router(api_router, prefix="/api")
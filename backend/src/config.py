@@ -0,0 +1,52 @@
+from typing import Literal
+
+from pydantic_settings import BaseSettings
+
+
+class AppConfig(BaseSettings):
+    """Backend configuration, read from environment variables (e.g. FINISHED_GAME_TTL_MINUTES)."""
+
+    # Session storage backend
+    storage_backend: Literal["memory", "sqlite", "shared"] = "memory"
+    sqlite_path: str = "games.db"
+    # Memory-mapped slot file shared by every worker process on the host
+    shared_path: str = "/dev/shm/memory-game.slots"
+    shared_slots: int = 65_536
+    shared_slot_bytes: int = 512
+
+    # Session retention
+    finished_game_ttl_minutes: float = 30.0
+    idle_game_ttl_minutes: float = 60.0
+    eviction_sweep_interval_seconds: float = 5.0
+
+    # Event journal for the memory backend (disabled when journal_dir is unset)
+    journal_dir: str | None = None
+    journal_sync_commit: bool = True
+    journal_snapshot_interval_seconds: float = 60.0
+    journal_snapshot_min_events: int = 10_000
+
+    # Snapshot file for the memory backend without a journal (disabled when unset):
+    # written on shutdown and loaded on startup, so a redeploy keeps the games.
+    snapshot_path: str | None = None
+
+    # Horizontal scaling: this node's shard, and the base URLs of every node by shard
+    # number (comma-separated). Requests for another shard's games are forwarded there.
+    shard_id: int = 0
+    shard_nodes: str = ""
+
+    # Pre-generated random boards kept per card count (0 disables the pool)
+    board_pool_size: int = 64
+
+    # Won games kept per card count on the leaderboard (0 keeps every one)
+    leaderboard_size: int = 0
+
+    # Opt-in request profiling (disabled when profile_dir is unset). Requests with an
+    # X-Profile header, and a sampled fraction of the rest, are timed call by call;
+    # the ones slower than profile_slow_ms are logged and their cProfile stats dumped
+    # into profile_dir.
+    profile_dir: str | None = None
+    profile_sample_rate: float = 0.0
+    profile_slow_ms: float = 100.0
+
+
+config = AppConfig()
@@ -1,9 +1,160 @@
+from src import metrics, profiling
+from src.config import config
+from src.locks import StripedLock
+from src.services.async_game import AsyncGameService
+from src.services.board_pool import BoardPool
+from src.services.events import GameEventBus
 from src.services.game import GameService
+from src.services.leaderboard import Leaderboard
+from src.services.timer_hub import TimerHub
+from src.storage.async_repository import to_async
+from src.storage.journal import GameJournal
 from src.storage.memory import MemoryGameRepository
+from src.storage.repository import EvictingGameRepository, RetentionPolicy, StoreStats
+from src.storage.shared import SharedMemoryGameRepository
+from src.storage.sqlite import SqliteGameRepository
 
-_repository = MemoryGameRepository()
-_game_service = GameService(_repository)
+
+def _build_repository() -> EvictingGameRepository:
+    retention = RetentionPolicy(
+        finished_ttl_seconds=config.finished_game_ttl_minutes * 60,
+        idle_ttl_seconds=config.idle_game_ttl_minutes * 60,
+    )
+    if config.storage_backend == "sqlite":
+        return SqliteGameRepository(config.sqlite_path, retention)
+    if config.storage_backend == "shared":
+        return SharedMemoryGameRepository(
+            config.shared_path,
+            retention,
+            slots=config.shared_slots,
+            slot_bytes=config.shared_slot_bytes,
+        )
+    return MemoryGameRepository(retention)
+
+
+def _build_journal() -> GameJournal | None:
+    if config.journal_dir is None:
+        return None
+    if config.storage_backend != "memory":
+        raise ValueError("JOURNAL_DIR is only supported with STORAGE_BACKEND=memory")
+    return GameJournal(config.journal_dir, sync_commit=config.journal_sync_commit)
+
+
+def _build_snapshot_path() -> str | None:
+    if config.snapshot_path is None:
+        return None
+    if config.storage_backend != "memory":
+        raise ValueError("SNAPSHOT_PATH is only supported with STORAGE_BACKEND=memory")
+    if config.journal_dir is not None:
+        raise ValueError("SNAPSHOT_PATH and JOURNAL_DIR are exclusive: the journal snapshots itself")
+    return config.snapshot_path
+
+
+def _build_board_pool() -> BoardPool | None:
+    if config.board_pool_size <= 0:
+        return None
+    return BoardPool(config.board_pool_size)
+
+
+_repository = _build_repository()
+_journal = _build_journal()
+_snapshot_path = _build_snapshot_path()
+_board_pool = _build_board_pool()
+_events = GameEventBus()
+_leaderboard = Leaderboard(config.leaderboard_size)
+_locks = StripedLock()  # shared: both services update the same stored sessions
+_game_service = GameService(
+    _repository,
+    locks=_locks,
+    journal=_journal,
+    events=_events,
+    boards=_board_pool,
+    leaderboard=_leaderboard,
+)
+_async_game_service = AsyncGameService(
+    to_async(_repository),
+    locks=_locks,
+    journal=_journal,
+    events=_events,
+    boards=_board_pool,
+    leaderboard=_leaderboard,
+)
+_timer_hub = TimerHub(_game_service, events=_events)
+
+if config.profile_dir is not None:
+    # Spans for profiled requests (see src/api/profiling.py); left unwrapped otherwise.
+    _service_calls = (
+        "create_game",
+        "flip_card",
+        "flip_card_delta",
+        "get_game",
+        "get_game_if_changed",
+        "play_turn",
+        "restart_game",
+    )
+    profiling.instrument(_game_service, _service_calls, "service.")
+    profiling.instrument(_async_game_service, _service_calls, "service.")
+    profiling.instrument(_repository, ("find_by_id", "save", "save_many"), "repository.")
+
+
+def _evicted(stats: StoreStats) -> dict[str, float]:
+    return {"finished": stats.evicted_finished, "idle": stats.evicted_idle}
+
+
+# Read at scrape time, from the /metrics handler's thread.
+metrics.REGISTRY.gauge(
+    "memory_game_games",
+    "Stored games by status",
+    _repository.count_by_status,
+    label="status",
+)
+metrics.REGISTRY.gauge(
+    "memory_game_store_size", "Games in the store", lambda: {"": _repository.stats().size}
+)
+metrics.REGISTRY.gauge(
+    "memory_game_evicted_games_total",
+    "Games evicted from the store, by reason",
+    lambda: _evicted(_repository.stats()),
+    label="reason",
+    kind="counter",
+)
+metrics.REGISTRY.gauge(
+    "memory_game_timer_websockets",
+    "Open timer WebSocket connections",
+    lambda: {"": _timer_hub.subscriber_count()},
+)
+
+
+def get_repository() -> EvictingGameRepository:
+    return _repository
+
+
+def get_journal() -> GameJournal | None:
+    return _journal
+
+
+def get_snapshot_path() -> str | None:
+    return _snapshot_path
+
+
+def get_board_pool() -> BoardPool | None:
+    return _board_pool
 
 
 def get_game_service() -> GameService:
     return _game_service
+
+
+# Dependencies of async routes are async too: FastAPI runs sync ones in the threadpool.
+
+
+async def get_async_game_service() -> AsyncGameService:
+    return _async_game_service
+
+
+async def get_timer_hub() -> TimerHub:
+    return _timer_hub
+
+
+async def get_leaderboard() -> Leaderboard:
+    return _leaderboard
@@ -0,0 +1,242 @@
+from collections.abc import Iterable, Iterator, Set
+from dataclasses import dataclass
+
+from src.domain.constants import CARD_COUNT_MAX, EMOJI_SET
+
+CARD_ID_PREFIX = "card-"
+
+EMOJI_SYMBOLS: tuple[str, ...] = tuple(EMOJI_SET)
+
+_CANONICAL_IDS: tuple[str, ...] = tuple(
+    f"{CARD_ID_PREFIX}{i}" for i in range(CARD_COUNT_MAX)
+)
+_CANONICAL_INDEX: dict[str, int] = {card_id: i for i, card_id in enumerate(_CANONICAL_IDS)}
+
+
+@dataclass(frozen=True)
+class InternalCard:
+    """Server-only card: id and true emoji for matching."""
+    id: str
+    emoji: str
+
+
+def card_id_for(index: int) -> str:
+    """Canonical card id for a board index (interned for indices below CARD_COUNT_MAX)."""
+    if index < len(_CANONICAL_IDS):
+        return _CANONICAL_IDS[index]
+    return f"{CARD_ID_PREFIX}{index}"
+
+
+def parse_card_index(card_id: str) -> int | None:
+    """Parse a canonical "card-{i}" id into its index; None for anything else."""
+    index = _CANONICAL_INDEX.get(card_id)
+    if index is not None:
+        return index
+    if not card_id.startswith(CARD_ID_PREFIX):
+        return None
+    digits = card_id[len(CARD_ID_PREFIX):]
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    if len(digits) > 1 and digits[0] == "0":
+        return None
+    return int(digits)
+
+
+class Board:
+    """
+    Immutable card layout. Each card is a one-byte symbol code into a symbol table,
+    and cards are addressed by index. Boards built by the game use canonical
+    "card-{i}" ids, so lookups by id are a parse instead of a scan.
+    """
+
+    __slots__ = ("_codes", "_symbols", "_ids", "_card_ids", "_index", "_full_mask")
+
+    def __init__(
+        self,
+        codes: bytes,
+        symbols: tuple[str, ...] = EMOJI_SYMBOLS,
+        ids: tuple[str, ...] | None = None,
+    ) -> None:
+        codes = bytes(codes)
+        if codes and max(codes) >= len(symbols):
+            raise ValueError("symbol code out of range for symbol table")
+        if ids is not None and len(ids) != len(codes):
+            raise ValueError("ids must have one entry per card")
+        self._codes = codes
+        self._symbols = symbols
+        self._ids = ids
+        if ids is not None:
+            self._card_ids = ids
+        elif len(codes) <= len(_CANONICAL_IDS):
+            self._card_ids = _CANONICAL_IDS[:len(codes)]
+        else:
+            self._card_ids = tuple(card_id_for(i) for i in range(len(codes)))
+        self._index = None if ids is None else {card_id: i for i, card_id in enumerate(ids)}
+        self._full_mask = (1 << len(codes)) - 1
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[InternalCard]) -> "Board":
+        """Build a board from explicit cards (any ids, any emojis)."""
+        cards = list(cards)
+        symbols: list[str] = list(EMOJI_SYMBOLS)
+        code_of = {emoji: code for code, emoji in enumerate(symbols)}
+        codes = bytearray()
+        for card in cards:
+            code = code_of.get(card.emoji)
+            if code is None:
+                code = len(symbols)
+                if code > 0xFF:
+                    raise ValueError("too many distinct emojis for one board")
+                code_of[card.emoji] = code
+                symbols.append(card.emoji)
+            codes.append(code)
+        ids = tuple(card.id for card in cards)
+        canonical = all(card_id == card_id_for(i) for i, card_id in enumerate(ids))
+        return cls(
+            bytes(codes),
+            EMOJI_SYMBOLS if len(symbols) == len(EMOJI_SYMBOLS) else tuple(symbols),
+            None if canonical else ids,
+        )
+
+    @property
+    def codes(self) -> bytes:
+        return self._codes
+
+    @property
+    def symbols(self) -> tuple[str, ...]:
+        return self._symbols
+
+    @property
+    def ids(self) -> tuple[str, ...] | None:
+        """Explicit card ids, or None when the board uses canonical "card-{i}" ids."""
+        return self._ids
+
+    @property
+    def card_ids(self) -> tuple[str, ...]:
+        """Id of every card, in board order."""
+        return self._card_ids
+
+    @property
+    def full_mask(self) -> int:
+        """Bitset with one bit set per card."""
+        return self._full_mask
+
+    def index_of(self, card_id: str) -> int | None:
+        """Board index for a card id, or None if the card is not on this board."""
+        if self._index is not None:
+            return self._index.get(card_id)
+        index = parse_card_index(card_id)
+        if index is None or index >= len(self._codes):
+            return None
+        return index
+
+    def card_id(self, index: int) -> str:
+        return self._card_ids[index]
+
+    def symbol(self, index: int) -> int:
+        return self._codes[index]
+
+    def emoji(self, index: int) -> str:
+        return self._symbols[self._codes[index]]
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, index: int) -> InternalCard:
+        if index < 0:
+            index += len(self._codes)
+        if not 0 <= index < len(self._codes):
+            raise IndexError("board index out of range")
+        return InternalCard(id=self.card_id(index), emoji=self.emoji(index))
+
+    def __iter__(self) -> Iterator[InternalCard]:
+        for i in range(len(self._codes)):
+            yield InternalCard(id=self.card_id(i), emoji=self.emoji(i))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Board):
+            return NotImplemented
+        return (
+            self._codes == other._codes
+            and self._symbols == other._symbols
+            and self._ids == other._ids
+        )
+
+    def __hash__(self) -> int:
+        return hash((self._codes, self._symbols, self._ids))
+
+    def __repr__(self) -> str:
+        return f"Board({len(self._codes)} cards)"
+
+
+class CardSet(Set):
+    """
+    Immutable set of cards on one board, stored as a bitset of card indices.
+    Behaves as a set of card ids for callers that work with ids.
+    """
+
+    __slots__ = ("board", "mask")
+
+    def __init__(self, board: Board, mask: int = 0) -> None:
+        self.board = board
+        self.mask = mask
+
+    @classmethod
+    def from_ids(cls, board: Board, card_ids: Iterable[str]) -> "CardSet":
+        mask = 0
+        for card_id in card_ids:
+            index = board.index_of(card_id)
+            if index is None:
+                raise ValueError(f"Card not on board: {card_id}")
+            mask |= 1 << index
+        return cls(board, mask)
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[str]) -> frozenset[str]:
+        # Set operators (|, &, -) produce plain frozensets of ids.
+        return frozenset(it)
+
+    def has(self, index: int) -> bool:
+        return (self.mask >> index) & 1 == 1
+
+    def with_index(self, index: int) -> "CardSet":
+        return CardSet(self.board, self.mask | (1 << index))
+
+    def first(self) -> int | None:
+        """Lowest card index in the set, or None if empty."""
+        if not self.mask:
+            return None
+        return (self.mask & -self.mask).bit_length() - 1
+
+    def flags(self) -> str:
+        """One "0"/"1" character per card, in board order."""
+        return format(self.mask, f"0{len(self.board)}b")[::-1]
+
+    def indices(self) -> Iterator[int]:
+        mask = self.mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def is_full(self) -> bool:
+        return self.mask == self.board.full_mask
+
+    def __contains__(self, card_id: object) -> bool:
+        if not isinstance(card_id, str):
+            return False
+        index = self.board.index_of(card_id)
+        return index is not None and (self.mask >> index) & 1 == 1
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __iter__(self) -> Iterator[str]:
+        for index in self.indices():
+            yield self.board.card_id(index)
+
+    def __bool__(self) -> bool:
+        return self.mask != 0
+
+    def __repr__(self) -> str:
+        return f"CardSet({sorted(self.indices())})"
@@ -4,6 +4,22 @@ CARD_COUNT_MAX = 100
 COUNTDOWN_SECONDS_MIN = 4
 COUNTDOWN_SECONDS_MAX = 120
 
+FLIP_BACK_DELAY_MS_MAX = 60_000
+
+MAX_BAD_GUESSES_MAX = 1_000
+
+BULK_CREATE_MAX = 1000
+
+# Characters, at most 4 UTF-8 bytes each: a 100-card session with the longest name
+# still fits in a default 512-byte slot of the shared-memory store.
+USER_NAME_MAX = 64
+
+LEADERBOARD_LIMIT_MAX = 100
+
+PLAYER_GAMES_LIMIT_MAX = 100
+
+BOARD_SEED_MAX = 2**63 - 1
+
 EMOJI_SET = [
     "🍎", "🍌", "🍊", "🍇",
     "🍓", "🍑", "🥝", "🍋",
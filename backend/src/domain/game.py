@@ -1,20 +1,24 @@
 import random
 import time
 from dataclasses import replace
+from functools import lru_cache
 
 from src.domain.constants import (
+    BOARD_SEED_MAX,
     CARD_COUNT_MAX,
     CARD_COUNT_MIN,
     COUNTDOWN_SECONDS_MAX,
     COUNTDOWN_SECONDS_MIN,
     EMOJI_SET,
+    FLIP_BACK_DELAY_MS_MAX,
+    MAX_BAD_GUESSES_MAX,
 )
+from src.domain.board import Board, CardSet
 from src.domain.types import (
     GameSession,
     GameState,
-    GameStatus,
-    InternalCard,
     PublicCard,
+    PublicGameDelta,
     PublicGameView,
     Settings,
 )
@@ -37,23 +41,78 @@ def _validate_settings(settings: Settings) -> None:
             f"countdown_seconds must be between {COUNTDOWN_SECONDS_MIN} and {COUNTDOWN_SECONDS_MAX}"
         )
         
-    if settings.flip_back_delay_ms < 0:
-        raise InvalidSettings("flip_back_delay_ms must be non-negative")
+    if not (0 <= settings.flip_back_delay_ms <= FLIP_BACK_DELAY_MS_MAX):
+        raise InvalidSettings(
+            f"flip_back_delay_ms must be between 0 and {FLIP_BACK_DELAY_MS_MAX}"
+        )
     
-    if settings.max_bad_guesses is not None and settings.max_bad_guesses < 1:
-        raise InvalidSettings("max_bad_guesses must be positive when set")
+    if settings.max_bad_guesses is not None and not (
+        1 <= settings.max_bad_guesses <= MAX_BAD_GUESSES_MAX
+    ):
+        raise InvalidSettings(
+            f"max_bad_guesses must be between 1 and {MAX_BAD_GUESSES_MAX} when set"
+        )
 
+    if settings.seed is not None and not (0 <= settings.seed <= BOARD_SEED_MAX):
+        raise InvalidSettings(f"seed must be between 0 and {BOARD_SEED_MAX}")
 
-def _build_board(settings: Settings) -> list[InternalCard]:
-    """Generate card_count/2 emojis (reusing from set if needed)"""
-    n_pairs = settings.card_count // 2
-    chosen = random.choices(EMOJI_SET, k=n_pairs)
-    emojis = chosen + chosen
-    random.shuffle(emojis)
-    return [
-        InternalCard(id=f"card-{i}", emoji=emoji)
-        for i, emoji in enumerate(emojis)
+
+def random_board(card_count: int, rng: random.Random | None = None) -> Board:
+    """Generate card_count/2 symbol codes into EMOJI_SET (reusing emojis if needed)"""
+    rng = rng or random
+    n_pairs = card_count // 2
+    chosen = rng.choices(range(len(EMOJI_SET)), k=n_pairs)
+    codes = chosen + chosen
+    rng.shuffle(codes)
+    return Board(bytes(codes))
+
+
+@lru_cache(maxsize=1024)
+def seeded_board(seed: int, card_count: int) -> Board:
+    """
+    The board for (seed, card_count). Interned: every session with the same seed and
+    card count references one immutable Board.
+    """
+    return random_board(card_count, random.Random(seed))
+
+
+def intern_board(seed: int, board: Board) -> Board:
+    """The shared seeded board if board is a copy of it (e.g. just loaded from storage)."""
+    shared = seeded_board(seed, len(board))
+    return shared if shared == board else board
+
+
+def _build_board(settings: Settings) -> Board:
+    if settings.seed is not None:
+        return seeded_board(settings.seed, settings.card_count)
+    return random_board(settings.card_count)
+
+
+def _build_boards(settings_list: list[Settings]) -> list[Board]:
+    """_build_board for many games: one draw of symbol codes for all unseeded ones."""
+    pair_counts = [
+        settings.card_count // 2 if settings.seed is None else 0 for settings in settings_list
     ]
+    chosen = random.choices(range(len(EMOJI_SET)), k=sum(pair_counts))
+    shuffle = random.shuffle
+    boards = []
+    start = 0
+    for settings, n_pairs in zip(settings_list, pair_counts):
+        if settings.seed is not None:
+            boards.append(seeded_board(settings.seed, settings.card_count))
+            continue
+        codes = chosen[start:start + n_pairs] * 2
+        start += n_pairs
+        shuffle(codes)
+        boards.append(Board(bytes(codes)))
+    return boards
+
+
+def _clone(session: GameSession) -> GameSession:
+    """Shallow copy without re-running __post_init__ (field values are immutable)."""
+    clone = object.__new__(GameSession)
+    clone.__dict__.update(session.__dict__)
+    return clone
 
 
 def create_game(
@@ -61,12 +120,15 @@ def create_game(
     settings: Settings,
     *,
     now: float | None = None,
+    board: Board | None = None,
 ) -> GameSession:
     """
     Validate settings, generate board, create session.
+    board replaces the generated one (e.g. a pre-generated board for unseeded settings).
     """
     _validate_settings(settings)
-    board = _build_board(settings)
+    if board is None:
+        board = _build_board(settings)
     if now is None:
         now = time.time()
     return GameSession(
@@ -78,11 +140,45 @@ def create_game(
         started_at=now,
         turns=0,
         bad_guesses=0,
-        flipped_card_ids=[],
-        matched_card_ids=set(),
+        flipped_card_ids=CardSet(board),
+        matched_card_ids=CardSet(board),
     )
 
 
+def create_games(
+    entries: list[tuple[str, Settings]],
+    *,
+    now: float | None = None,
+) -> list[GameSession]:
+    """
+    create_game for a batch of (game_id, settings): every entry is validated before
+    any board is built. InvalidSettings names the first invalid entry by position.
+    """
+    for position, (_, settings) in enumerate(entries):
+        try:
+            _validate_settings(settings)
+        except InvalidSettings as exc:
+            raise InvalidSettings(f"games[{position}]: {exc}") from exc
+    boards = _build_boards([settings for _, settings in entries])
+    if now is None:
+        now = time.time()
+    return [
+        GameSession(
+            game_id=game_id,
+            user_name=settings.user_name,
+            settings=settings,
+            board=board,
+            status="playing",
+            started_at=now,
+            turns=0,
+            bad_guesses=0,
+            flipped_card_ids=CardSet(board),
+            matched_card_ids=CardSet(board),
+        )
+        for (game_id, settings), board in zip(entries, boards)
+    ]
+
+
 def get_remaining_seconds(session: GameSession, now: float | None = None) -> int:
     """
     Remaining time = max(0, countdown_seconds - elapsed).
@@ -94,6 +190,26 @@ def get_remaining_seconds(session: GameSession, now: float | None = None) -> int
     return max(0, remaining)
 
 
+def apply_countdown_in_place(
+    session: GameSession,
+    now: float | None = None,
+) -> bool:
+    """
+    In-place form of apply_countdown_if_expired. Returns True if the session was marked lost.
+    """
+    if session.status != "playing":
+        return False
+
+    if now is None:
+        now = time.time()
+
+    if get_remaining_seconds(session, now) <= 0:
+        session.status = "lost"
+        return True
+
+    return False
+
+
 def apply_countdown_if_expired(
     session: GameSession,
     now: float | None = None,
@@ -115,11 +231,68 @@ def apply_countdown_if_expired(
     return session
 
 
-def _card_by_id(session: GameSession, card_id: str) -> InternalCard | None:
-    for c in session.board:
-        if c.id == card_id:
-            return c
-    return None
+def flip_card_in_place(
+    session: GameSession,
+    card_id: str,
+    now: float | None = None,
+) -> list[tuple[str, str]] | None:
+    """
+    In-place form of flip_card: mutates session and returns the mismatch pair.
+    All validation happens before the first write, so an InvalidFlip leaves
+    the session untouched. Run it inside a SessionTransaction when the session
+    is shared (e.g. owned by a repository).
+    """
+    if session.status != "playing":
+        raise InvalidFlip("Game is not in progress")
+
+    board = session.board
+    index = board.index_of(card_id)
+
+    if index is None:
+        raise InvalidFlip("Card not found")
+
+    bit = 1 << index
+    if session.matched_card_ids.mask & bit:
+        raise InvalidFlip("Card is already matched")
+
+    flipped = session.flipped_card_ids
+    if flipped.mask & bit:
+        raise InvalidFlip("Card is already face-up")
+
+    if flipped.mask.bit_count() >= 2:
+        raise InvalidFlip("Already two cards face-up this turn")
+
+    if now is None:
+        now = time.time()
+
+    # First flip: just add to flipped
+    other = flipped.first()
+    if other is None:
+        session.flipped_card_ids = CardSet(board, bit)
+        apply_countdown_in_place(session, now)
+        return None
+
+    # Second flip: resolve match/mismatch
+    session.turns += 1
+    session.flipped_card_ids = CardSet(board)
+
+    if board.symbol(index) == board.symbol(other):
+        matched = CardSet(board, session.matched_card_ids.mask | flipped.mask | bit)
+        session.matched_card_ids = matched
+        if matched.is_full():
+            session.status = "won"
+        apply_countdown_in_place(session, now)
+        return None
+
+    session.bad_guesses += 1
+    max_bad = session.settings.max_bad_guesses
+    if max_bad is not None and session.bad_guesses >= max_bad:
+        session.status = "lost"
+    apply_countdown_in_place(session, now)
+    return [
+        (board.card_id(other), board.emoji(other)),
+        (board.card_id(index), board.emoji(index)),
+    ]
 
 
 def flip_card(
@@ -133,72 +306,79 @@ def flip_card(
     check countdown and maxBadGuesses, set won/lost if needed.
     Returns (updated_session, mismatch_pair). mismatch_pair is [(card_id, emoji), (card_id, emoji)]
     for the two flipped cards when it was a mismatch (so view can reveal their emojis in the board); None otherwise.
+    The input session is not modified.
     """
-    if session.status != "playing":
-        raise InvalidFlip("Game is not in progress")
+    updated = _clone(session)
+    mismatch_pair = flip_card_in_place(updated, card_id, now)
+    return (updated, mismatch_pair)
 
-    card = _card_by_id(session, card_id)
 
-    if card is None:
-        raise InvalidFlip("Card not found")
-    
-    if card_id in session.matched_card_ids:
-        raise InvalidFlip("Card is already matched")
-    
-    if card_id in session.flipped_card_ids:
+def play_turn_in_place(
+    session: GameSession,
+    first_card_id: str,
+    second_card_id: str,
+    now: float | None = None,
+) -> list[tuple[str, str]] | None:
+    """
+    Flip both cards of a turn in place; returns the mismatch pair like flip_card_in_place.
+    The turn must start with no card face-up. Both cards are checked before the
+    first write, so an InvalidFlip leaves the session untouched.
+    """
+    if session.status != "playing":
+        raise InvalidFlip("Game is not in progress")
+    if session.flipped_card_ids:
+        raise InvalidFlip("A turn is already in progress")
+    board = session.board
+    matched = session.matched_card_ids.mask
+    for card_id in (first_card_id, second_card_id):
+        index = board.index_of(card_id)
+        if index is None:
+            raise InvalidFlip("Card not found")
+        if matched >> index & 1:
+            raise InvalidFlip("Card is already matched")
+    if first_card_id == second_card_id:
         raise InvalidFlip("Card is already face-up")
-    
-    if len(session.flipped_card_ids) >= 2:
-        raise InvalidFlip("Already two cards face-up this turn")
 
     if now is None:
         now = time.time()
+    flip_card_in_place(session, first_card_id, now)
+    if session.status != "playing":
+        return None  # the countdown ran out on the first card
+    return flip_card_in_place(session, second_card_id, now)
 
-    # First flip: just add to flipped
-    if len(session.flipped_card_ids) == 0:
-        updated = replace(
-            session,
-            flipped_card_ids=session.flipped_card_ids + [card_id],
-        )
-        return (apply_countdown_if_expired(updated, now), None)
 
-    # Second flip: resolve match/mismatch
-    other_id = session.flipped_card_ids[0]
-    other = _card_by_id(session, other_id)
+def play_turn(
+    session: GameSession,
+    first_card_id: str,
+    second_card_id: str,
+    now: float | None = None,
+) -> tuple[GameSession, list[tuple[str, str]] | None]:
+    """
+    Apply a whole turn (two flips) at once. Returns (updated_session, mismatch_pair)
+    like flip_card. The input session is not modified.
+    """
+    updated = _clone(session)
+    mismatch_pair = play_turn_in_place(updated, first_card_id, second_card_id, now)
+    return (updated, mismatch_pair)
 
-    if other is None:
-        raise InvalidFlip("Something wrong: first card was not flipped")
-
-    is_match = card.emoji == other.emoji
-
-    if is_match:
-        new_matched = session.matched_card_ids | {card_id, other_id}
-        new_pairs = len(new_matched) // 2
-        total_pairs = len(session.board) // 2
-        new_status: GameStatus = "won" if new_pairs >= total_pairs else "playing"
-        updated = replace(
-            session,
-            status=new_status,
-            turns=session.turns + 1,
-            flipped_card_ids=[],
-            matched_card_ids=new_matched,
-        )
-        updated = apply_countdown_if_expired(updated, now)
-        return (updated, None)
-    else:
-        new_bad = session.bad_guesses + 1
-        max_bad = session.settings.max_bad_guesses
-        new_status = "lost" if (max_bad is not None and new_bad >= max_bad) else "playing"
-        updated = replace(
-            session,
-            status=new_status,
-            turns=session.turns + 1,
-            bad_guesses=new_bad,
-            flipped_card_ids=[],
-        )
-        updated = apply_countdown_if_expired(updated, now)
-        mismatch_pair = [(other_id, other.emoji), (card_id, card.emoji)]
-        return (updated, mismatch_pair)
+
+def restart_game_in_place(
+    session: GameSession,
+    *,
+    now: float | None = None,
+    board: Board | None = None,
+) -> None:
+    """In-place form of restart_game. board replaces the freshly shuffled one (e.g. on replay)."""
+    if now is None:
+        now = time.time()
+    new_board = board if board is not None else _build_board(session.settings)
+    session.board = new_board
+    session.status = "playing"
+    session.started_at = now
+    session.turns = 0
+    session.bad_guesses = 0
+    session.flipped_card_ids = CardSet(new_board)
+    session.matched_card_ids = CardSet(new_board)
 
 
 def restart_game(
@@ -209,19 +389,9 @@ def restart_game(
     """
     Same game_id, settings, etc.; new board (regenerate + shuffle), reset stats.
     """
-    if now is None:
-        now = time.time()
-    new_board = _build_board(session.settings)
-    return replace(
-        session,
-        board=new_board,
-        status="playing",
-        started_at=now,
-        turns=0,
-        bad_guesses=0,
-        flipped_card_ids=[],
-        matched_card_ids=set(),
-    )
+    updated = _clone(session)
+    restart_game_in_place(updated, now=now)
+    return updated
 
 
 def build_public_view(
@@ -235,16 +405,26 @@ def build_public_view(
     else:
         remaining = 0
 
+    board = session.board
+    symbols = board.symbols
     reveal = reveal_emoji or {}
     public_cards: list[PublicCard] = []
-    for c in session.board:
-        is_face_up = c.id in session.flipped_card_ids or c.id in reveal
-        is_matched = c.id in session.matched_card_ids
-        show_emoji = is_face_up or is_matched or (c.id in reveal)
-        emoji_val = reveal.get(c.id) if c.id in reveal else (c.emoji if show_emoji else None)
+    for card_id, code, face_up, matched in zip(
+        board.card_ids,
+        board.codes,
+        session.flipped_card_ids.flags(),
+        session.matched_card_ids.flags(),
+    ):
+        is_matched = matched == "1"
+        if card_id in reveal:
+            is_face_up = True
+            emoji_val = reveal[card_id]
+        else:
+            is_face_up = face_up == "1"
+            emoji_val = symbols[code] if (is_face_up or is_matched) else None
         public_cards.append(
             PublicCard(
-                id=c.id,
+                id=card_id,
                 is_face_up=is_face_up,
                 is_matched=is_matched,
                 emoji=emoji_val,
@@ -257,4 +437,52 @@ def build_public_view(
         board=public_cards,
         settings=session.settings,
         state=state,
+        version=session.version,
+    )
+
+
+def build_public_delta(
+    session: GameSession,
+    changed_mask: int,
+    *,
+    base_version: int,
+    reveal_emoji: dict[str, str] | None = None,
+) -> PublicGameDelta:
+    """
+    Incremental counterpart of build_public_view: only the cards whose bits are set
+    in changed_mask (card indices), rendered exactly as build_public_view would.
+    """
+    if session.status == "playing":
+        remaining = get_remaining_seconds(session)
+    else:
+        remaining = 0
+
+    board = session.board
+    face_up_mask = session.flipped_card_ids.mask
+    matched_mask = session.matched_card_ids.mask
+    reveal = reveal_emoji or {}
+    cards: list[PublicCard] = []
+    mask = changed_mask
+    while mask:
+        low = mask & -mask
+        index = low.bit_length() - 1
+        mask ^= low
+        card_id = board.card_id(index)
+        is_matched = bool(matched_mask & low)
+        if card_id in reveal:
+            is_face_up = True
+            emoji_val = reveal[card_id]
+        else:
+            is_face_up = bool(face_up_mask & low)
+            emoji_val = board.emoji(index) if (is_face_up or is_matched) else None
+        cards.append(
+            PublicCard(id=card_id, is_face_up=is_face_up, is_matched=is_matched, emoji=emoji_val)
+        )
+
+    return PublicGameDelta(
+        game_id=session.game_id,
+        version=session.version,
+        base_version=base_version,
+        cards=cards,
+        state=GameState.from_session(session, remaining),
     )
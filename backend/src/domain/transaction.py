@@ -0,0 +1,67 @@
+from operator import attrgetter
+from types import TracebackType
+
+from src.domain.types import GameSession
+
+# Fields the domain mutates in place; identity fields and settings never change.
+_MUTABLE_FIELDS = (
+    "board",
+    "status",
+    "started_at",
+    "turns",
+    "bad_guesses",
+    "flipped_card_ids",
+    "matched_card_ids",
+    "version",
+)
+_capture = attrgetter(*_MUTABLE_FIELDS)
+
+
+class SessionTransaction:
+    """
+    Commit/rollback boundary for in-place session mutation.
+
+        with SessionTransaction(session):
+            flip_card_in_place(session, card_id)
+            repository.save(session)
+
+    Any exception raised inside the block restores the fields captured on entry,
+    so a shared session (e.g. the one held by a repository) is left untouched.
+    Field values are immutable, so the capture is a single tuple of references.
+    """
+
+    __slots__ = ("_session", "_saved")
+
+    def __init__(self, session: GameSession) -> None:
+        self._session = session
+        self._saved: tuple | None = None
+
+    def begin(self) -> None:
+        self._saved = _capture(self._session)
+
+    def commit(self) -> None:
+        self._saved = None
+
+    def rollback(self) -> None:
+        saved = self._saved
+        if saved is None:
+            return
+        session = self._session
+        for name, value in zip(_MUTABLE_FIELDS, saved):
+            setattr(session, name, value)
+        self._saved = None
+
+    def __enter__(self) -> "SessionTransaction":
+        self.begin()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
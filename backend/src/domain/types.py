@@ -1,25 +1,21 @@
 from dataclasses import dataclass, field
 from typing import Literal
 
+from src.domain.board import Board, CardSet, InternalCard
+
 
 # --- Internal ---
 
 
 @dataclass(frozen=True)
-class InternalCard:
-    """Server-only card: id and true emoji for matching."""
-    id: str
-    emoji: str
-
-
-@dataclass
 class Settings:
-    """Game settings."""
+    """Game settings. Immutable for the life of a game."""
     user_name: str
     card_count: int
     countdown_seconds: int
     flip_back_delay_ms: int
     max_bad_guesses: int | None = None
+    seed: int | None = None  # every game with the same seed and card_count gets the same board
 
 
 GameStatus = Literal["playing", "won", "lost"]
@@ -27,17 +23,31 @@ GameStatus = Literal["playing", "won", "lost"]
 
 @dataclass
 class GameSession:
-    """Internal game session: full state for domain logic."""
+    """
+    Internal game session: full state for domain logic.
+    board may be given as a list of InternalCard and card id collections as any
+    iterable of ids; they are converted to a Board and bitset CardSets.
+    """
     game_id: str
     user_name: str
     settings: Settings
-    board: list[InternalCard]
+    board: Board
     status: GameStatus
     started_at: float  # Unix timestamp
     turns: int
     bad_guesses: int
-    flipped_card_ids: list[str]  # 0, 1, or 2 ids currently face-up this turn
-    matched_card_ids: set[str] = field(default_factory=set)
+    flipped_card_ids: CardSet  # 0, 1, or 2 cards currently face-up this turn
+    matched_card_ids: CardSet = field(default_factory=frozenset)
+    version: int = 0  # bumped on every committed change; used for compare-and-swap saves
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.board, Board):
+            self.board = Board.from_cards(self.board)
+        board = self.board
+        if type(self.flipped_card_ids) is not CardSet or self.flipped_card_ids.board is not board:
+            self.flipped_card_ids = CardSet.from_ids(board, self.flipped_card_ids)
+        if type(self.matched_card_ids) is not CardSet or self.matched_card_ids.board is not board:
+            self.matched_card_ids = CardSet.from_ids(board, self.matched_card_ids)
 
 
 # --- Public ---
@@ -75,9 +85,39 @@ class GameState:
         )
 
 
+@dataclass(frozen=True)
+class TimerState:
+    """What the timer socket pushes: remaining time and status, without the board."""
+    remaining_seconds: int
+    status: GameStatus
+
+
 @dataclass
 class PublicGameView:
     game_id: str
     board: list[PublicCard]
     settings: Settings
     state: GameState
+    version: int = 0
+
+
+@dataclass
+class GameSummary:
+    """One game in a player's list: a PublicGameView without the board."""
+    game_id: str
+    settings: Settings
+    state: GameState
+    version: int
+
+
+@dataclass
+class PublicGameDelta:
+    """
+    The cards a change touched, in board order, plus the full state.
+    Applies to a client view at base_version; any other version needs a full view.
+    """
+    game_id: str
+    version: int
+    base_version: int
+    cards: list[PublicCard]
+    state: GameState
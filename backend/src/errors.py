@@ -13,3 +13,20 @@ class InvalidSettings(Exception):
     """Invalid game settings (e.g. odd card count, out-of-range values)."""
     def __init__(self, message: str = "Invalid settings"):
         super().__init__(message)
+
+
+class VersionConflict(Exception):
+    """A compare-and-swap save found a different stored version than expected."""
+    def __init__(self, game_id: str, expected: int, actual: int | None):
+        self.game_id = game_id
+        self.expected = expected
+        self.actual = actual
+        super().__init__(
+            f"Game {game_id} was modified concurrently (expected version {expected}, found {actual})"
+        )
+
+
+class StoreFull(Exception):
+    """The game store has no room for another session (or for one this large)."""
+    def __init__(self, message: str = "Game store is full"):
+        super().__init__(message)
@@ -0,0 +1,5 @@
+import sys
+
+from src.loadtest.cli import main
+
+sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Load test: concurrent simulated players against the API, in this process or at a URL.
+
+Every player creates a game, opens its timer socket, plays it with a limited memory
+of the cards it has seen and restarts it for the next round. Reports throughput and
+p50/p95/p99 latency for create, get, flip and restart, plus the gaps between timer
+ticks (nominally one second), and optionally writes them as JSON to compare runs.
+
+Run from backend/:  memory-game-loadtest [--url URL] [--players N] [--json PATH] ...
+(or python -m src.loadtest). In-process runs share the event loop with the app, so
+they measure the app plus the players; point --url at a server for numbers that
+include the network stack.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import asdict
+
+from src.loadtest.clients import AsgiClient, HttpClient, LoadTestClient
+from src.loadtest.metrics import OperationStats, Recorder, to_json
+from src.loadtest.player import Player, PlayerSettings
+
+
+async def run_load_test(
+    client: LoadTestClient,
+    players: int,
+    settings: PlayerSettings,
+    *,
+    seed: int = 0,
+) -> tuple[dict[str, OperationStats], float]:
+    """Run every player to completion. Returns per-operation stats and elapsed seconds."""
+    recorder = Recorder()
+    rng = random.Random(seed)
+    bots = [
+        Player(client, recorder, settings, random.Random(rng.random()), f"bot-{n}")
+        for n in range(players)
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*(bot.run() for bot in bots))
+    elapsed = time.perf_counter() - start
+    return recorder.summary(elapsed), elapsed
+
+
+async def _run(args: argparse.Namespace, settings: PlayerSettings):
+    if args.url is not None:
+        client = HttpClient(args.url, max_connections=args.players)
+        try:
+            return await run_load_test(client, args.players, settings, seed=args.seed)
+        finally:
+            await client.close()
+
+    from src.app import app  # only in-process runs build the app and its stores
+
+    async with app.router.lifespan_context(app):
+        return await run_load_test(AsgiClient(app), args.players, settings, seed=args.seed)
+
+
+def _print_report(summary: dict[str, OperationStats], elapsed: float) -> None:
+    print(f"{'operation':<10} {'count':>8} {'errors':>7} {'per sec':>9} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in summary.items():
+        print(
+            f"{name:<10} {stats.count:>8} {stats.errors:>7} {stats.per_second:>9.1f} "
+            f"{stats.p50_ms:>9.2f} {stats.p95_ms:>9.2f} {stats.p99_ms:>9.2f}"
+        )
+    print(f"elapsed {elapsed:.2f}s")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="memory-game-loadtest",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--url", help="base URL of a running server (default: in-process)")
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3, help="games per player")
+    parser.add_argument("--cards", type=int, default=16)
+    parser.add_argument(
+        "--memory", type=int, default=8, help="cards a player remembers (0: random play)"
+    )
+    parser.add_argument("--think-ms", type=float, default=50.0, help="pause before each request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    settings = PlayerSettings(
+        card_count=args.cards,
+        rounds=args.rounds,
+        memory=args.memory,
+        think_seconds=args.think_ms / 1e3,
+    )
+    summary, elapsed = asyncio.run(_run(args, settings))
+    _print_report(summary, elapsed)
+    if args.json is not None:
+        result = {
+            "target": args.url or "in-process",
+            "players": args.players,
+            "settings": asdict(settings),
+            "seed": args.seed,
+            "elapsedSeconds": elapsed,
+            "operations": to_json(summary),
+        }
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    return 1 if any(stats.errors for stats in summary.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
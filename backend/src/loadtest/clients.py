@@ -0,0 +1,161 @@
+import asyncio
+import contextlib
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Protocol
+
+from starlette.types import ASGIApp, Message
+
+try:  # the "loadtest" extra, for runs against a URL
+    import httpx
+    from websockets.asyncio.client import connect
+    from websockets.exceptions import ConnectionClosed
+except ImportError:
+    httpx = None
+
+
+class LoadTestClient(Protocol):
+    """How simulated players reach the API: in this process or over the network."""
+
+    async def request(
+        self, method: str, path: str, body: dict | None = None
+    ) -> tuple[int, Any]:
+        """Send one request. Returns (status, decoded JSON body or None)."""
+        ...
+
+    def timer(self, game_id: str) -> contextlib.AbstractAsyncContextManager[AsyncIterator[dict]]:
+        """Open the game's timer socket; yields its messages until the server closes it."""
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class AsgiClient:
+    """Calls an ASGI app directly, with no server or HTTP client in the measurement."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self._app = app
+
+    async def request(
+        self, method: str, path: str, body: dict | None = None
+    ) -> tuple[int, Any]:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"loadtest"), (b"content-type", b"application/json")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("loadtest", 80),
+        }
+        content = b"" if body is None else json.dumps(body).encode()
+        messages = [{"type": "http.request", "body": content, "more_body": False}]
+        status = 0
+        chunks: list[bytes] = []
+
+        async def receive() -> Message:
+            return messages.pop() if messages else {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self._app(scope, receive, send)
+        payload = b"".join(chunks)
+        return status, json.loads(payload) if payload else None
+
+    @contextlib.asynccontextmanager
+    async def timer(self, game_id: str) -> AsyncIterator[AsyncIterator[dict]]:
+        path = f"/api/games/{game_id}/timer"
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "scheme": "ws",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"loadtest")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("loadtest", 80),
+            "subprotocols": [],
+        }
+        to_app: asyncio.Queue[Message] = asyncio.Queue()
+        to_app.put_nowait({"type": "websocket.connect"})
+        received: asyncio.Queue[dict | None] = asyncio.Queue()
+        disconnected = False
+
+        async def send(message: Message) -> None:
+            if disconnected:
+                raise OSError("client disconnected")
+            if message["type"] == "websocket.send":
+                received.put_nowait(json.loads(message["text"]))
+            elif message["type"] == "websocket.close":
+                received.put_nowait(None)
+
+        async def messages() -> AsyncIterator[dict]:
+            while (message := await received.get()) is not None:
+                yield message
+
+        task = asyncio.create_task(self._app(scope, to_app.get, send))
+        try:
+            yield messages()
+        finally:
+            disconnected = True
+            to_app.put_nowait({"type": "websocket.disconnect", "code": 1000})
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def close(self) -> None:
+        pass
+
+
+class HttpClient:
+    """Calls a running server over pooled keep-alive connections."""
+
+    def __init__(self, base_url: str, max_connections: int = 100) -> None:
+        if httpx is None:
+            raise RuntimeError("Load tests against a URL need the 'loadtest' extra (httpx)")
+        self._base_url = base_url.rstrip("/")
+        self._client = httpx.AsyncClient(
+            base_url=self._base_url,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            timeout=30.0,
+        )
+
+    async def request(
+        self, method: str, path: str, body: dict | None = None
+    ) -> tuple[int, Any]:
+        try:
+            response = await self._client.request(method, path, json=body)
+        except httpx.TransportError as exc:
+            raise OSError(f"{method} {path} failed: {exc}") from exc
+        return response.status_code, response.json() if response.content else None
+
+    @contextlib.asynccontextmanager
+    async def timer(self, game_id: str) -> AsyncIterator[AsyncIterator[dict]]:
+        url = "ws" + self._base_url.removeprefix("http") + f"/api/games/{game_id}/timer"
+        async with connect(url) as websocket:
+
+            async def messages() -> AsyncIterator[dict]:
+                with contextlib.suppress(ConnectionClosed):
+                    async for message in websocket:
+                        yield json.loads(message)
+
+            yield messages()
+
+    async def close(self) -> None:
+        await self._client.aclose()
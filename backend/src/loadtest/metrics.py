@@ -0,0 +1,58 @@
+from dataclasses import asdict, dataclass, field
+
+# Reported in this order; "tick" samples are the gaps between timer-socket ticks.
+OPERATIONS = ("create", "get", "flip", "restart", "tick")
+
+
+@dataclass
+class OperationStats:
+    count: int
+    errors: int
+    per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+@dataclass
+class Recorder:
+    """Latency samples (seconds) and error counts per operation."""
+
+    samples: dict[str, list[float]] = field(
+        default_factory=lambda: {name: [] for name in OPERATIONS}
+    )
+    errors: dict[str, int] = field(default_factory=lambda: dict.fromkeys(OPERATIONS, 0))
+
+    def record(self, operation: str, seconds: float, *, ok: bool = True) -> None:
+        self.samples[operation].append(seconds)
+        if not ok:
+            self.errors[operation] += 1
+
+    def summary(self, elapsed_seconds: float) -> dict[str, OperationStats]:
+        return {
+            name: _stats(self.samples[name], self.errors[name], elapsed_seconds)
+            for name in OPERATIONS
+        }
+
+
+def _stats(samples: list[float], errors: int, elapsed_seconds: float) -> OperationStats:
+    ordered = sorted(samples)
+    return OperationStats(
+        count=len(ordered),
+        errors=errors,
+        per_second=len(ordered) / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+        p50_ms=_percentile(ordered, 50) * 1e3,
+        p95_ms=_percentile(ordered, 95) * 1e3,
+        p99_ms=_percentile(ordered, 99) * 1e3,
+    )
+
+
+def _percentile(ordered: list[float], q: int) -> float:
+    """Nearest-rank percentile of sorted samples (0 for none)."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, -(-len(ordered) * q // 100) - 1))]
+
+
+def to_json(summary: dict[str, OperationStats]) -> dict[str, dict]:
+    return {name: asdict(stats) for name, stats in summary.items()}
@@ -0,0 +1,168 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.loadtest.clients import LoadTestClient
+from src.loadtest.metrics import Recorder
+
+
+@dataclass(frozen=True)
+class PlayerSettings:
+    card_count: int = 16
+    rounds: int = 3  # games played, with a restart between consecutive ones
+    memory: int = 8  # cards whose emoji the player remembers (0 plays at random)
+    think_seconds: float = 0.05  # pause before each request
+    countdown_seconds: int = 120
+
+
+class Player:
+    """
+    One simulated player: creates a game, watches its timer socket, plays it to the
+    end and restarts it for the next round, recording every call in the recorder.
+
+    Each turn starts with a GET of the game (as a client refreshing would), then
+    flips two cards. The player remembers the last `memory` cards it has seen: a
+    remembered pair is flipped straight away, otherwise an unseen card is flipped
+    and matched from memory if possible.
+    """
+
+    def __init__(
+        self,
+        client: LoadTestClient,
+        recorder: Recorder,
+        settings: PlayerSettings,
+        rng: random.Random,
+        name: str,
+    ) -> None:
+        self._client = client
+        self._recorder = recorder
+        self._settings = settings
+        self._rng = rng
+        self._name = name
+        self._seen: OrderedDict[str, str] = OrderedDict()  # card id -> emoji
+        self._matched: set[str] = set()
+        self._card_ids: list[str] = []
+
+    async def run(self) -> None:
+        status, game = await self._call(
+            "create",
+            "POST",
+            "/api/games",
+            {
+                "userName": self._name,
+                "cardCount": self._settings.card_count,
+                "countdownSeconds": self._settings.countdown_seconds,
+                "flipBackDelayMs": 0,
+            },
+            expected=201,
+        )
+        if status != 201:
+            return
+        game_id = game["gameId"]
+        for round_ in range(self._settings.rounds):
+            if round_:
+                status, game = await self._call("restart", "POST", f"/api/games/{game_id}/restart")
+                if status != 200:
+                    return
+            self._start_round(game)
+            watcher = asyncio.create_task(self._watch_timer(game_id))
+            try:
+                await self._play(game_id)
+            finally:
+                watcher.cancel()
+                await asyncio.gather(watcher, return_exceptions=True)
+
+    def _start_round(self, game: dict) -> None:
+        self._card_ids = [card["id"] for card in game["board"]]
+        self._seen.clear()
+        self._matched.clear()
+
+    async def _play(self, game_id: str) -> None:
+        while True:
+            status, _ = await self._call("get", "GET", f"/api/games/{game_id}")
+            if status != 200:
+                return
+            pair = self._remembered_pair()
+            first = pair[0] if pair else self._pick()
+            status, view = await self._flip(game_id, first)
+            if status != 200 or view["state"]["status"] != "playing":
+                return
+            second = pair[1] if pair else self._partner(first)
+            status, view = await self._flip(game_id, second)
+            if status != 200 or view["state"]["status"] != "playing":
+                return
+
+    async def _flip(self, game_id: str, card_id: str) -> tuple[int, dict]:
+        status, view = await self._call(
+            "flip", "POST", f"/api/games/{game_id}/flip", {"cardId": card_id}
+        )
+        if status == 200:
+            for card in view["board"]:
+                if card["isMatched"]:
+                    self._matched.add(card["id"])
+                    self._seen.pop(card["id"], None)
+                elif card["emoji"] is not None:
+                    self._remember(card["id"], card["emoji"])
+        return status, view
+
+    def _remember(self, card_id: str, emoji: str) -> None:
+        if self._settings.memory <= 0:
+            return
+        self._seen[card_id] = emoji
+        self._seen.move_to_end(card_id)
+        while len(self._seen) > self._settings.memory:
+            self._seen.popitem(last=False)
+
+    def _remembered_pair(self) -> tuple[str, str] | None:
+        by_emoji: dict[str, str] = {}
+        for card_id, emoji in self._seen.items():
+            other = by_emoji.get(emoji)
+            if other is not None:
+                return other, card_id
+            by_emoji[emoji] = card_id
+        return None
+
+    def _pick(self, exclude: str | None = None) -> str:
+        """An unmatched card, preferring ones not in memory."""
+        unmatched = [c for c in self._card_ids if c not in self._matched and c != exclude]
+        unseen = [c for c in unmatched if c not in self._seen]
+        return self._rng.choice(unseen or unmatched)
+
+    def _partner(self, first: str) -> str:
+        emoji = self._seen.get(first)
+        for card_id, seen_emoji in self._seen.items():
+            if card_id != first and seen_emoji == emoji:
+                return card_id
+        return self._pick(exclude=first)
+
+    async def _watch_timer(self, game_id: str) -> None:
+        async with self._client.timer(game_id) as messages:
+            last = None
+            async for message in messages:
+                if "event" in message or "error" in message:
+                    continue  # state-change pushes and errors are not ticks
+                now = time.perf_counter()
+                if last is not None:
+                    self._recorder.record("tick", now - last)
+                last = now
+
+    async def _call(
+        self,
+        operation: str,
+        method: str,
+        path: str,
+        body: dict | None = None,
+        *,
+        expected: int = 200,
+    ) -> tuple[int, dict]:
+        if self._settings.think_seconds > 0:
+            await asyncio.sleep(self._settings.think_seconds)
+        start = time.perf_counter()
+        try:
+            status, payload = await self._client.request(method, path, body)
+        except OSError:
+            status, payload = 0, None
+        self._recorder.record(operation, time.perf_counter() - start, ok=status == expected)
+        return status, payload
@@ -0,0 +1,29 @@
+import asyncio
+import threading
+
+
+class StripedLock:
+    """
+    Fixed pool of locks indexed by key hash. A key always maps to the same lock,
+    so work on one key is serialized while unrelated keys rarely share a lock.
+    """
+
+    def __init__(self, stripes: int = 256) -> None:
+        if stripes <= 0:
+            raise ValueError("stripes must be positive")
+        self._locks = tuple(threading.Lock() for _ in range(stripes))
+
+    def __call__(self, key: str) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+
+class AsyncStripedLock:
+    """StripedLock for coroutines: asyncio locks, which may be held across awaits."""
+
+    def __init__(self, stripes: int = 256) -> None:
+        if stripes <= 0:
+            raise ValueError("stripes must be positive")
+        self._locks = tuple(asyncio.Lock() for _ in range(stripes))
+
+    def __call__(self, key: str) -> asyncio.Lock:
+        return self._locks[hash(key) % len(self._locks)]
@@ -0,0 +1,170 @@
+import math
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Sequence
+
+# Process-local metrics in the Prometheus text format, without a client library.
+# Every series is allocated when its labels are first seen (for the fixed label sets
+# below, at import), so recording a value only bumps preallocated numbers. Updates
+# take no lock: they run on the event loop, and a rare increment lost to a race
+# between threads is acceptable for monitoring.
+
+HTTP_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# For single function calls on the hot path.
+CALL_BUCKETS = (5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 1e-2)
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+class Histogram:
+    __slots__ = ("_bounds", "_counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self._bounds = tuple(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)  # the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> Iterator[tuple[float, int]]:
+        total = 0
+        for bound, count in zip((*self._bounds, math.inf), self._counts):
+            total += count
+            yield bound, total
+
+
+class Family:
+    """A named metric with one series per combination of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        kind: str,
+        labels: Sequence[str],
+        factory: Callable[[], Counter | Histogram],
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.label_names = tuple(labels)
+        self._factory = factory
+        self.series: dict[tuple[str, ...], Counter | Histogram] = {}
+
+    def labels(self, *values: str) -> Counter | Histogram:
+        series = self.series.get(values)
+        if series is None:
+            series = self.series[values] = self._factory()
+        return series
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._families: list[Family] = []
+        # name -> (help, type, label name, callback returning {label value: number})
+        self._collected: dict[
+            str, tuple[str, str, str | None, Callable[[], dict[str, float]]]
+        ] = {}
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Family:
+        return self._add(Family(name, help_text, "counter", labels, Counter))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = HTTP_BUCKETS,
+    ) -> Family:
+        return self._add(Family(name, help_text, "histogram", labels, lambda: Histogram(buckets)))
+
+    def gauge(
+        self,
+        name: str,
+        help_text: str,
+        collect: Callable[[], dict[str, float]],
+        label: str | None = None,
+        kind: str = "gauge",
+    ) -> None:
+        """A metric read at scrape time: collect() returns {label value: value}
+        ({"": value} without a label). kind="counter" for totals kept elsewhere."""
+        self._collected[name] = (help_text, kind, label, collect)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for family in self._families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for values, series in family.series.items():
+                labels = _labels(zip(family.label_names, values))
+                if isinstance(series, Counter):
+                    lines.append(f"{family.name}_total{_braced(labels)} {series.value}")
+                    continue
+                for bound, count in series.cumulative():
+                    le = _label("le", "+Inf" if bound == math.inf else repr(bound))
+                    lines.append(f"{family.name}_bucket{_braced([*labels, le])} {count}")
+                lines.append(f"{family.name}_sum{_braced(labels)} {series.sum!r}")
+                lines.append(f"{family.name}_count{_braced(labels)} {series.count}")
+        for name, (help_text, kind, label, collect) in self._collected.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for value_label, value in collect().items():
+                labels = _labels([(label, value_label)]) if label else []
+                lines.append(f"{name}{_braced(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _add(self, family: Family) -> Family:
+        self._families.append(family)
+        return family
+
+
+def _label(name: str, value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'{name}="{escaped}"'
+
+
+def _labels(pairs: Iterable[tuple[str, str]]) -> list[str]:
+    return [_label(name, value) for name, value in pairs]
+
+
+def _braced(labels: list[str]) -> str:
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "memory_game_http_request_duration_seconds",
+    "Time to answer an HTTP request, by route template",
+    labels=("method", "route"),
+)
+FLIPS = REGISTRY.counter("memory_game_flips", "Card flips by outcome", labels=("outcome",))
+FLIP_FIRST = FLIPS.labels("first")  # first card of a turn
+FLIP_MATCH = FLIPS.labels("match")
+FLIP_MISMATCH = FLIPS.labels("mismatch")
+FLIP_INVALID = FLIPS.labels("invalid")
+BUILD_VIEW_SECONDS = REGISTRY.histogram(
+    "memory_game_build_view_seconds",
+    "Time spent building public game views (build_public_view / build_public_delta)",
+    labels=("view",),
+    buckets=CALL_BUCKETS,
+)
+BUILD_FULL_VIEW = BUILD_VIEW_SECONDS.labels("full")
+BUILD_DELTA_VIEW = BUILD_VIEW_SECONDS.labels("delta")
+SERIALIZE_SECONDS = REGISTRY.histogram(
+    "memory_game_serialize_seconds",
+    "Time spent encoding response bodies, by response type",
+    labels=("response",),
+    buckets=CALL_BUCKETS,
+)
@@ -0,0 +1,275 @@
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from typing import TypeVar
+
+from src.domain.board import Board
+from src.domain.game import create_game, create_games
+from src.domain.transaction import SessionTransaction
+from src.domain.types import (
+    GameSession,
+    GameSummary,
+    PublicGameDelta,
+    PublicGameView,
+    Settings,
+    TimerState,
+)
+from src.errors import GameNotFound, VersionConflict
+from src.locks import AsyncStripedLock, StripedLock
+from src.services.board_pool import BoardPool
+from src.services.events import GameEventBus
+from src.services.leaderboard import Leaderboard
+from src.services.game import BULK_CREATE_BATCH_SIZE
+from src.services.updates import (
+    MAX_SAVE_ATTEMPTS,
+    SessionUpdate,
+    apply_update,
+    finish_update,
+    flip_delta_update,
+    flip_update,
+    get_game_if_changed_update,
+    get_game_update,
+    get_timer_update,
+    public_view,
+    restart_update,
+    split_page,
+    summary_update,
+    turn_update,
+)
+from src.storage.async_repository import InlineAsyncRepository
+from src.storage.journal import GameJournal
+from src.storage.repository import AsyncGameRepository
+
+R = TypeVar("R")
+
+
+class AsyncGameService:
+    """
+    GameService for async routes: the same operations, awaited on the event loop.
+
+    Over an InlineAsyncRepository (the in-memory store) an update runs directly on
+    the loop, with no thread hop, under the same striped thread locks as the
+    GameService sharing the store (timer ticks and checkpoints use it from worker
+    threads). Nothing awaits while such a lock is held, and both services wait for
+    the journal only after releasing it, so it is only ever held for one in-memory
+    update and the loop waits at most that long.
+
+    Over any other AsyncGameRepository sessions are loaded and saved with awaits.
+    Those are private copies, so coroutines working on one game are ordered by an
+    asyncio striped lock and the compare-and-swap save guards against everyone else.
+
+    With a journal, the wait for the fsync is awaited instead of blocking the loop.
+    """
+
+    def __init__(
+        self,
+        repository: AsyncGameRepository,
+        *,
+        locks: StripedLock | None = None,
+        journal: GameJournal | None = None,
+        events: GameEventBus | None = None,
+        boards: BoardPool | None = None,
+        leaderboard: Leaderboard | None = None,
+    ) -> None:
+        self._repository = repository
+        self._inline = None
+        if isinstance(repository, InlineAsyncRepository):
+            self._inline = repository.repository
+        self._locks = locks or StripedLock()
+        self._async_locks = AsyncStripedLock()
+        self._journal = journal
+        self._events = events
+        self._boards = boards
+        self._leaderboard = leaderboard
+
+    async def create_game(
+        self,
+        game_id: str,
+        settings: Settings,
+        *,
+        now: float | None = None,
+    ) -> PublicGameView:
+        """
+        Validate, create session, save, return public view.
+        Raises InvalidSettings if validation fails.
+        """
+        session = create_game(game_id, settings, now=now, board=self._pooled_board(settings))
+        await self._repository.save(session)
+        if self._journal is not None:
+            await self._journal.wait_durable(self._journal.record_create(session, wait=False))
+        return public_view(session)
+
+    def create_games(
+        self,
+        entries: Sequence[tuple[str, Settings]],
+        *,
+        now: float | None = None,
+        batch_size: int = BULK_CREATE_BATCH_SIZE,
+    ) -> AsyncIterator[list[GameSession]]:
+        """
+        Like GameService.create_games: raises InvalidSettings before anything is saved,
+        then returns an async iterator that saves and yields the sessions batch by batch.
+        """
+        sessions = create_games(list(entries), now=now)
+        return self._save_batches(sessions, batch_size)
+
+    async def _save_batches(
+        self, sessions: list[GameSession], batch_size: int
+    ) -> AsyncIterator[list[GameSession]]:
+        for start in range(0, len(sessions), batch_size):
+            batch = sessions[start:start + batch_size]
+            await self._repository.save_many(batch)
+            if self._journal is not None:
+                await self._journal.wait_durable(self._journal.record_creates(batch, wait=False))
+            yield batch
+
+    async def get_game(
+        self,
+        game_id: str,
+        *,
+        now: float | None = None,
+    ) -> PublicGameView:
+        """See GameService.get_game."""
+        return await self._update(game_id, get_game_update(now))
+
+    async def get_game_if_changed(
+        self,
+        game_id: str,
+        is_current: Callable[[int], bool],
+        *,
+        now: float | None = None,
+    ) -> tuple[int, PublicGameView | None]:
+        """See GameService.get_game_if_changed."""
+        return await self._update(game_id, get_game_if_changed_update(is_current, now))
+
+    async def get_timer(
+        self,
+        game_id: str,
+        *,
+        now: float | None = None,
+    ) -> TimerState:
+        """See GameService.get_timer."""
+        if now is None:
+            now = time.time()
+        return await self._update(game_id, get_timer_update(now))
+
+    async def list_player_games(
+        self,
+        user_name: str,
+        *,
+        after: str | None = None,
+        limit: int,
+        now: float | None = None,
+    ) -> tuple[list[GameSummary], str | None]:
+        """See GameService.list_player_games."""
+        if now is None:
+            now = time.time()
+        game_ids, next_cursor = split_page(
+            await self._repository.find_ids_by(
+                "user_name", user_name, after=after, limit=limit + 1
+            ),
+            limit,
+        )
+        games = []
+        for game_id in game_ids:
+            try:
+                games.append(await self._update(game_id, summary_update(now)))
+            except GameNotFound:
+                continue
+        return games, next_cursor
+
+    async def flip_card(
+        self,
+        game_id: str,
+        card_id: str,
+        *,
+        now: float | None = None,
+    ) -> PublicGameView:
+        """See GameService.flip_card."""
+        if now is None:
+            now = time.time()
+        return await self._update(game_id, flip_update(card_id, now, self._leaderboard))
+
+    async def flip_card_delta(
+        self,
+        game_id: str,
+        card_id: str,
+        *,
+        now: float | None = None,
+    ) -> PublicGameDelta:
+        """See GameService.flip_card_delta."""
+        if now is None:
+            now = time.time()
+        return await self._update(game_id, flip_delta_update(card_id, now, self._leaderboard))
+
+    async def play_turn(
+        self,
+        game_id: str,
+        first_card_id: str,
+        second_card_id: str,
+        *,
+        now: float | None = None,
+    ) -> PublicGameView:
+        """See GameService.play_turn."""
+        if now is None:
+            now = time.time()
+        update = turn_update(first_card_id, second_card_id, now, self._leaderboard)
+        return await self._update(game_id, update)
+
+    async def restart_game(
+        self,
+        game_id: str,
+        *,
+        now: float | None = None,
+    ) -> PublicGameView:
+        """See GameService.restart_game."""
+        if now is None:
+            now = time.time()
+        return await self._update(game_id, restart_update(now, self._pooled_restart_board))
+
+    async def _update(self, game_id: str, update: SessionUpdate[object, R]) -> R:
+        if self._inline is not None:
+            with self._locks(game_id):
+                rendered, lsn = apply_update(
+                    self._inline,
+                    game_id,
+                    update,
+                    journal=self._journal,
+                    events=self._events,
+                    wait=False,
+                )
+        else:
+            async with self._async_locks(game_id):
+                rendered, lsn = await self._apply(game_id, update)
+        if lsn:
+            await self._journal.wait_durable(lsn)
+        return rendered
+
+    async def _apply(self, game_id: str, update: SessionUpdate[object, R]) -> tuple[R, int]:
+        """apply_update with awaited loads and saves."""
+        attempt = 1
+        while True:
+            session = await self._repository.find_by_id(game_id)
+            if session is None:
+                raise GameNotFound(game_id)
+            try:
+                with SessionTransaction(session):
+                    result = update.apply(session)
+                    saved = update.save_if is None or update.save_if(result)
+                    if saved:
+                        expected = session.version
+                        session.version = expected + 1
+                        await self._repository.save(session, expected_version=expected)
+            except VersionConflict:
+                if attempt >= MAX_SAVE_ATTEMPTS:
+                    raise
+                attempt += 1
+                continue
+            return finish_update(
+                session, update, result, saved, self._journal, self._events, wait=False
+            )
+
+    def _pooled_board(self, settings: Settings) -> Board | None:
+        return None if self._boards is None else self._boards.board_for(settings)
+
+    def _pooled_restart_board(self, session: GameSession) -> Board | None:
+        return self._pooled_board(session.settings)
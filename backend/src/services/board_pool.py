@@ -0,0 +1,81 @@
+import threading
+from collections import deque
+from collections.abc import Iterable
+
+from src.domain.board import Board
+from src.domain.constants import CARD_COUNT_MAX, CARD_COUNT_MIN
+from src.domain.game import random_board
+from src.domain.types import Settings
+
+
+class BoardPool:
+    """
+    Ready-made random boards for unseeded games, so create and restart take a board
+    instead of shuffling one on the request path.
+
+    Keeps up to size boards per card count. A background thread refills a card
+    count once it drops to half of that; take() never blocks and returns None when
+    the pool is empty (or not started), in which case the caller shuffles as before.
+    """
+
+    def __init__(self, size: int = 64, card_counts: Iterable[int] | None = None) -> None:
+        if card_counts is None:
+            card_counts = range(CARD_COUNT_MIN, CARD_COUNT_MAX + 1, 2)
+        self._size = size
+        self._low_water = size // 2
+        self._boards: dict[int, deque[Board]] = {n: deque() for n in card_counts}
+        self._wake = threading.Event()
+        self._filler: threading.Thread | None = None
+        self._closing = False
+
+    def start(self) -> None:
+        """Fill the pool and keep it filled from a daemon thread."""
+        if self._filler is not None:
+            return
+        self._closing = False
+        self._filler = threading.Thread(target=self._fill_loop, name="board-pool", daemon=True)
+        self._filler.start()
+
+    def close(self) -> None:
+        if self._filler is None:
+            return
+        self._closing = True
+        self._wake.set()
+        self._filler.join()
+        self._filler = None
+
+    def take(self, card_count: int) -> Board | None:
+        """A pre-generated board with card_count cards, or None if there is none ready."""
+        boards = self._boards.get(card_count)
+        if boards is None:
+            return None
+        try:
+            board = boards.popleft()  # deque pops are atomic: no lock needed
+        except IndexError:
+            board = None
+        if len(boards) <= self._low_water:
+            self._wake.set()
+        return board
+
+    def board_for(self, settings: Settings) -> Board | None:
+        """take() for unseeded settings; None for seeded ones (they share one board)."""
+        if settings.seed is not None:
+            return None
+        return self.take(settings.card_count)
+
+    def available(self, card_count: int) -> int:
+        boards = self._boards.get(card_count)
+        return 0 if boards is None else len(boards)
+
+    def fill(self) -> None:
+        """Top every card count up to size (what the background thread does)."""
+        size = self._size
+        for card_count, boards in self._boards.items():
+            while len(boards) < size and not self._closing:
+                boards.append(random_board(card_count))
+
+    def _fill_loop(self) -> None:
+        while not self._closing:
+            self._wake.clear()
+            self.fill()
+            self._wake.wait()
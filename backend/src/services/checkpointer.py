@@ -0,0 +1,33 @@
+import asyncio
+import logging
+import time
+
+from src.services.game import GameService
+from src.storage.journal import GameJournal
+
+logger = logging.getLogger(__name__)
+
+# How often the checkpointer looks at the journal's event count.
+_POLL_SECONDS = 1.0
+
+
+async def run_checkpointer(
+    service: GameService,
+    journal: GameJournal,
+    interval_seconds: float,
+    min_events: int,
+) -> None:
+    """
+    Snapshot all sessions once min_events have been journaled, or every
+    interval_seconds if anything was journaled at all, until cancelled.
+    """
+    last = time.monotonic()
+    while True:
+        await asyncio.sleep(min(_POLL_SECONDS, interval_seconds))
+        events = journal.events_since_snapshot
+        due = time.monotonic() - last >= interval_seconds
+        if events >= min_events or (due and events):
+            written = await asyncio.to_thread(service.checkpoint)
+            logger.debug("Snapshotted %d game sessions after %d events", written, events)
+        if due:
+            last = time.monotonic()
@@ -0,0 +1,57 @@
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal
+
+from src.domain.types import PublicGameView
+
+GameEventKind = Literal["flipped", "matched", "mismatched", "won", "lost", "restarted"]
+
+
+@dataclass(frozen=True)
+class GameEvent:
+    """
+    One state change of a game. kind is the most significant outcome of the change
+    (a winning match is "won", not "matched"); view is the state right after it,
+    including the emojis of a mismatched pair.
+    """
+    game_id: str
+    version: int
+    kind: GameEventKind
+    view: PublicGameView
+
+
+GameEventHandler = Callable[[GameEvent], None]
+
+
+class GameEventBus:
+    """
+    In-process pub/sub for game events, keyed by game_id.
+    Handlers run synchronously on the publishing thread, while the game's lock is
+    held (so a game's events arrive in order): they must be quick and must not
+    call back into the service. Hand off to an event loop with call_soon_threadsafe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._handlers: dict[str, tuple[GameEventHandler, ...]] = {}
+
+    def subscribe(self, game_id: str, handler: GameEventHandler) -> None:
+        with self._lock:
+            self._handlers[game_id] = self._handlers.get(game_id, ()) + (handler,)
+
+    def unsubscribe(self, game_id: str, handler: GameEventHandler) -> None:
+        """Remove handler (no-op if it is not subscribed)."""
+        with self._lock:
+            handlers = tuple(h for h in self._handlers.get(game_id, ()) if h != handler)
+            if handlers:
+                self._handlers[game_id] = handlers
+            else:
+                self._handlers.pop(game_id, None)
+
+    def has_subscribers(self, game_id: str) -> bool:
+        return game_id in self._handlers
+
+    def publish(self, event: GameEvent) -> None:
+        for handler in self._handlers.get(event.game_id, ()):
+            handler(event)
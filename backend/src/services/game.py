@@ -1,18 +1,64 @@
-from src.domain.game import (
-    apply_countdown_if_expired,
-    build_public_view,
-    create_game,
-    flip_card,
-    restart_game,
+import time
+from collections.abc import Callable, Iterator, Sequence
+from typing import TypeVar
+
+from src.domain.board import Board
+from src.domain.game import create_game, create_games
+from src.domain.types import (
+    GameSession,
+    GameSummary,
+    PublicGameDelta,
+    PublicGameView,
+    Settings,
+    TimerState,
 )
-from src.domain.types import PublicGameView, Settings
 from src.errors import GameNotFound
+from src.locks import StripedLock
+from src.services.board_pool import BoardPool
+from src.services.events import GameEventBus
+from src.services.leaderboard import Leaderboard
+from src.services.updates import (
+    SessionUpdate,
+    apply_update,
+    flip_delta_update,
+    flip_update,
+    get_game_if_changed_update,
+    get_game_update,
+    get_timer_update,
+    public_view,
+    restart_update,
+    split_page,
+    summary_update,
+    turn_update,
+)
+from src.storage.codec import encode_session
+from src.storage.journal import GameJournal
 from src.storage.repository import GameRepository
+from src.storage.snapshot import write_snapshot
+
+R = TypeVar("R")
+
+# Games per save_many call when creating games in bulk.
+BULK_CREATE_BATCH_SIZE = 100
 
 
 class GameService:
-    def __init__(self, repository: GameRepository) -> None:
+    def __init__(
+        self,
+        repository: GameRepository,
+        *,
+        locks: StripedLock | None = None,
+        journal: GameJournal | None = None,
+        events: GameEventBus | None = None,
+        boards: BoardPool | None = None,
+        leaderboard: Leaderboard | None = None,
+    ) -> None:
         self._repository = repository
+        self._locks = locks or StripedLock()
+        self._journal = journal
+        self._events = events
+        self._boards = boards
+        self._leaderboard = leaderboard
 
     def create_game(
         self,
@@ -25,9 +71,37 @@ class GameService:
         Validate, create session, save, return public view.
         Raises InvalidSettings if validation fails.
         """
-        session = create_game(game_id, settings, now=now)
+        session = create_game(game_id, settings, now=now, board=self._pooled_board(settings))
         self._repository.save(session)
-        return build_public_view(session)
+        if self._journal is not None:
+            self._journal.record_create(session)
+        return public_view(session)
+
+    def create_games(
+        self,
+        entries: Sequence[tuple[str, Settings]],
+        *,
+        now: float | None = None,
+        batch_size: int = BULK_CREATE_BATCH_SIZE,
+    ) -> Iterator[list[GameSession]]:
+        """
+        Validate every (game_id, settings) entry and build all boards in one pass;
+        raises InvalidSettings before anything is saved. Returns an iterator that
+        saves the sessions batch by batch (one save_many each) and yields each saved
+        batch, so callers can report games while later batches are still pending.
+        """
+        sessions = create_games(list(entries), now=now)
+        return self._save_batches(sessions, batch_size)
+
+    def _save_batches(
+        self, sessions: list[GameSession], batch_size: int
+    ) -> Iterator[list[GameSession]]:
+        for start in range(0, len(sessions), batch_size):
+            batch = sessions[start:start + batch_size]
+            self._repository.save_many(batch)
+            if self._journal is not None:
+                self._journal.record_creates(batch)
+            yield batch
 
     def get_game(
         self,
@@ -39,13 +113,66 @@ class GameService:
         Load session; if missing raise GameNotFound.
         Apply countdown if expired (persist updated status), return public view.
         """
-        session = self._repository.find_by_id(game_id)
-        if session is None:
-            raise GameNotFound(game_id)
-        session = apply_countdown_if_expired(session, now=now)
-        if session.status == "lost":
-            self._repository.save(session)
-        return build_public_view(session)
+        return self._update(game_id, get_game_update(now))
+
+    def get_game_if_changed(
+        self,
+        game_id: str,
+        is_current: Callable[[int], bool],
+        *,
+        now: float | None = None,
+    ) -> tuple[int, PublicGameView | None]:
+        """
+        Conditional get_game: returns (version, view), with view None when
+        is_current(version) says the caller already has this version, so the
+        view is never built for an unchanged game. Expiry is applied first, so
+        a game whose countdown ran out gets a new version.
+        """
+        return self._update(game_id, get_game_if_changed_update(is_current, now))
+
+    def get_timer(
+        self,
+        game_id: str,
+        *,
+        now: float | None = None,
+    ) -> TimerState:
+        """
+        Like get_game (expiry is persisted the same way) but returns only the
+        remaining time and status, without building the board.
+        """
+        if now is None:
+            now = time.time()
+        return self._update(game_id, get_timer_update(now))
+
+    def list_player_games(
+        self,
+        user_name: str,
+        *,
+        after: str | None = None,
+        limit: int,
+        now: float | None = None,
+    ) -> tuple[list[GameSummary], str | None]:
+        """
+        One page of user_name's games in game id order: at most limit games with ids
+        after the cursor after, and the cursor of the next page (None on the last one).
+        Ids come from the repository's user_name index; games that expired are marked
+        lost as they are read, and games deleted since the lookup are left out.
+        """
+        if now is None:
+            now = time.time()
+        game_ids, next_cursor = split_page(
+            self._repository.find_ids_by(
+                "user_name", user_name, after=after, limit=limit + 1
+            ),
+            limit,
+        )
+        games = []
+        for game_id in game_ids:
+            try:
+                games.append(self._update(game_id, summary_update(now)))
+            except GameNotFound:
+                continue
+        return games, next_cursor
 
     def flip_card(
         self,
@@ -56,16 +183,45 @@ class GameService:
     ) -> PublicGameView:
         """
         Load session; if missing raise GameNotFound.
-        Apply domain flip; on InvalidFlip let it propagate.
+        Apply domain flip in place; on InvalidFlip let it propagate (session unchanged).
         Save updated session, return public view.
         """
-        session = self._repository.find_by_id(game_id)
-        if session is None:
-            raise GameNotFound(game_id)
-        updated, mismatch_pair = flip_card(session, card_id, now=now)
-        self._repository.save(updated)
-        reveal_emoji = dict(mismatch_pair) if mismatch_pair else None
-        return build_public_view(updated, reveal_emoji=reveal_emoji)
+        if now is None:
+            now = time.time()
+        return self._update(game_id, flip_update(card_id, now, self._leaderboard))
+
+    def flip_card_delta(
+        self,
+        game_id: str,
+        card_id: str,
+        *,
+        now: float | None = None,
+    ) -> PublicGameDelta:
+        """
+        Same as flip_card but returns only the cards the flip changed: the flipped card
+        and, on the second flip of a turn, the card turned up before it.
+        """
+        if now is None:
+            now = time.time()
+        return self._update(game_id, flip_delta_update(card_id, now, self._leaderboard))
+
+    def play_turn(
+        self,
+        game_id: str,
+        first_card_id: str,
+        second_card_id: str,
+        *,
+        now: float | None = None,
+    ) -> PublicGameView:
+        """
+        Flip both cards of a turn under one lock, one transaction and one save.
+        Raises InvalidFlip (session unchanged) if either flip is invalid.
+        Returns the public view with the mismatch pair revealed, like flip_card.
+        """
+        if now is None:
+            now = time.time()
+        update = turn_update(first_card_id, second_card_id, now, self._leaderboard)
+        return self._update(game_id, update)
 
     def restart_game(
         self,
@@ -77,10 +233,65 @@ class GameService:
         Load session; if missing raise GameNotFound.
         Domain restart (new board, reset state), save, return public view.
         """
-        session = self._repository.find_by_id(game_id)
-        if session is None:
-            raise GameNotFound(game_id)
-        updated = restart_game(session, now=now)
-        self._repository.save(updated)
-        return build_public_view(updated)
+        if now is None:
+            now = time.time()
+        return self._update(game_id, restart_update(now, self._pooled_restart_board))
+
+    def checkpoint(self) -> int:
+        """
+        Snapshot every stored session into the journal so recovery only replays the
+        events after it. Returns the number of sessions written (0 without a journal).
+        """
+        journal = self._journal
+        if journal is None:
+            return 0
+        seq = journal.rotate()
+        encoded = self._encoded_sessions()
+        journal.write_snapshot(seq, encoded)
+        return len(encoded)
+
+    def save_snapshot(self, path: str) -> int:
+        """
+        Write every stored session to a snapshot file at path (see
+        src/storage/snapshot.py), for restore_snapshot on the next start.
+        Returns the number of sessions written.
+        """
+        return write_snapshot(path, self._encoded_sessions())
+
+    def _encoded_sessions(self) -> list[bytes]:
+        """Every stored session, encoded under its game's lock."""
+        encoded = []
+        for game_id in self._repository.game_ids():
+            with self._locks(game_id):
+                session = self._repository.find_by_id(game_id)
+                if session is not None:
+                    encoded.append(encode_session(session))
+        return encoded
+
+    def _update(self, game_id: str, update: SessionUpdate[object, R]) -> R:
+        """
+        Run update (see src/services/updates.py) under the game's lock: the change is
+        saved with a compare-and-swap, journaled and published before the lock is
+        released, and the rendered result returned once the journal has it on disk.
+        The fsync is waited for after the lock is released, so an AsyncGameService
+        sharing the locks never waits on it from the event loop.
+        """
+        with self._locks(game_id):
+            rendered, lsn = apply_update(
+                self._repository,
+                game_id,
+                update,
+                journal=self._journal,
+                events=self._events,
+                wait=False,
+            )
+        if lsn:
+            self._journal.block_until_durable(lsn)
+        return rendered
+
+    def _pooled_board(self, settings: Settings) -> Board | None:
+        """A pre-generated board for unseeded settings (None: let the domain build one)."""
+        return None if self._boards is None else self._boards.board_for(settings)
 
+    def _pooled_restart_board(self, session: GameSession) -> Board | None:
+        return self._pooled_board(session.settings)
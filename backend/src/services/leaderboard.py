@@ -0,0 +1,71 @@
+import itertools
+import threading
+from dataclasses import dataclass
+
+from src.domain.types import GameSession
+from src.skip_list import SkipList
+
+# (turns, bad guesses, seconds, sequence): the sequence breaks ties in finishing order.
+RankKey = tuple[int, int, float, int]
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    game_id: str
+    user_name: str
+    turns: int
+    bad_guesses: int
+    seconds: float  # from the start of the game to the winning flip
+
+
+class Leaderboard:
+    """
+    Won games ranked by fewest turns, then fewest bad guesses, then least time, with
+    one board per card count. Each board is a skip list, so recording a win and
+    reading the top k cost O(log n) and O(log n + k) however many games have finished.
+
+    With max_entries, each board keeps only its best max_entries games: a win that
+    would rank below them is dropped, and one that ranks among them pushes the last
+    one out. Results live in this process: they are not persisted, and with several
+    workers each one ranks the games it finished.
+    """
+
+    def __init__(self, max_entries: int = 0) -> None:
+        self._max_entries = max_entries
+        self._boards: dict[int, SkipList[RankKey, LeaderboardEntry]] = {}
+        self._sequence = itertools.count()
+        # Wins are recorded under their game's lock, so different games race here.
+        self._lock = threading.Lock()
+
+    def record_win(self, session: GameSession, now: float) -> None:
+        entry = LeaderboardEntry(
+            game_id=session.game_id,
+            user_name=session.user_name,
+            turns=session.turns,
+            bad_guesses=session.bad_guesses,
+            seconds=max(0.0, now - session.started_at),
+        )
+        card_count = session.settings.card_count
+        with self._lock:
+            key = (entry.turns, entry.bad_guesses, entry.seconds, next(self._sequence))
+            board = self._boards.get(card_count)
+            if board is None:
+                board = self._boards[card_count] = SkipList()
+            if self._max_entries and len(board) >= self._max_entries:
+                last = board.last()
+                if last is not None and key > last[0]:
+                    return
+                board.pop_last()
+            board.insert(key, entry)
+
+    def top(self, card_count: int, limit: int) -> list[LeaderboardEntry]:
+        """The best limit games of the board for card_count, best first."""
+        with self._lock:
+            board = self._boards.get(card_count)
+            if board is None:
+                return []
+            return [entry for _, entry in board.first(limit)]
+
+    def size(self, card_count: int) -> int:
+        board = self._boards.get(card_count)
+        return 0 if board is None else len(board)
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+
+from src.domain.types import TimerState
+from src.errors import GameNotFound
+from src.services.events import GameEvent, GameEventBus
+from src.services.game import GameService
+
+logger = logging.getLogger(__name__)
+
+# Pushed instead of a TimerState when the game no longer exists (e.g. evicted).
+GAME_GONE = None
+
+TimerUpdate = TimerState | GameEvent | None
+
+
+def _is_final(update: TimerUpdate) -> bool:
+    if update is GAME_GONE:
+        return True
+    if isinstance(update, GameEvent):
+        return update.view.state.status != "playing"
+    return update.status != "playing"
+
+
+class TimerHub:
+    """
+    One ticker per process for the timer sockets. Subscribers are grouped by game;
+    each tick computes the timer once per subscribed game (off the event loop) and
+    fans it out to every subscriber's queue. With an event bus, the game's state
+    changes (flips, restarts, win/loss) are pushed to the same queues as they happen.
+
+    Ticks are skipped for a subscriber that still has something queued, so a slow
+    socket does not pile them up; events are always queued. A game's subscribers
+    are dropped after its final state (won, lost or gone) has been pushed.
+
+    The ticker runs while anyone is subscribed and stops with the last
+    unsubscribe; the next subscribe starts it on the running loop.
+    """
+
+    def __init__(
+        self,
+        service: GameService,
+        *,
+        events: GameEventBus | None = None,
+        interval_seconds: float = 1.0,
+    ) -> None:
+        self._service = service
+        self._events = events
+        self._interval = interval_seconds
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def subscribe(self, game_id: str) -> asyncio.Queue:
+        """Register for timer updates and events of game_id. Call from the event loop."""
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        queues = self._subscribers.get(game_id)
+        if queues is None:
+            queues = self._subscribers[game_id] = set()
+            if self._events is not None:
+                self._events.subscribe(game_id, self._on_event)
+        queues.add(queue)
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._task = asyncio.create_task(self._run(), name="timer-hub")
+        return queue
+
+    def unsubscribe(self, game_id: str, queue: asyncio.Queue) -> None:
+        """Stop updates for queue (no-op if already dropped)."""
+        queues = self._subscribers.get(game_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            self._drop(game_id)
+
+    def subscriber_count(self) -> int:
+        # list() copies the values in one step, so other threads can count too.
+        return sum(len(queues) for queues in list(self._subscribers.values()))
+
+    def _drop(self, game_id: str) -> None:
+        del self._subscribers[game_id]
+        if self._events is not None:
+            self._events.unsubscribe(game_id, self._on_event)
+
+    def _on_event(self, event: GameEvent) -> None:
+        # Runs on the service's thread, under the game lock.
+        try:
+            self._loop.call_soon_threadsafe(self._publish, event.game_id, event)
+        except RuntimeError:
+            pass  # the loop has shut down; its sockets are gone
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self._interval
+        while self._subscribers:
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            next_tick += self._interval
+            game_ids = list(self._subscribers)
+            try:
+                states = await asyncio.to_thread(self._timers, game_ids)
+            except Exception:
+                logger.exception("Timer hub tick failed")
+                continue
+            for game_id, state in zip(game_ids, states):
+                self._publish(game_id, state)
+
+    def _timers(self, game_ids: list[str]) -> list[TimerState | None]:
+        states: list[TimerState | None] = []
+        get_timer = self._service.get_timer
+        for game_id in game_ids:
+            try:
+                states.append(get_timer(game_id))
+            except GameNotFound:
+                states.append(GAME_GONE)
+        return states
+
+    def _publish(self, game_id: str, update: TimerUpdate) -> None:
+        queues = self._subscribers.get(game_id)
+        if not queues:
+            return
+        final = _is_final(update)
+        always = final or isinstance(update, GameEvent)
+        for queue in queues:
+            if always or queue.empty():
+                queue.put_nowait(update)
+        if final:
+            self._drop(game_id)
@@ -0,0 +1,340 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from src import metrics
+from src.domain.board import Board
+from src.domain.game import (
+    apply_countdown_in_place,
+    build_public_delta,
+    build_public_view,
+    flip_card_in_place,
+    get_remaining_seconds,
+    play_turn_in_place,
+    restart_game_in_place,
+)
+from src.domain.transaction import SessionTransaction
+from src.domain.types import (
+    GameSession,
+    GameState,
+    GameSummary,
+    PublicGameDelta,
+    PublicGameView,
+    TimerState,
+)
+from src.errors import GameNotFound, InvalidFlip, VersionConflict
+from src.services.events import GameEvent, GameEventBus, GameEventKind
+from src.services.leaderboard import Leaderboard
+from src.storage.journal import GameJournal
+from src.storage.repository import GameRepository
+
+# The read-modify-write steps of every GameService / AsyncGameService operation, so
+# the sync and async services only differ in how they lock, load and save.
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Attempts at a compare-and-swap save before a VersionConflict is surfaced to the caller.
+MAX_SAVE_ATTEMPTS = 3
+
+MismatchPair = list[tuple[str, str]] | None
+
+
+@dataclass(frozen=True)
+class SessionUpdate(Generic[T, R]):
+    """
+    One change to a stored session.
+    apply(session) changes it in place and returns a result; save_if(result) can skip
+    the save when apply changed nothing. render(session, result) builds the return
+    value. After a save, record(journal, session, result, wait) appends the change to
+    the journal and returns its sequence number, observe(session, result) updates
+    metrics, and event(session, result, rendered) gives the kind and view to publish
+    when someone subscribes to the game's events.
+    """
+    apply: Callable[[GameSession], T]
+    render: Callable[[GameSession, T], R]
+    save_if: Callable[[T], bool] | None = None
+    record: Callable[[GameJournal, GameSession, T, bool], int] | None = None
+    event: Callable[[GameSession, T, R], tuple[GameEventKind, PublicGameView]] | None = None
+    observe: Callable[[GameSession, T], None] | None = None
+
+
+def apply_update(
+    repository: GameRepository,
+    game_id: str,
+    update: SessionUpdate[T, R],
+    *,
+    journal: GameJournal | None = None,
+    events: GameEventBus | None = None,
+    wait: bool = True,
+) -> tuple[R, int]:
+    """
+    Run update against the stored session; the caller holds the game's lock.
+    The change is applied inside a transaction, the version bumped and the session
+    compare-and-swap saved; on VersionConflict (a writer outside this process) it is
+    reloaded and retried. Returns (rendered, journal sequence number or 0); with
+    wait=False the caller waits for the journal itself.
+    """
+    attempt = 1
+    while True:
+        session = repository.find_by_id(game_id)
+        if session is None:
+            raise GameNotFound(game_id)
+        try:
+            with SessionTransaction(session):
+                result = update.apply(session)
+                saved = update.save_if is None or update.save_if(result)
+                if saved:
+                    expected = session.version
+                    session.version = expected + 1
+                    repository.save(session, expected_version=expected)
+        except VersionConflict:
+            if attempt >= MAX_SAVE_ATTEMPTS:
+                raise
+            attempt += 1
+            continue
+        return finish_update(session, update, result, saved, journal, events, wait)
+
+
+def finish_update(
+    session: GameSession,
+    update: SessionUpdate[T, R],
+    result: T,
+    saved: bool,
+    journal: GameJournal | None,
+    events: GameEventBus | None,
+    wait: bool,
+) -> tuple[R, int]:
+    """Journal, render and publish a committed update (still under the game's lock)."""
+    lsn = 0
+    if saved and update.record is not None and journal is not None:
+        lsn = update.record(journal, session, result, wait)
+    if saved and update.observe is not None:
+        update.observe(session, result)
+    rendered = update.render(session, result)
+    if (
+        saved
+        and update.event is not None
+        and events is not None
+        and events.has_subscribers(session.game_id)
+    ):
+        kind, view = update.event(session, result, rendered)
+        events.publish(GameEvent(session.game_id, session.version, kind, view))
+    return rendered, lsn
+
+
+def _flip_event_kind(session: GameSession, mismatch_pair: MismatchPair) -> GameEventKind:
+    if session.status != "playing":
+        return session.status
+    if session.flipped_card_ids:
+        return "flipped"
+    return "mismatched" if mismatch_pair else "matched"
+
+
+def _revealed(mismatch_pair: MismatchPair) -> dict[str, str] | None:
+    return dict(mismatch_pair) if mismatch_pair else None
+
+
+def public_view(session: GameSession, mismatch_pair: MismatchPair = None) -> PublicGameView:
+    """build_public_view revealing the mismatch pair, timed for the metrics."""
+    start = time.perf_counter()
+    view = build_public_view(session, reveal_emoji=_revealed(mismatch_pair))
+    metrics.BUILD_FULL_VIEW.observe(time.perf_counter() - start)
+    return view
+
+
+def _public_delta(
+    session: GameSession, changed: int, base_version: int, mismatch_pair: MismatchPair
+) -> PublicGameDelta:
+    start = time.perf_counter()
+    delta = build_public_delta(
+        session, changed, base_version=base_version, reveal_emoji=_revealed(mismatch_pair)
+    )
+    metrics.BUILD_DELTA_VIEW.observe(time.perf_counter() - start)
+    return delta
+
+
+def _flip_in_place(session: GameSession, card_id: str, now: float) -> MismatchPair:
+    try:
+        return flip_card_in_place(session, card_id, now=now)
+    except InvalidFlip:
+        metrics.FLIP_INVALID.inc()
+        raise
+
+
+def _turn_in_place(
+    session: GameSession, first_card_id: str, second_card_id: str, now: float
+) -> MismatchPair:
+    try:
+        return play_turn_in_place(session, first_card_id, second_card_id, now=now)
+    except InvalidFlip:
+        metrics.FLIP_INVALID.inc()
+        raise
+
+
+def _count_flip(session: GameSession, mismatch_pair: MismatchPair) -> None:
+    if session.flipped_card_ids:
+        metrics.FLIP_FIRST.inc()
+    elif mismatch_pair:
+        metrics.FLIP_MISMATCH.inc()
+    else:
+        metrics.FLIP_MATCH.inc()
+
+
+def _count_turn(session: GameSession, mismatch_pair: MismatchPair) -> None:
+    metrics.FLIP_FIRST.inc()
+    if session.flipped_card_ids:
+        return  # the countdown ran out on the first card, so there was no second flip
+    (metrics.FLIP_MISMATCH if mismatch_pair else metrics.FLIP_MATCH).inc()
+
+
+def _observe_flip(
+    count: Callable[[GameSession, MismatchPair], None],
+    now: float,
+    leaderboard: Leaderboard | None,
+) -> Callable[[GameSession, MismatchPair], None]:
+    """count, plus recording the game on the leaderboard when the flip won it."""
+    if leaderboard is None:
+        return count
+
+    def observe(session: GameSession, mismatch_pair: MismatchPair) -> None:
+        count(session, mismatch_pair)
+        if session.status == "won":  # flips need a game in play, so this one won it
+            leaderboard.record_win(session, now)
+
+    return observe
+
+
+def _record_expire(journal: GameJournal, session: GameSession, _: bool, wait: bool) -> int:
+    return journal.record_expire(session, wait=wait)
+
+
+def get_game_update(now: float | None) -> SessionUpdate[bool, PublicGameView]:
+    return SessionUpdate(
+        apply=lambda s: apply_countdown_in_place(s, now=now),
+        render=lambda s, _: public_view(s),
+        save_if=bool,
+        record=_record_expire,
+        event=lambda s, _, view: ("lost", view),
+    )
+
+
+def get_game_if_changed_update(
+    is_current: Callable[[int], bool], now: float | None
+) -> SessionUpdate[bool, tuple[int, PublicGameView | None]]:
+    return SessionUpdate(
+        apply=lambda s: apply_countdown_in_place(s, now=now),
+        render=lambda s, _: (s.version, None if is_current(s.version) else public_view(s)),
+        save_if=bool,
+        record=_record_expire,
+        event=lambda s, _, __: ("lost", public_view(s)),
+    )
+
+
+def get_timer_update(now: float) -> SessionUpdate[bool, TimerState]:
+    return SessionUpdate(
+        apply=lambda s: apply_countdown_in_place(s, now=now),
+        render=lambda s, _: TimerState(
+            remaining_seconds=get_remaining_seconds(s, now) if s.status == "playing" else 0,
+            status=s.status,
+        ),
+        save_if=bool,
+        record=_record_expire,
+        event=lambda s, _, __: ("lost", public_view(s)),
+    )
+
+
+def summary_update(now: float) -> SessionUpdate[bool, GameSummary]:
+    return SessionUpdate(
+        apply=lambda s: apply_countdown_in_place(s, now=now),
+        render=lambda s, _: GameSummary(
+            game_id=s.game_id,
+            settings=s.settings,
+            state=GameState.from_session(
+                s, get_remaining_seconds(s, now) if s.status == "playing" else 0
+            ),
+            version=s.version,
+        ),
+        save_if=bool,
+        record=_record_expire,
+        event=lambda s, _, __: ("lost", public_view(s)),
+    )
+
+
+def split_page(game_ids: list[str], limit: int) -> tuple[list[str], str | None]:
+    """Ids fetched with limit + 1 -> (the page, cursor of the next page or None)."""
+    if len(game_ids) <= limit:
+        return game_ids, None
+    return game_ids[:limit], game_ids[limit - 1]
+
+
+def flip_update(
+    card_id: str, now: float, leaderboard: Leaderboard | None = None
+) -> SessionUpdate[MismatchPair, PublicGameView]:
+    return SessionUpdate(
+        apply=lambda s: _flip_in_place(s, card_id, now),
+        render=public_view,
+        record=lambda journal, s, _, wait: journal.record_flip(
+            s, s.board.index_of(card_id), now, wait=wait
+        ),
+        event=lambda s, mismatch_pair, view: (_flip_event_kind(s, mismatch_pair), view),
+        observe=_observe_flip(_count_flip, now, leaderboard),
+    )
+
+
+def flip_delta_update(
+    card_id: str, now: float, leaderboard: Leaderboard | None = None
+) -> SessionUpdate[MismatchPair, PublicGameDelta]:
+    # The changed cards are the ones face up before the flip plus the flipped card.
+    changed = 0
+    base_version = 0
+
+    def apply(session: GameSession) -> MismatchPair:
+        nonlocal changed, base_version
+        base_version = session.version
+        face_up_before = session.flipped_card_ids.mask
+        mismatch_pair = _flip_in_place(session, card_id, now)
+        changed = face_up_before | 1 << session.board.index_of(card_id)
+        return mismatch_pair
+
+    return SessionUpdate(
+        apply=apply,
+        render=lambda s, mismatch_pair: _public_delta(s, changed, base_version, mismatch_pair),
+        record=lambda journal, s, _, wait: journal.record_flip(
+            s, s.board.index_of(card_id), now, wait=wait
+        ),
+        event=lambda s, mismatch_pair, _: (
+            _flip_event_kind(s, mismatch_pair), public_view(s, mismatch_pair)
+        ),
+        observe=_observe_flip(_count_flip, now, leaderboard),
+    )
+
+
+def turn_update(
+    first_card_id: str,
+    second_card_id: str,
+    now: float,
+    leaderboard: Leaderboard | None = None,
+) -> SessionUpdate[MismatchPair, PublicGameView]:
+    return SessionUpdate(
+        apply=lambda s: _turn_in_place(s, first_card_id, second_card_id, now),
+        render=public_view,
+        record=lambda journal, s, _, wait: journal.record_turn(
+            s, s.board.index_of(first_card_id), s.board.index_of(second_card_id), now, wait=wait
+        ),
+        event=lambda s, mismatch_pair, view: (_flip_event_kind(s, mismatch_pair), view),
+        observe=_observe_flip(_count_turn, now, leaderboard),
+    )
+
+
+def restart_update(
+    now: float, take_board: Callable[[GameSession], Board | None]
+) -> SessionUpdate[None, PublicGameView]:
+    """take_board(session) supplies a pre-generated board (None: shuffle a new one)."""
+    return SessionUpdate(
+        apply=lambda s: restart_game_in_place(s, now=now, board=take_board(s)),
+        render=lambda s, _: public_view(s),
+        record=lambda journal, s, _, wait: journal.record_restart(s, now, wait=wait),
+        event=lambda s, _, view: ("restarted", view),
+    )
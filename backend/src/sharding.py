@@ -0,0 +1,21 @@
+import re
+import uuid
+
+# "s<shard>-<uuid4>": the shard owning the game's state, then the random part.
+_SHARDED_ID = re.compile(r"s(\d{1,4})-")
+
+
+def new_game_id(shard: int) -> str:
+    """A fresh game id owned by shard."""
+    return f"s{shard}-{uuid.uuid4()}"
+
+
+def shard_of(game_id: str) -> int | None:
+    """The shard encoded in game_id, or None for ids without one (served locally)."""
+    match = _SHARDED_ID.match(game_id)
+    return None if match is None else int(match.group(1))
+
+
+def parse_nodes(nodes: str) -> list[str]:
+    """Base URLs of every node by shard number, from a comma-separated list."""
+    return [node.strip().rstrip("/") for node in nodes.split(",") if node.strip()]
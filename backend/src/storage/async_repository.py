@@ -0,0 +1,75 @@
+import asyncio
+from collections.abc import Sequence
+
+from src.domain.types import GameSession
+from src.storage.memory import MemoryGameRepository
+from src.storage.repository import AsyncGameRepository, GameRepository, IndexName
+
+
+class InlineAsyncRepository:
+    """
+    AsyncGameRepository over a store whose calls never block (the in-memory one):
+    every call runs directly on the event loop, without a thread hop.
+    """
+
+    def __init__(self, repository: GameRepository) -> None:
+        self.repository = repository
+
+    async def save(self, session: GameSession, *, expected_version: int | None = None) -> None:
+        self.repository.save(session, expected_version=expected_version)
+
+    async def save_many(self, sessions: Sequence[GameSession]) -> None:
+        self.repository.save_many(sessions)
+
+    async def find_by_id(self, game_id: str) -> GameSession | None:
+        return self.repository.find_by_id(game_id)
+
+    async def game_ids(self) -> list[str]:
+        return self.repository.game_ids()
+
+    async def delete(self, game_id: str) -> None:
+        self.repository.delete(game_id)
+
+    async def find_ids_by(
+        self, index: IndexName, value: str, *, after: str | None = None, limit: int
+    ) -> list[str]:
+        return self.repository.find_ids_by(index, value, after=after, limit=limit)
+
+
+class ThreadedAsyncRepository:
+    """
+    AsyncGameRepository over a blocking store (SQLite, or the shared-memory store,
+    whose stripe locks are held across processes): each call runs in a thread.
+    """
+
+    def __init__(self, repository: GameRepository) -> None:
+        self.repository = repository
+
+    async def save(self, session: GameSession, *, expected_version: int | None = None) -> None:
+        await asyncio.to_thread(self.repository.save, session, expected_version=expected_version)
+
+    async def save_many(self, sessions: Sequence[GameSession]) -> None:
+        await asyncio.to_thread(self.repository.save_many, sessions)
+
+    async def find_by_id(self, game_id: str) -> GameSession | None:
+        return await asyncio.to_thread(self.repository.find_by_id, game_id)
+
+    async def game_ids(self) -> list[str]:
+        return await asyncio.to_thread(self.repository.game_ids)
+
+    async def delete(self, game_id: str) -> None:
+        await asyncio.to_thread(self.repository.delete, game_id)
+
+    async def find_ids_by(
+        self, index: IndexName, value: str, *, after: str | None = None, limit: int
+    ) -> list[str]:
+        return await asyncio.to_thread(
+            self.repository.find_ids_by, index, value, after=after, limit=limit
+        )
+
+
+def to_async(repository: GameRepository) -> AsyncGameRepository:
+    """The async view of repository: inline for the in-memory store, threaded otherwise."""
+    if isinstance(repository, MemoryGameRepository):
+        return InlineAsyncRepository(repository)
+    return ThreadedAsyncRepository(repository)
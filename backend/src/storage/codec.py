@@ -0,0 +1,199 @@
+import struct
+
+from src.domain.board import EMOJI_SYMBOLS, Board, CardSet
+from src.domain.game import intern_board
+from src.domain.types import GameSession, GameStatus, Settings
+
+# Separator for symbol tables and custom card ids (never part of an emoji or id).
+_SEP = "\x1f"
+
+_STATUSES: tuple[GameStatus, ...] = ("playing", "won", "lost")
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+
+_FLAG_SYMBOLS = 1  # board has its own symbol table
+_FLAG_IDS = 2  # board has custom card ids
+_FLAG_SEED = 4  # settings carry a shared-board seed
+
+# Every encoding starts with the magic and the format version.
+_MAGIC = b"MGS"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<3sB")  # magic, format version
+_PREFIX_BYTES = _PREFIX.pack(_MAGIC, FORMAT_VERSION)
+
+# version, status, started_at, turns, bad_guesses, card_count, countdown_seconds,
+# flip_back_delay_ms, max_bad_guesses (-1 = None), n_cards, flags,
+# len(game_id), len(user_name)
+_HEADER = struct.Struct("<IBdIIHHIiHBHH")
+_LENGTH = struct.Struct("<I")
+_SEED = struct.Struct("<q")
+_VERSION = struct.Struct("<I")  # the first header field
+
+
+def _mask_size(n_cards: int) -> int:
+    return (n_cards + 7) // 8
+
+
+def encode_session(session: GameSession) -> bytes:
+    """
+    Compact binary form of a session: the magic and format version, a fixed struct
+    header, the UTF-8 game id and user name, one symbol code per card and the
+    face-up/matched bitsets. Custom symbol tables and card ids (rare) follow as length-prefixed strings,
+    then the board seed if there is one.
+    """
+    settings = session.settings
+    board = session.board
+    n_cards = len(board)
+    game_id = session.game_id.encode()
+    user_name = session.user_name.encode()
+    flags = 0
+    tail = b""
+    if board.symbols is not EMOJI_SYMBOLS:
+        flags |= _FLAG_SYMBOLS
+        symbols = _SEP.join(board.symbols).encode()
+        tail += _LENGTH.pack(len(symbols)) + symbols
+    if board.ids is not None:
+        flags |= _FLAG_IDS
+        ids = _SEP.join(board.ids).encode()
+        tail += _LENGTH.pack(len(ids)) + ids
+    if settings.seed is not None:
+        flags |= _FLAG_SEED
+        tail += _SEED.pack(settings.seed)
+    mask_size = _mask_size(n_cards)
+    return b"".join((
+        _PREFIX_BYTES,
+        _HEADER.pack(
+            session.version,
+            _STATUS_CODES[session.status],
+            session.started_at,
+            session.turns,
+            session.bad_guesses,
+            settings.card_count,
+            settings.countdown_seconds,
+            settings.flip_back_delay_ms,
+            -1 if settings.max_bad_guesses is None else settings.max_bad_guesses,
+            n_cards,
+            flags,
+            len(game_id),
+            len(user_name),
+        ),
+        game_id,
+        user_name,
+        board.codes,
+        session.flipped_card_ids.mask.to_bytes(mask_size, "little"),
+        session.matched_card_ids.mask.to_bytes(mask_size, "little"),
+        tail,
+    ))
+
+
+def _header_offset(data: bytes | memoryview, offset: int) -> int:
+    """Where the header of the session encoded at offset starts, past its prefix."""
+    if len(data) - offset < _PREFIX.size:
+        raise ValueError("Not an encoded session")
+    magic, format_version = _PREFIX.unpack_from(data, offset)
+    if magic != _MAGIC:
+        raise ValueError("Not an encoded session")
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported session format {format_version}")
+    return offset + _PREFIX.size
+
+
+def peek_version(data: bytes | memoryview, offset: int = 0) -> int:
+    """The version of the session encoded at offset, without decoding the rest."""
+    return _VERSION.unpack_from(data, _header_offset(data, offset))[0]
+
+
+def peek_status(data: bytes | memoryview, offset: int = 0) -> GameStatus:
+    """The status of the session encoded at offset, without decoding the rest."""
+    return _STATUSES[_HEADER.unpack_from(data, _header_offset(data, offset))[1]]
+
+
+def peek_game_id(data: bytes | memoryview, offset: int = 0) -> str:
+    """The game id of the session encoded at offset, without decoding the rest."""
+    offset = _header_offset(data, offset)
+    game_id_len = _HEADER.unpack_from(data, offset)[-2]
+    start = offset + _HEADER.size
+    return str(data[start:start + game_id_len], "utf-8")
+
+
+def peek_user_name(data: bytes | memoryview, offset: int = 0) -> str:
+    """The user name of the session encoded at offset, without decoding the rest."""
+    offset = _header_offset(data, offset)
+    *_, game_id_len, user_name_len = _HEADER.unpack_from(data, offset)
+    start = offset + _HEADER.size + game_id_len
+    return str(data[start:start + user_name_len], "utf-8")
+
+
+def decode_session(data: bytes | memoryview, offset: int = 0) -> tuple[GameSession, int]:
+    """
+    Decode one session starting at offset. Returns (session, offset after it).
+    Raises ValueError for a format version this code does not know.
+    """
+    offset = _header_offset(data, offset)
+    (
+        version,
+        status,
+        started_at,
+        turns,
+        bad_guesses,
+        card_count,
+        countdown_seconds,
+        flip_back_delay_ms,
+        max_bad_guesses,
+        n_cards,
+        flags,
+        game_id_len,
+        user_name_len,
+    ) = _HEADER.unpack_from(data, offset)
+    pos = offset + _HEADER.size
+    game_id = str(data[pos:pos + game_id_len], "utf-8")
+    pos += game_id_len
+    user_name = str(data[pos:pos + user_name_len], "utf-8")
+    pos += user_name_len
+    codes = bytes(data[pos:pos + n_cards])
+    pos += n_cards
+    mask_size = _mask_size(n_cards)
+    face_up = int.from_bytes(data[pos:pos + mask_size], "little")
+    pos += mask_size
+    matched = int.from_bytes(data[pos:pos + mask_size], "little")
+    pos += mask_size
+    symbols = EMOJI_SYMBOLS
+    ids = None
+    if flags & _FLAG_SYMBOLS:
+        (size,) = _LENGTH.unpack_from(data, pos)
+        pos += _LENGTH.size
+        symbols = tuple(str(data[pos:pos + size], "utf-8").split(_SEP))
+        pos += size
+    if flags & _FLAG_IDS:
+        (size,) = _LENGTH.unpack_from(data, pos)
+        pos += _LENGTH.size
+        ids = tuple(str(data[pos:pos + size], "utf-8").split(_SEP))
+        pos += size
+    seed = None
+    if flags & _FLAG_SEED:
+        (seed,) = _SEED.unpack_from(data, pos)
+        pos += _SEED.size
+
+    board = Board(codes, symbols, ids)
+    if seed is not None:
+        board = intern_board(seed, board)
+    session = GameSession(
+        game_id=game_id,
+        user_name=user_name,
+        settings=Settings(
+            user_name=user_name,
+            card_count=card_count,
+            countdown_seconds=countdown_seconds,
+            flip_back_delay_ms=flip_back_delay_ms,
+            max_bad_guesses=None if max_bad_guesses < 0 else max_bad_guesses,
+            seed=seed,
+        ),
+        board=board,
+        status=_STATUSES[status],
+        started_at=started_at,
+        turns=turns,
+        bad_guesses=bad_guesses,
+        flipped_card_ids=CardSet(board, face_up),
+        matched_card_ids=CardSet(board, matched),
+        version=version,
+    )
+    return session, pos
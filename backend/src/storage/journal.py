@@ -0,0 +1,433 @@
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from src.domain.board import Board
+from src.domain.game import (
+    flip_card_in_place,
+    intern_board,
+    play_turn_in_place,
+    restart_game_in_place,
+)
+from src.domain.types import GameSession
+from src.errors import InvalidFlip
+from src.storage.codec import decode_session, encode_session
+from src.storage.repository import GameRepository
+from src.storage.snapshot import read_snapshot, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+EVENT_CREATE = 1
+EVENT_FLIP = 2
+EVENT_RESTART = 3
+EVENT_EXPIRE = 4
+EVENT_TURN = 5
+_EVENT_KINDS = frozenset((EVENT_CREATE, EVENT_FLIP, EVENT_RESTART, EVENT_EXPIRE, EVENT_TURN))
+
+_RECORD = struct.Struct("<IIB")  # payload length, crc32(payload), event kind
+_GAME_ID = struct.Struct("<H")  # length of the UTF-8 game id that starts every non-create payload
+_FLIP = struct.Struct("<IHd")  # version after, card index, now
+_RESTART = struct.Struct("<IdH")  # version after, now, card count (symbol codes follow)
+_EXPIRE = struct.Struct("<I")  # version after
+_TURN = struct.Struct("<IHHd")  # version after, first card index, second card index, now
+
+_SEGMENT = "segment-{:010d}.log"
+_SNAPSHOT = "snapshot-{:010d}.snap"
+
+
+class JournalError(Exception):
+    """The journal could not make records durable."""
+
+
+@dataclass(frozen=True)
+class RecoveryStats:
+    sessions: int
+    snapshot_sessions: int
+    events_replayed: int
+    seconds: float
+
+
+def _game_id_prefix(game_id: str) -> bytes:
+    raw = game_id.encode()
+    return _GAME_ID.pack(len(raw)) + raw
+
+
+def _resolve(future: asyncio.Future, exc: BaseException | None) -> None:
+    if future.done():
+        return  # the waiter was cancelled
+    if exc is None:
+        future.set_result(None)
+    else:
+        future.set_exception(exc)
+
+
+def _list_files(directory: str, template: str) -> list[tuple[int, str]]:
+    prefix, suffix = template.split("{")[0], template.rsplit("}", 1)[1]
+    found = []
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(suffix):
+            number = name[len(prefix):len(name) - len(suffix)]
+            if number.isdigit():
+                found.append((int(number), os.path.join(directory, name)))
+    return sorted(found)
+
+
+class GameJournal:
+    """
+    Append-only log of game events (create, flip, turn, restart, expire) in numbered
+    segment files, plus periodic snapshots of every session.
+
+    Records are buffered and written by one flusher thread; each write batches
+    everything appended while the previous fsync was running (group commit).
+    With sync_commit, appenders wait until their record is on disk.
+
+    Every event carries the session version it produces. A snapshot taken after
+    rotate() may already contain some events from the new segment; replay skips
+    events whose version the session has already reached.
+    """
+
+    def __init__(self, directory: str, *, sync_commit: bool = True) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self._dir = directory
+        self._sync_commit = sync_commit
+        self._cond = threading.Condition()
+        self._buffer: list[bytes] = []
+        self._appended = 0  # records appended
+        self._durable = 0  # records written and fsynced
+        self._events_since_snapshot = 0
+        self._segment_seq = 0
+        self._rotate_to: int | None = None
+        self._file: BinaryIO | None = None
+        self._flusher: threading.Thread | None = None
+        self._closing = False
+        self._error: BaseException | None = None
+        self._async_waiters: list[tuple[int, asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def events_since_snapshot(self) -> int:
+        return self._events_since_snapshot
+
+    # --- Recovery ---
+
+    def recover(self, repository: GameRepository) -> RecoveryStats:
+        """
+        Rebuild sessions from the latest snapshot plus the segments after it and save
+        them into repository. Call before start().
+        """
+        started = time.perf_counter()
+        sessions: dict[str, GameSession] = {}
+        snapshots = _list_files(self._dir, _SNAPSHOT)
+        base = 0
+        if snapshots:
+            base, path = snapshots[-1]
+            self._load_snapshot(path, sessions)
+        snapshot_sessions = len(sessions)
+        events = 0
+        for seq, path in _list_files(self._dir, _SEGMENT):
+            if seq >= base:
+                events += self._replay_segment(path, sessions)
+        for session in sessions.values():
+            repository.save(session)
+        return RecoveryStats(
+            sessions=len(sessions),
+            snapshot_sessions=snapshot_sessions,
+            events_replayed=events,
+            seconds=time.perf_counter() - started,
+        )
+
+    @staticmethod
+    def _load_snapshot(path: str, sessions: dict[str, GameSession]) -> None:
+        try:
+            loaded = read_snapshot(path)
+        except ValueError as exc:
+            raise JournalError(str(exc)) from exc
+        for session in loaded:
+            sessions[session.game_id] = session
+
+    @classmethod
+    def _replay_segment(cls, path: str, sessions: dict[str, GameSession]) -> int:
+        size = os.path.getsize(path)
+        if size == 0:
+            return 0
+        replayed = 0
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                pos = 0
+                while pos + _RECORD.size <= size:
+                    length, crc, kind = _RECORD.unpack_from(view, pos)
+                    start = pos + _RECORD.size
+                    end = start + length
+                    if end > size or kind not in _EVENT_KINDS:
+                        break  # torn write at the tail
+                    payload = view[start:end]
+                    valid = zlib.crc32(payload) == crc
+                    if valid:
+                        cls._apply(kind, payload, sessions)
+                    payload.release()
+                    if not valid:
+                        break
+                    replayed += 1
+                    pos = end
+        return replayed
+
+    @staticmethod
+    def _apply(kind: int, payload: memoryview, sessions: dict[str, GameSession]) -> None:
+        if kind == EVENT_CREATE:
+            session, _ = decode_session(payload)
+            existing = sessions.get(session.game_id)
+            if existing is None or existing.version < session.version:
+                sessions[session.game_id] = session
+            return
+
+        (id_len,) = _GAME_ID.unpack_from(payload, 0)
+        pos = _GAME_ID.size + id_len
+        session = sessions.get(str(payload[_GAME_ID.size:pos], "utf-8"))
+        if session is None:
+            return
+        if kind == EVENT_FLIP:
+            version, index, now = _FLIP.unpack_from(payload, pos)
+            if version <= session.version:
+                return
+            try:
+                flip_card_in_place(session, session.board.card_id(index), now)
+            except InvalidFlip:
+                logger.warning("Skipping unreplayable flip in game %s", session.game_id)
+        elif kind == EVENT_TURN:
+            version, first, second, now = _TURN.unpack_from(payload, pos)
+            if version <= session.version:
+                return
+            board = session.board
+            try:
+                play_turn_in_place(session, board.card_id(first), board.card_id(second), now)
+            except InvalidFlip:
+                logger.warning("Skipping unreplayable turn in game %s", session.game_id)
+        elif kind == EVENT_RESTART:
+            version, now, n_cards = _RESTART.unpack_from(payload, pos)
+            if version <= session.version:
+                return
+            pos += _RESTART.size
+            board = Board(bytes(payload[pos:pos + n_cards]))
+            if session.settings.seed is not None:
+                board = intern_board(session.settings.seed, board)
+            restart_game_in_place(session, now=now, board=board)
+        else:
+            (version,) = _EXPIRE.unpack_from(payload, pos)
+            if version <= session.version:
+                return
+            session.status = "lost"
+        session.version = version
+
+    # --- Appending ---
+
+    def start(self) -> None:
+        """Open a fresh segment after any existing ones and start the flusher thread."""
+        existing = _list_files(self._dir, _SEGMENT) + _list_files(self._dir, _SNAPSHOT)
+        self._segment_seq = max((seq for seq, _ in existing), default=0) + 1
+        self._file = self._open_segment(self._segment_seq)
+        self._flusher = threading.Thread(target=self._flush_loop, name="game-journal", daemon=True)
+        self._flusher.start()
+
+    def close(self) -> None:
+        """Flush everything appended so far and stop the flusher."""
+        if self._flusher is None:
+            return
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._flusher.join()
+        self._flusher = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # Every record_* method returns the record's sequence number. With sync_commit it
+    # waits until the record is on disk, unless wait=False: then await wait_durable()
+    # (or call block_until_durable()) with the returned number before acknowledging
+    # the change.
+
+    def record_create(self, session: GameSession, *, wait: bool = True) -> int:
+        return self._append(EVENT_CREATE, encode_session(session), wait)
+
+    def record_creates(self, sessions: Iterable[GameSession], *, wait: bool = True) -> int:
+        """record_create for many sessions, waiting for one fsync instead of one each."""
+        records = []
+        for session in sessions:
+            payload = encode_session(session)
+            records.append(_RECORD.pack(len(payload), zlib.crc32(payload), EVENT_CREATE) + payload)
+        return self._append_records(records, wait)
+
+    def record_flip(
+        self, session: GameSession, card_index: int, now: float, *, wait: bool = True
+    ) -> int:
+        return self._append(
+            EVENT_FLIP,
+            _game_id_prefix(session.game_id) + _FLIP.pack(session.version, card_index, now),
+            wait,
+        )
+
+    def record_turn(
+        self,
+        session: GameSession,
+        first_index: int,
+        second_index: int,
+        now: float,
+        *,
+        wait: bool = True,
+    ) -> int:
+        return self._append(
+            EVENT_TURN,
+            _game_id_prefix(session.game_id)
+            + _TURN.pack(session.version, first_index, second_index, now),
+            wait,
+        )
+
+    def record_restart(self, session: GameSession, now: float, *, wait: bool = True) -> int:
+        codes = session.board.codes
+        return self._append(
+            EVENT_RESTART,
+            _game_id_prefix(session.game_id)
+            + _RESTART.pack(session.version, now, len(codes))
+            + codes,
+            wait,
+        )
+
+    def record_expire(self, session: GameSession, *, wait: bool = True) -> int:
+        return self._append(
+            EVENT_EXPIRE, _game_id_prefix(session.game_id) + _EXPIRE.pack(session.version), wait
+        )
+
+    def block_until_durable(self, lsn: int) -> None:
+        """Block the calling thread until record lsn is on disk (sync_commit only)."""
+        if not self._sync_commit:
+            return
+        with self._cond:
+            self._wait_durable_locked(lsn)
+
+    async def wait_durable(self, lsn: int) -> None:
+        """Wait, without blocking the event loop, until record lsn is on disk (sync_commit only)."""
+        if not self._sync_commit:
+            return
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            if self._durable >= lsn:
+                return
+            if self._error is not None:
+                raise JournalError("Journal flusher failed") from self._error
+            future = loop.create_future()
+            self._async_waiters.append((lsn, loop, future))
+        await future
+
+    def _append(self, kind: int, payload: bytes, wait: bool) -> int:
+        return self._append_records(
+            [_RECORD.pack(len(payload), zlib.crc32(payload), kind) + payload], wait
+        )
+
+    def _append_records(self, records: list[bytes], wait: bool) -> int:
+        with self._cond:
+            if self._error is not None:
+                raise JournalError("Journal flusher failed") from self._error
+            self._buffer.extend(records)
+            self._appended += len(records)
+            self._events_since_snapshot += len(records)
+            lsn = self._appended
+            self._cond.notify_all()
+            if self._sync_commit and wait:
+                self._wait_durable_locked(lsn)
+            return lsn
+
+    def _wait_durable_locked(self, lsn: int) -> None:
+        # Called with self._cond held.
+        while self._durable < lsn:
+            if self._error is not None:
+                raise JournalError("Journal flusher failed") from self._error
+            self._cond.wait()
+
+    def _wake_async_waiters(self) -> None:
+        # Called with self._cond held, after _durable advanced or the flusher failed.
+        error = self._error
+        pending = []
+        for waiter in self._async_waiters:
+            lsn, loop, future = waiter
+            if error is None and lsn > self._durable:
+                pending.append(waiter)
+                continue
+            exc = None if error is None else JournalError("Journal flusher failed")
+            try:
+                loop.call_soon_threadsafe(_resolve, future, exc)
+            except RuntimeError:
+                pass  # the waiter's loop is closed
+        self._async_waiters = pending
+
+    def _open_segment(self, seq: int) -> BinaryIO:
+        return open(os.path.join(self._dir, _SEGMENT.format(seq)), "ab", buffering=0)
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._buffer and self._rotate_to is None and not self._closing:
+                    self._cond.wait()
+                batch, self._buffer = self._buffer, []
+                target = self._appended
+                rotate_to = self._rotate_to
+                closing = self._closing
+            try:
+                if batch:
+                    self._file.write(b"".join(batch))
+                    os.fsync(self._file.fileno())
+                if rotate_to is not None:
+                    self._file.close()
+                    self._file = self._open_segment(rotate_to)
+            except BaseException as exc:
+                logger.exception("Game journal write failed")
+                with self._cond:
+                    self._error = exc
+                    self._wake_async_waiters()
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._durable = target
+                if self._async_waiters:
+                    self._wake_async_waiters()
+                if rotate_to is not None:
+                    self._segment_seq = rotate_to
+                    self._rotate_to = None
+                self._cond.notify_all()
+                if closing and not self._buffer:
+                    return
+
+    # --- Snapshots ---
+
+    def rotate(self) -> int:
+        """
+        Switch appends to a new segment and return its number. Every record appended
+        before this call is in an older segment or the new one.
+        """
+        with self._cond:
+            seq = self._segment_seq + 1
+            self._rotate_to = seq
+            self._cond.notify_all()
+            while self._rotate_to is not None:
+                if self._error is not None:
+                    raise JournalError("Journal flusher failed") from self._error
+                self._cond.wait()
+            self._events_since_snapshot = 0
+        return seq
+
+    def write_snapshot(self, seq: int, sessions: Iterable[bytes]) -> None:
+        """
+        Durably write encoded sessions captured after rotate() returned seq, then drop
+        the segments and snapshots the new snapshot supersedes.
+        """
+        write_snapshot(os.path.join(self._dir, _SNAPSHOT.format(seq)), sessions)
+        superseded = _list_files(self._dir, _SEGMENT) + _list_files(self._dir, _SNAPSHOT)
+        for old_seq, old_path in superseded:
+            if old_seq < seq:
+                os.remove(old_path)
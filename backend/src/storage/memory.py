@@ -1,18 +1,227 @@
-from src.domain.types import GameSession
-from src.storage.repository import GameRepository
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
 
+from src.domain.types import GameSession, GameStatus
+from src.errors import VersionConflict
+from src.locks import StripedLock
+from src.skip_list import SkipList
+from src.storage.repository import (
+    EvictingGameRepository,
+    IndexName,
+    RetentionPolicy,
+    StoreStats,
+    status_counts,
+)
+from src.storage.timing_wheel import TimingWheel
 
-class MemoryGameRepository(GameRepository):
-    """In-memory store for game sessions, keyed by game_id."""
+# One skip list of game ids per indexed value (values are None: it is used as a sorted set).
+_Index = dict[str, SkipList[str, None]]
 
-    def __init__(self) -> None:
+
+class MemoryGameRepository(EvictingGameRepository):
+    """
+    In-memory store for game sessions, keyed by game_id.
+    Writes to one game are serialized by a striped per-game lock; compare-and-swap
+    checks run against the last committed version, kept apart from the session
+    object because callers mutate stored sessions in place before saving.
+    With a RetentionPolicy, every session has an expiry deadline in a timing wheel
+    and sweep() evicts the ones that are due.
+    The user_name and status indexes keep each value's game ids in a skip list,
+    updated on save only when a game's indexed values change.
+    """
+
+    def __init__(
+        self,
+        retention: RetentionPolicy | None = None,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         self._store: dict[str, GameSession] = {}
+        self._versions: dict[str, int] = {}
+        self._retention = retention
+        self._clock = clock
+        self._locks = StripedLock()
+        self._wheel_lock = threading.Lock()
+        self._wheel = TimingWheel(start=clock())
+        self._deadlines: dict[str, float] = {}  # guarded by the game's lock
+        self._finished: set[str] = set()  # ids scheduled with the finished TTL
+        self._evicted_finished = 0
+        self._evicted_idle = 0
+        self._indexes: dict[IndexName, _Index] = {"user_name": {}, "status": {}}
+        # Each game's indexed values, in the order of _indexes; guarded by the game's lock.
+        self._indexed: dict[str, tuple[str, GameStatus]] = {}
+        self._index_lock = threading.Lock()
+
+    def save(self, session: GameSession, *, expected_version: int | None = None) -> None:
+        game_id = session.game_id
+        with self._locks(game_id):
+            if expected_version is not None:
+                current = self._versions.get(game_id)
+                if current != expected_version:
+                    raise VersionConflict(game_id, expected_version, current)
+            self._store[game_id] = session
+            self._versions[game_id] = session.version
+            self._index(game_id, (session.user_name, session.status))
+            if self._retention is not None:
+                self._schedule(session)
 
-    def save(self, session: GameSession) -> None:
-        self._store[session.game_id] = session
+    def save_many(self, sessions: Sequence[GameSession]) -> None:
+        for session in sessions:
+            self.save(session)
+
+    def load(self, sessions: Iterable[GameSession]) -> None:
+        """
+        Fill an empty store in bulk before it serves anything (e.g. from a snapshot).
+        No game locks are taken, deadlines go into the timing wheel under one hold of
+        its lock, and each index value's skip list is built from its sorted ids in
+        O(n) rather than by one O(log n) insert per game.
+        """
+        if self._store:
+            raise ValueError("load() needs an empty store")
+        for session in sessions:
+            game_id = session.game_id
+            self._store[game_id] = session
+            self._versions[game_id] = session.version
+            self._indexed[game_id] = (session.user_name, session.status)
+        with self._index_lock:
+            for position, name in enumerate(self._indexes):
+                groups: dict[str, list[str]] = {}
+                for game_id, values in self._indexed.items():
+                    groups.setdefault(values[position], []).append(game_id)
+                self._indexes[name] = {
+                    value: SkipList.from_sorted((game_id, None) for game_id in sorted(game_ids))
+                    for value, game_ids in groups.items()
+                }
+        if self._retention is None:
+            return
+        finished_deadline = self._clock() + self._retention.finished_ttl_seconds
+        for game_id, session in self._store.items():
+            if session.status == "playing":
+                self._deadlines[game_id] = self._idle_deadline(session)
+            else:
+                self._deadlines[game_id] = finished_deadline
+        with self._wheel_lock:
+            for game_id, deadline in self._deadlines.items():
+                self._wheel.schedule(game_id, deadline)
+            self._finished.update(
+                game_id for game_id, session in self._store.items() if session.status != "playing"
+            )
 
     def find_by_id(self, game_id: str) -> GameSession | None:
         return self._store.get(game_id)
 
+    def game_ids(self) -> list[str]:
+        return list(self._store)
+
+    def find_ids_by(
+        self, index: IndexName, value: str, *, after: str | None = None, limit: int
+    ) -> list[str]:
+        with self._index_lock:
+            game_ids = self._indexes[index].get(value)
+            if game_ids is None:
+                return []
+            if after is None:
+                return [game_id for game_id, _ in game_ids.first(limit)]
+            return [game_id for game_id, _ in game_ids.after(after, limit)]
+
     def delete(self, game_id: str) -> None:
-        self._store.pop(game_id, None)
+        with self._locks(game_id):
+            self._store.pop(game_id, None)
+            self._versions.pop(game_id, None)
+            self._index(game_id, None)
+            self._deadlines.pop(game_id, None)
+            with self._wheel_lock:
+                self._wheel.cancel(game_id)
+                self._finished.discard(game_id)
+
+    def sweep(self, now: float | None = None) -> int:
+        """Evict every session whose retention deadline has passed. Returns the count."""
+        if now is None:
+            now = self._clock()
+        with self._wheel_lock:
+            expired = self._wheel.advance(now)
+            finished = [game_id in self._finished for game_id in expired]
+            self._finished.difference_update(expired)
+        # Take game locks only after releasing the wheel lock (save() nests them the other way).
+        evicted = 0
+        for game_id, was_finished in zip(expired, finished):
+            with self._locks(game_id):
+                if game_id in self._wheel:
+                    continue  # rescheduled by a save since it expired
+                if self._store.pop(game_id, None) is None:
+                    continue
+                self._versions.pop(game_id, None)
+                self._deadlines.pop(game_id, None)
+                self._index(game_id, None)
+            evicted += 1
+            if was_finished:
+                self._evicted_finished += 1
+            else:
+                self._evicted_idle += 1
+        return evicted
+
+    def stats(self) -> StoreStats:
+        return StoreStats(
+            size=len(self._store),
+            evicted_finished=self._evicted_finished,
+            evicted_idle=self._evicted_idle,
+        )
+
+    def count_by_status(self) -> dict[GameStatus, int]:
+        counts = status_counts(())
+        with self._index_lock:
+            for status, game_ids in self._indexes["status"].items():
+                counts[status] = len(game_ids)
+        return counts
+
+    def _index(self, game_id: str, values: tuple[str, GameStatus] | None) -> None:
+        """Move game_id to the index entries for values (None: out of every index).
+        Called under the game's lock."""
+        previous = self._indexed.get(game_id)
+        if previous == values:
+            return
+        if values is None:
+            del self._indexed[game_id]
+        else:
+            self._indexed[game_id] = values
+        with self._index_lock:
+            for position, index in enumerate(self._indexes.values()):
+                old = None if previous is None else previous[position]
+                new = None if values is None else values[position]
+                if old == new:
+                    continue
+                if old is not None:
+                    game_ids = index[old]
+                    game_ids.remove(game_id)
+                    if not game_ids:
+                        del index[old]
+                if new is not None:
+                    game_ids = index.get(new)
+                    if game_ids is None:
+                        game_ids = index[new] = SkipList()
+                    game_ids.insert(game_id, None)
+
+    def _schedule(self, session: GameSession) -> None:
+        # Called under the game's lock; the wheel lock is only taken when the deadline moves.
+        game_id = session.game_id
+        if session.status == "playing":
+            deadline = self._idle_deadline(session)
+            if self._deadlines.get(game_id) != deadline:
+                self._deadlines[game_id] = deadline
+                with self._wheel_lock:
+                    self._finished.discard(game_id)
+                    self._wheel.schedule(game_id, deadline)
+        elif game_id not in self._finished:
+            deadline = self._clock() + self._retention.finished_ttl_seconds
+            self._deadlines[game_id] = deadline
+            with self._wheel_lock:
+                self._finished.add(game_id)
+                self._wheel.schedule(game_id, deadline)
+
+    def _idle_deadline(self, session: GameSession) -> float:
+        return (
+            session.started_at
+            + session.settings.countdown_seconds
+            + self._retention.idle_ttl_seconds
+        )
@@ -1,17 +1,111 @@
-from typing import Protocol
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Literal, Protocol, get_args
 
-from src.domain.types import GameSession
+from src.domain.types import GameSession, GameStatus
+
+
+# Secondary indexes every repository keeps: session field -> ids of the games holding a value.
+IndexName = Literal["user_name", "status"]
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How long sessions are kept once nobody can play them any more."""
+    finished_ttl_seconds: float  # after the game is won or lost
+    idle_ttl_seconds: float  # after the countdown of a game still marked playing
+
+
+@dataclass(frozen=True)
+class StoreStats:
+    """Store size and eviction counters for monitoring."""
+    size: int
+    evicted_finished: int
+    evicted_idle: int
+
+
+def status_counts(statuses: Iterable[GameStatus]) -> dict[GameStatus, int]:
+    """Number of sessions per status, with every status present."""
+    counts = dict.fromkeys(get_args(GameStatus), 0)
+    for status in statuses:
+        counts[status] += 1
+    return counts
 
 
 class GameRepository(Protocol):
-    def save(self, session: GameSession) -> None:
-        """Create or update a game session."""
+    def save(self, session: GameSession, *, expected_version: int | None = None) -> None:
+        """
+        Create or update a game session.
+        With expected_version, save only if the stored version equals it (compare-and-swap),
+        otherwise raise VersionConflict. The stored version becomes session.version.
+        """
+        ...
+
+    def save_many(self, sessions: Sequence[GameSession]) -> None:
+        """Create or update many sessions in one operation (no version checks)."""
         ...
 
     def find_by_id(self, game_id: str) -> GameSession | None:
         """Return the session for the given game_id, or None if not found."""
         ...
 
+    def game_ids(self) -> list[str]:
+        """Return the ids of all stored sessions."""
+        ...
+
     def delete(self, game_id: str) -> None:
         """Remove the session for the given game_id (no-op if not present)."""
         ...
+
+    def find_ids_by(
+        self, index: IndexName, value: str, *, after: str | None = None, limit: int
+    ) -> list[str]:
+        """
+        Up to limit ids of the games whose index field equals value, in game_id order,
+        starting after the id after (the cursor from the previous page).
+        The index follows save and delete, so the cost grows with the page, not the store.
+        """
+        ...
+
+
+class AsyncGameRepository(Protocol):
+    """GameRepository for the event loop: the same operations and semantics, awaited."""
+
+    async def save(self, session: GameSession, *, expected_version: int | None = None) -> None:
+        ...
+
+    async def save_many(self, sessions: Sequence[GameSession]) -> None:
+        ...
+
+    async def find_by_id(self, game_id: str) -> GameSession | None:
+        ...
+
+    async def game_ids(self) -> list[str]:
+        ...
+
+    async def delete(self, game_id: str) -> None:
+        ...
+
+    async def find_ids_by(
+        self, index: IndexName, value: str, *, after: str | None = None, limit: int
+    ) -> list[str]:
+        ...
+
+
+class EvictingGameRepository(GameRepository, Protocol):
+    """A repository that expires sessions according to a RetentionPolicy."""
+
+    def sweep(self, now: float | None = None) -> int:
+        """Evict every session whose retention deadline has passed. Returns the count."""
+        ...
+
+    def stats(self) -> StoreStats:
+        """Current store size and eviction counters."""
+        ...
+
+    def count_by_status(self) -> dict[GameStatus, int]:
+        """
+        Stored sessions per status. Games whose countdown ran out are counted as
+        playing until they are next read or written.
+        """
+        ...
@@ -0,0 +1,446 @@
+import fcntl
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import get_args
+
+from src.domain.types import GameSession, GameStatus
+from src.errors import StoreFull, VersionConflict
+from src.storage.codec import (
+    decode_session,
+    encode_session,
+    peek_game_id,
+    peek_status,
+    peek_user_name,
+    peek_version,
+)
+from src.storage.repository import (
+    EvictingGameRepository,
+    IndexName,
+    RetentionPolicy,
+    StoreStats,
+    status_counts,
+)
+
+_MAGIC = b"MGSLOT02"
+# magic, slot count, slot bytes, stored sessions, evicted finished, evicted idle
+_HEADER = struct.Struct("<8sIIQQQ")
+_SIZE_FIELD = 3
+_EVICTED_FINISHED_FIELD = 4
+_EVICTED_IDLE_FIELD = 5
+_HEADER_BYTES = 64  # the header, then the first entry of each status's chain
+# key hash, expires_at (NaN without a retention policy), state, status code
+_ENTRY = struct.Struct("<QdBB6x")
+_ENTRY_STATE = 16  # offset of the state byte
+# Then the previous and next entry in a chain: of the same user's games, then of the
+# games with the same status.
+_LINK = struct.Struct("<II")
+_USER_CHAIN = 0
+_STATUS_CHAIN = 1
+_ENTRY_ROW = struct.Struct(f"{_ENTRY.format}{2 * _LINK.size}x")
+# user name hash, first entry of the user's chain, state (as for entries)
+_USER = struct.Struct("<QIB3x")
+_USER_HEAD = 8  # offset of the first entry
+_USER_STATE = 12
+_U32 = struct.Struct("<I")
+_NONE = 0xFFFFFFFF  # no entry: the end of a chain
+_LENGTH = struct.Struct("<I")  # encoded session length, at the start of each slot
+
+_STATUSES: tuple[GameStatus, ...] = get_args(GameStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_PLAYING = _STATUS_CODES["playing"]
+
+_EMPTY = 0
+_USED = 1
+_DELETED = 2  # tombstone: probing continues past it, inserts reuse it
+
+# Stored sessions per slot at most, so linear probes stay short.
+_MAX_LOAD = 0.75
+
+_STRIPES = 256
+_INDEX_LOCK = _STRIPES  # guards allocating and freeing entries, users, chains, the header
+_LOCK_BASE = 1 << 40  # fcntl lock bytes live far past the end of the data
+
+
+def _key(game_id: str) -> int:
+    # hash() is salted per process; every process must probe from the same place.
+    return int.from_bytes(hashlib.blake2b(game_id.encode(), digest_size=8).digest(), "little")
+
+
+class SharedMemoryGameRepository(EvictingGameRepository):
+    """
+    Game sessions in a memory-mapped file that every process on the host opening the
+    same path shares (e.g. the workers of uvicorn --workers N), so any worker can
+    serve any game. Games survive restarts as long as the file does.
+
+    The file holds a header, an index of fixed-size entries, a table of users and a
+    fixed-size slot per entry holding one session in the src/storage/codec.py format.
+    A game's entry is found by linear probing from a stable hash of its id; freed
+    entries become tombstones, cleared once the run they end reaches an empty entry.
+    The users table is probed the same way by a hash of the user name.
+
+    find_ids_by walks a chain of entries linked in the file, so it costs O(matching
+    games) in any process: each user's bucket and the header point to the first entry
+    of a doubly linked chain of that user's games or of the games with a status.
+
+    Work on one game is serialized by a lock stripe: a thread lock within the process
+    plus an fcntl byte-range lock across processes. Allocating and freeing entries
+    (and the header counters, users and chains) take one more such lock, always after
+    the stripe's.
+    Sessions are decoded into private copies, so concurrent writers in different
+    processes are kept apart by the compare-and-swap check against the slot's version.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        retention: RetentionPolicy | None = None,
+        *,
+        slots: int = 65_536,
+        slot_bytes: int = 512,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._retention = retention
+        self._clock = clock
+        self._slots = slots
+        self._slot_bytes = slot_bytes
+        self._max_size = int(slots * _MAX_LOAD)
+        self._index_offset = _HEADER_BYTES
+        self._users_offset = _HEADER_BYTES + slots * _ENTRY_ROW.size
+        self._slots_offset = -(-(self._users_offset + slots * _USER.size) // 64) * 64
+        self._thread_locks = tuple(threading.Lock() for _ in range(_STRIPES + 1))
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        file_size = self._slots_offset + slots * slot_bytes
+        with self._locked(_INDEX_LOCK):
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, file_size)
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, slots, slot_bytes, 0, 0, 0), 0)
+                heads = _U32.pack(_NONE) * len(_STATUS_CODES)
+                os.pwrite(self._fd, heads, _HEADER.size)
+            magic, stored_slots, stored_slot_bytes, *_ = _HEADER.unpack(
+                os.pread(self._fd, _HEADER.size, 0)
+            )
+        if (magic, stored_slots, stored_slot_bytes) != (_MAGIC, slots, slot_bytes):
+            os.close(self._fd)
+            raise ValueError(
+                f"{path} is not a game slot file with {slots} slots of {slot_bytes} bytes"
+            )
+        self._map = mmap.mmap(self._fd, file_size)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+    def save(self, session: GameSession, *, expected_version: int | None = None) -> None:
+        game_id = session.game_id
+        key = _key(game_id)
+        data = encode_session(session)
+        if _LENGTH.size + len(data) > self._slot_bytes:
+            raise StoreFull(f"Game {game_id} does not fit in a {self._slot_bytes}-byte slot")
+        with self._locked(key % _STRIPES):
+            index = self._find(game_id, key)
+            if expected_version is not None:
+                current = None
+                if index is not None:
+                    current = peek_version(self._map, self._slot(index) + _LENGTH.size)
+                if current != expected_version:
+                    raise VersionConflict(game_id, expected_version, current)
+            if index is None:
+                with self._locked(_INDEX_LOCK):
+                    index = self._allocate(key)
+                    self._write(index, key, session, data, previous=None)
+                    user = self._user_bucket(session.user_name, create=True)
+                    self._push(user + _USER_HEAD, index, _USER_CHAIN)
+                    self._push(self._status_head(session.status), index, _STATUS_CHAIN)
+                return
+            previous = self._entry(index)
+            if previous[3] == _STATUS_CODES[session.status]:
+                self._write(index, key, session, data, previous)
+                return
+            with self._locked(_INDEX_LOCK):
+                self._unlink(self._status_head(_STATUSES[previous[3]]), index, _STATUS_CHAIN)
+                self._write(index, key, session, data, previous)
+                self._push(self._status_head(session.status), index, _STATUS_CHAIN)
+
+    def save_many(self, sessions: Sequence[GameSession]) -> None:
+        for session in sessions:
+            self.save(session)
+
+    def find_by_id(self, game_id: str) -> GameSession | None:
+        key = _key(game_id)
+        with self._locked(key % _STRIPES):
+            index = self._find(game_id, key)
+            if index is None:
+                return None
+            session, _ = decode_session(self._map, self._slot(index) + _LENGTH.size)
+            return session
+
+    def game_ids(self) -> list[str]:
+        game_ids = []
+        for index, key, _ in self._used_entries():
+            with self._locked(key % _STRIPES):
+                entry_key, _, state, _ = self._entry(index)
+                if entry_key == key and state == _USED:
+                    game_ids.append(peek_game_id(self._map, self._slot(index) + _LENGTH.size))
+        return game_ids
+
+    def find_ids_by(
+        self, index: IndexName, value: str, *, after: str | None = None, limit: int
+    ) -> list[str]:
+        """
+        Walks the chain of the user's games, or of the games with the status, so a
+        page costs O(matching games): chains are unordered, and only the ids are read.
+        """
+        game_ids = []
+        with self._locked(_INDEX_LOCK):
+            if index == "user_name":
+                user = self._user_bucket(value, create=False)
+                head = None if user is None else user + _USER_HEAD
+                chain = _USER_CHAIN
+            else:
+                head = self._status_head(value) if value in _STATUS_CODES else None
+                chain = _STATUS_CHAIN
+            entry = _NONE if head is None else _U32.unpack_from(self._map, head)[0]
+            while entry != _NONE:
+                offset = self._slot(entry) + _LENGTH.size
+                # Users whose names share a hash share a chain.
+                if chain == _STATUS_CHAIN or peek_user_name(self._map, offset) == value:
+                    game_id = peek_game_id(self._map, offset)
+                    if after is None or game_id > after:
+                        game_ids.append(game_id)
+                entry = _LINK.unpack_from(self._map, self._link(entry, chain))[1]
+        return heapq.nsmallest(limit, game_ids)
+
+    def delete(self, game_id: str) -> None:
+        key = _key(game_id)
+        with self._locked(key % _STRIPES):
+            index = self._find(game_id, key)
+            if index is not None:
+                with self._locked(_INDEX_LOCK):
+                    self._free(index)
+
+    def sweep(self, now: float | None = None) -> int:
+        """Evict every session whose retention deadline has passed. Returns the count."""
+        if now is None:
+            now = self._clock()
+        evicted = 0
+        for index, key, expires_at in self._used_entries():
+            if not expires_at <= now:
+                continue
+            with self._locked(key % _STRIPES):
+                entry_key, expires_at, state, status = self._entry(index)
+                if entry_key != key or state != _USED or not expires_at <= now:
+                    continue  # saved or replaced since the scan
+                with self._locked(_INDEX_LOCK):
+                    self._free(index)
+                    self._add_to_header(
+                        _EVICTED_IDLE_FIELD if status == _PLAYING else _EVICTED_FINISHED_FIELD,
+                        1,
+                    )
+            evicted += 1
+        return evicted
+
+    def stats(self) -> StoreStats:
+        _, _, _, size, evicted_finished, evicted_idle = _HEADER.unpack_from(self._map, 0)
+        return StoreStats(size=size, evicted_finished=evicted_finished, evicted_idle=evicted_idle)
+
+    def count_by_status(self) -> dict[GameStatus, int]:
+        statuses = []
+        for index, key, _ in self._used_entries():
+            with self._locked(key % _STRIPES):
+                entry_key, _, state, _ = self._entry(index)
+                if entry_key == key and state == _USED:
+                    statuses.append(peek_status(self._map, self._slot(index) + _LENGTH.size))
+        return status_counts(statuses)
+
+    # --- Slots and index ---
+
+    @contextmanager
+    def _locked(self, lock: int) -> Iterator[None]:
+        with self._thread_locks[lock]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, _LOCK_BASE + lock)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, _LOCK_BASE + lock)
+
+    def _slot(self, index: int) -> int:
+        return self._slots_offset + index * self._slot_bytes
+
+    def _entry(self, index: int) -> tuple[int, float, int, int]:
+        return _ENTRY.unpack_from(self._map, self._index_offset + index * _ENTRY_ROW.size)
+
+    def _find(self, game_id: str, key: int) -> int | None:
+        """The entry holding game_id (caller holds its stripe lock), or None."""
+        entry = _ENTRY.unpack_from
+        mapped = self._map
+        index = key % self._slots
+        for _ in range(self._slots):
+            entry_key, _, state, _ = entry(mapped, self._index_offset + index * _ENTRY_ROW.size)
+            if state == _EMPTY:
+                return None
+            if (
+                state == _USED
+                and entry_key == key
+                and peek_game_id(mapped, self._slot(index) + _LENGTH.size) == game_id
+            ):
+                return index
+            index = (index + 1) % self._slots
+        return None
+
+    def _allocate(self, key: int) -> int:
+        """A free entry on key's probe path (caller holds the index lock)."""
+        if _HEADER.unpack_from(self._map, 0)[_SIZE_FIELD] >= self._max_size:
+            raise StoreFull()
+        index = key % self._slots
+        while self._entry(index)[2] == _USED:
+            index = (index + 1) % self._slots
+        self._add_to_header(_SIZE_FIELD, 1)
+        return index
+
+    def _write(
+        self,
+        index: int,
+        key: int,
+        session: GameSession,
+        data: bytes,
+        previous: tuple[int, float, int, int] | None,
+    ) -> None:
+        # The slot is written before the entry, and the entry's state byte is part of
+        # one pack_into, so a prober never sees a used entry without its session.
+        slot = self._slot(index)
+        self._map[slot:slot + _LENGTH.size + len(data)] = _LENGTH.pack(len(data)) + data
+        status = _STATUS_CODES[session.status]
+        expires_at = self._expires_at(session, previous)
+        _ENTRY.pack_into(
+            self._map,
+            self._index_offset + index * _ENTRY_ROW.size,
+            key,
+            expires_at,
+            _USED,
+            status,
+        )
+
+    def _free(self, index: int) -> None:
+        """Tombstone the entry (caller holds its stripe lock and the index lock)."""
+        status = self._entry(index)[3]
+        user = self._user_bucket(
+            peek_user_name(self._map, self._slot(index) + _LENGTH.size), create=False
+        )
+        self._unlink(user + _USER_HEAD, index, _USER_CHAIN)
+        if _U32.unpack_from(self._map, user + _USER_HEAD)[0] == _NONE:
+            _USER.pack_into(self._map, user, 0, _NONE, _DELETED)
+            bucket = (user - self._users_offset) // _USER.size
+            self._clear_tombstones(self._users_offset + _USER_STATE, _USER.size, bucket)
+        self._unlink(self._status_head(_STATUSES[status]), index, _STATUS_CHAIN)
+        offset = self._index_offset + index * _ENTRY_ROW.size
+        _ENTRY.pack_into(self._map, offset, 0, math.nan, _DELETED, 0)
+        self._add_to_header(_SIZE_FIELD, -1)
+        self._clear_tombstones(self._index_offset + _ENTRY_STATE, _ENTRY_ROW.size, index)
+
+    def _clear_tombstones(self, state: int, stride: int, index: int) -> None:
+        """
+        Empty the run of tombstones ending at index in a table whose state bytes are
+        stride apart from offset state, if an empty entry follows the run: such a run
+        is not on any probe path.
+        """
+        mapped = self._map
+        if mapped[state + (index + 1) % self._slots * stride] != _EMPTY:
+            return
+        while mapped[state + index * stride] == _DELETED:
+            mapped[state + index * stride] = _EMPTY
+            index = (index - 1) % self._slots
+
+    def _used_entries(self) -> list[tuple[int, int, float]]:
+        """(index, key, expires_at) of every used entry, read without locks."""
+        index_bytes = self._map[
+            self._index_offset:self._index_offset + self._slots * _ENTRY_ROW.size
+        ]
+        return [
+            (index, key, expires_at)
+            for index, (key, expires_at, state, _) in enumerate(
+                _ENTRY_ROW.iter_unpack(index_bytes)
+            )
+            if state == _USED
+        ]
+
+    # --- Chains ---
+
+    def _status_head(self, status: GameStatus) -> int:
+        """Offset of the first entry of the chain of games with status."""
+        return _HEADER.size + _STATUS_CODES[status] * _U32.size
+
+    def _link(self, index: int, chain: int) -> int:
+        """Offset of the entry's (previous, next) pair in chain."""
+        return self._index_offset + index * _ENTRY_ROW.size + _ENTRY.size + chain * _LINK.size
+
+    def _push(self, head: int, index: int, chain: int) -> None:
+        """Put the entry first in the chain whose first entry is at offset head."""
+        first = _U32.unpack_from(self._map, head)[0]
+        _LINK.pack_into(self._map, self._link(index, chain), _NONE, first)
+        if first != _NONE:
+            _U32.pack_into(self._map, self._link(first, chain), index)
+        _U32.pack_into(self._map, head, index)
+
+    def _unlink(self, head: int, index: int, chain: int) -> None:
+        """Take the entry out of the chain whose first entry is at offset head."""
+        previous, following = _LINK.unpack_from(self._map, self._link(index, chain))
+        if previous == _NONE:
+            _U32.pack_into(self._map, head, following)
+        else:
+            _U32.pack_into(self._map, self._link(previous, chain) + _U32.size, following)
+        if following != _NONE:
+            _U32.pack_into(self._map, self._link(following, chain), previous)
+
+    def _user_bucket(self, user_name: str, *, create: bool) -> int | None:
+        """
+        Offset of user_name's bucket in the users table, added with an empty chain
+        when create is set (None otherwise, if the user has no games stored).
+        """
+        key = _key(user_name)
+        index = key % self._slots
+        free = None
+        for _ in range(self._slots):
+            offset = self._users_offset + index * _USER.size
+            bucket_key, _, state = _USER.unpack_from(self._map, offset)
+            if state == _USED and bucket_key == key:
+                return offset
+            if state != _USED and free is None:
+                free = offset
+            if state == _EMPTY:
+                break
+            index = (index + 1) % self._slots
+        if not create:
+            return None
+        # Users have a stored game each, so the table is never more than 75% used.
+        _USER.pack_into(self._map, free, key, _NONE, _USED)
+        return free
+
+    def _add_to_header(self, field: int, delta: int) -> None:
+        # Caller holds the index lock.
+        header = list(_HEADER.unpack_from(self._map, 0))
+        header[field] += delta
+        _HEADER.pack_into(self._map, 0, *header)
+
+    def _expires_at(
+        self, session: GameSession, previous: tuple[int, float, int, int] | None
+    ) -> float:
+        retention = self._retention
+        if retention is None:
+            return math.nan
+        if session.status == "playing":
+            return (
+                session.started_at
+                + session.settings.countdown_seconds
+                + retention.idle_ttl_seconds
+            )
+        if previous is not None and previous[3] != _PLAYING:
+            return previous[1]  # a finished game keeps the expiry it got when it finished
+        return self._clock() + retention.finished_ttl_seconds
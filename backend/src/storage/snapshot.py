@@ -0,0 +1,112 @@
+import gc
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from src.domain.game import apply_countdown_in_place
+from src.domain.types import GameSession
+from src.storage.codec import decode_session
+from src.storage.memory import MemoryGameRepository
+
+# A snapshot file: this header, then each session in the src/storage/codec.py format
+# after its length. The journal writes its checkpoints in the same format.
+_HEADER = struct.Struct("<8sQ")  # magic, session count
+_MAGIC = b"MGSNAP01"
+_LENGTH = struct.Struct("<I")
+
+
+@dataclass(frozen=True)
+class RestoreStats:
+    sessions: int
+    expired: int  # marked lost: their countdown ran out while nothing was serving them
+    seconds: float
+
+
+def write_snapshot(path: str, sessions: Iterable[bytes]) -> int:
+    """
+    Durably replace the file at path with a snapshot of the encoded sessions: they are
+    written to a temporary file, fsynced and renamed over path, so a crash leaves
+    either the old snapshot or the new one. Returns the number of sessions written.
+    """
+    sessions = list(sessions)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(sessions)))
+        for encoded in sessions:
+            f.write(_LENGTH.pack(len(encoded)))
+            f.write(encoded)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+    return len(sessions)
+
+
+def read_snapshot(path: str) -> list[GameSession]:
+    """
+    Every session in the snapshot at path, decoded straight from a read-only memory
+    map of the file (slicing the map copies only the bytes each field needs).
+    Raises ValueError if path is not a snapshot or a record is cut short.
+    """
+    size = os.path.getsize(path)
+    if size < _HEADER.size:
+        raise ValueError(f"Not a snapshot file: {path}")
+    sessions = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, count = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"Not a snapshot file: {path}")
+        pos = _HEADER.size
+        for _ in range(count):
+            if pos + _LENGTH.size > size:
+                raise ValueError(f"Truncated snapshot file: {path}")
+            (length,) = _LENGTH.unpack_from(mm, pos)
+            pos += _LENGTH.size
+            end = pos + length
+            if end > size:
+                raise ValueError(f"Truncated snapshot file: {path}")
+            session, pos = decode_session(mm, pos)
+            if pos != end:
+                raise ValueError(f"Corrupt snapshot record at byte {end - length}: {path}")
+            sessions.append(session)
+    return sessions
+
+
+def restore_snapshot(
+    path: str, repository: MemoryGameRepository, *, now: float | None = None
+) -> RestoreStats:
+    """
+    Bulk-load the snapshot at path into an empty repository (nothing when there is
+    no file yet). Games whose countdown ran out since the snapshot was taken are
+    marked lost, with a version bump like any other change. Call before serving.
+    """
+    started = time.perf_counter()
+    if not os.path.exists(path):
+        return RestoreStats(sessions=0, expired=0, seconds=0.0)
+    if now is None:
+        now = time.time()
+    # Every object allocated here stays alive, so the cyclic collector's passes over
+    # the growing heap would find nothing while adding about a third to the load.
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        sessions = read_snapshot(path)
+        expired = 0
+        for session in sessions:
+            if apply_countdown_in_place(session, now=now):
+                session.version += 1
+                expired += 1
+        repository.load(sessions)
+    finally:
+        if collecting:
+            gc.enable()
+    return RestoreStats(
+        sessions=len(sessions), expired=expired, seconds=time.perf_counter() - started
+    )
@@ -0,0 +1,318 @@
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import get_args
+
+from src.domain.board import EMOJI_SYMBOLS, Board, CardSet
+from src.domain.game import intern_board
+from src.domain.types import GameSession, GameStatus, Settings
+from src.errors import VersionConflict
+from src.storage.repository import (
+    EvictingGameRepository,
+    IndexName,
+    RetentionPolicy,
+    StoreStats,
+    status_counts,
+)
+
+# Separator for symbol tables and custom card ids (never part of an emoji or id).
+_SEP = "\x1f"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS games (
+        game_id TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        user_name TEXT NOT NULL,
+        card_count INTEGER NOT NULL,
+        countdown_seconds INTEGER NOT NULL,
+        flip_back_delay_ms INTEGER NOT NULL,
+        max_bad_guesses INTEGER,
+        seed INTEGER,               -- shared-board seed, NULL for a random board
+        status TEXT NOT NULL,
+        started_at REAL NOT NULL,
+        turns INTEGER NOT NULL,
+        bad_guesses INTEGER NOT NULL,
+        board_codes BLOB NOT NULL,  -- one symbol code per card
+        board_symbols TEXT,         -- NULL for the default emoji table
+        card_ids TEXT,              -- NULL for canonical card-{i} ids
+        face_up BLOB NOT NULL,      -- little-endian bitset of card indices
+        matched BLOB NOT NULL,      -- little-endian bitset of card indices
+        expires_at REAL             -- retention deadline, NULL without a policy
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS games_expires_at ON games (expires_at) WHERE expires_at IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS games_user_name ON games (user_name, game_id)",
+    "CREATE INDEX IF NOT EXISTS games_status ON games (status, game_id)",
+)
+
+_DATA_COLUMNS = (
+    "version",
+    "user_name",
+    "card_count",
+    "countdown_seconds",
+    "flip_back_delay_ms",
+    "max_bad_guesses",
+    "seed",
+    "status",
+    "started_at",
+    "turns",
+    "bad_guesses",
+    "board_codes",
+    "board_symbols",
+    "card_ids",
+    "face_up",
+    "matched",
+)
+
+# A finished game keeps the expiry it got when it finished; anything else takes the new one.
+_KEEP_FINISHED_EXPIRY = (
+    "CASE WHEN games.status != 'playing' AND excluded.status != 'playing' "
+    "THEN games.expires_at ELSE excluded.expires_at END"
+)
+
+# Constant SQL strings: sqlite3 keeps them compiled in each connection's statement cache.
+_SELECT = f"SELECT {', '.join(_DATA_COLUMNS)} FROM games WHERE game_id = ?"
+_UPSERT = (
+    f"INSERT INTO games (game_id, {', '.join(_DATA_COLUMNS)}, expires_at) "
+    f"VALUES ({', '.join('?' * (len(_DATA_COLUMNS) + 2))}) "
+    "ON CONFLICT (game_id) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in _DATA_COLUMNS)
+    + f", expires_at = {_KEEP_FINISHED_EXPIRY}"
+)
+_UPDATE_IF_VERSION = (
+    "UPDATE games SET "
+    + ", ".join(f"{c} = ?" for c in _DATA_COLUMNS)
+    + ", expires_at = CASE WHEN status != 'playing' AND ? != 'playing' "
+    "THEN expires_at ELSE ? END "
+    "WHERE game_id = ? AND version = ?"
+)
+_SELECT_IDS = "SELECT game_id FROM games"
+# Range scans of the (value, game_id) indexes; every id sorts above "".
+_SELECT_IDS_BY: dict[IndexName, str] = {
+    index: f"SELECT game_id FROM games WHERE {index} = ? AND game_id > ? "
+    "ORDER BY game_id LIMIT ?"
+    for index in get_args(IndexName)
+}
+_SELECT_VERSION = "SELECT version FROM games WHERE game_id = ?"
+_DELETE = "DELETE FROM games WHERE game_id = ?"
+_DELETE_EXPIRED = "DELETE FROM games WHERE expires_at <= ? RETURNING status"
+_COUNT = "SELECT COUNT(*) FROM games"
+_COUNT_BY_STATUS = "SELECT status, COUNT(*) FROM games GROUP BY status"
+
+
+def _mask_to_bytes(mask: int, card_count: int) -> bytes:
+    return mask.to_bytes((card_count + 7) // 8, "little")
+
+
+class SqliteGameRepository(EvictingGameRepository):
+    """
+    SQLite-backed store for game sessions: one row per game, with the board kept as
+    a blob of symbol codes and the face-up/matched cards as bitset blobs.
+    Runs in WAL mode; each thread reuses its own connection, and the fixed SQL
+    statements stay prepared in that connection's statement cache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        retention: RetentionPolicy | None = None,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = path
+        self._retention = retention
+        self._clock = clock
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._evicted_finished = 0
+        self._evicted_idle = 0
+        conn = self._connection()
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._path,
+                isolation_level=None,  # autocommit: every save is one statement
+                check_same_thread=False,  # only so close() can close it
+                cached_statements=32,
+            )
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA busy_timeout = 5000")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def save(self, session: GameSession, *, expected_version: int | None = None) -> None:
+        data = self._encode(session)
+        expires_at = self._expires_at(session)
+        conn = self._connection()
+        if expected_version is None:
+            conn.execute(_UPSERT, (session.game_id, *data, expires_at))
+            return
+        cursor = conn.execute(
+            _UPDATE_IF_VERSION,
+            (*data, session.status, expires_at, session.game_id, expected_version),
+        )
+        if cursor.rowcount == 0:
+            current = conn.execute(_SELECT_VERSION, (session.game_id,)).fetchone()
+            raise VersionConflict(
+                session.game_id, expected_version, None if current is None else current[0]
+            )
+
+    def save_many(self, sessions: Sequence[GameSession]) -> None:
+        """Upsert all sessions in one transaction (one WAL commit instead of one per game)."""
+        rows = [
+            (session.game_id, *self._encode(session), self._expires_at(session))
+            for session in sessions
+        ]
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(_UPSERT, rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def find_by_id(self, game_id: str) -> GameSession | None:
+        row = self._connection().execute(_SELECT, (game_id,)).fetchone()
+        if row is None:
+            return None
+        return self._decode(game_id, row)
+
+    def game_ids(self) -> list[str]:
+        return [game_id for (game_id,) in self._connection().execute(_SELECT_IDS)]
+
+    def find_ids_by(
+        self, index: IndexName, value: str, *, after: str | None = None, limit: int
+    ) -> list[str]:
+        rows = self._connection().execute(_SELECT_IDS_BY[index], (value, after or "", limit))
+        return [game_id for (game_id,) in rows]
+
+    def delete(self, game_id: str) -> None:
+        self._connection().execute(_DELETE, (game_id,))
+
+    def sweep(self, now: float | None = None) -> int:
+        """Evict every session whose retention deadline has passed. Returns the count."""
+        if now is None:
+            now = self._clock()
+        statuses = self._connection().execute(_DELETE_EXPIRED, (now,)).fetchall()
+        for (status,) in statuses:
+            if status == "playing":
+                self._evicted_idle += 1
+            else:
+                self._evicted_finished += 1
+        return len(statuses)
+
+    def stats(self) -> StoreStats:
+        (size,) = self._connection().execute(_COUNT).fetchone()
+        return StoreStats(
+            size=size,
+            evicted_finished=self._evicted_finished,
+            evicted_idle=self._evicted_idle,
+        )
+
+    def count_by_status(self) -> dict[GameStatus, int]:
+        counts = status_counts(())
+        counts.update(self._connection().execute(_COUNT_BY_STATUS).fetchall())
+        return counts
+
+    def _expires_at(self, session: GameSession) -> float | None:
+        retention = self._retention
+        if retention is None:
+            return None
+        if session.status == "playing":
+            return (
+                session.started_at
+                + session.settings.countdown_seconds
+                + retention.idle_ttl_seconds
+            )
+        return self._clock() + retention.finished_ttl_seconds
+
+    @staticmethod
+    def _encode(session: GameSession) -> tuple:
+        """Values for _DATA_COLUMNS, in order."""
+        settings = session.settings
+        board = session.board
+        n_cards = len(board)
+        return (
+            session.version,
+            session.user_name,
+            settings.card_count,
+            settings.countdown_seconds,
+            settings.flip_back_delay_ms,
+            settings.max_bad_guesses,
+            settings.seed,
+            session.status,
+            session.started_at,
+            session.turns,
+            session.bad_guesses,
+            board.codes,
+            None if board.symbols is EMOJI_SYMBOLS else _SEP.join(board.symbols),
+            None if board.ids is None else _SEP.join(board.ids),
+            _mask_to_bytes(session.flipped_card_ids.mask, n_cards),
+            _mask_to_bytes(session.matched_card_ids.mask, n_cards),
+        )
+
+    @staticmethod
+    def _decode(game_id: str, row: tuple) -> GameSession:
+        (
+            version,
+            user_name,
+            card_count,
+            countdown_seconds,
+            flip_back_delay_ms,
+            max_bad_guesses,
+            seed,
+            status,
+            started_at,
+            turns,
+            bad_guesses,
+            codes,
+            symbols,
+            card_ids,
+            face_up,
+            matched,
+        ) = row
+        board = Board(
+            codes,
+            EMOJI_SYMBOLS if symbols is None else tuple(symbols.split(_SEP)),
+            None if card_ids is None else tuple(card_ids.split(_SEP)),
+        )
+        if seed is not None:
+            board = intern_board(seed, board)
+        return GameSession(
+            game_id=game_id,
+            user_name=user_name,
+            settings=Settings(
+                user_name=user_name,
+                card_count=card_count,
+                countdown_seconds=countdown_seconds,
+                flip_back_delay_ms=flip_back_delay_ms,
+                max_bad_guesses=max_bad_guesses,
+                seed=seed,
+            ),
+            board=board,
+            status=status,
+            started_at=started_at,
+            turns=turns,
+            bad_guesses=bad_guesses,
+            flipped_card_ids=CardSet(board, int.from_bytes(face_up, "little")),
+            matched_card_ids=CardSet(board, int.from_bytes(matched, "little")),
+            version=version,
+        )
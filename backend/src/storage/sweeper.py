@@ -0,0 +1,15 @@
+import asyncio
+import logging
+
+from src.storage.repository import EvictingGameRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def run_sweeper(repository: EvictingGameRepository, interval_seconds: float) -> None:
+    """Evict expired sessions every interval_seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        evicted = repository.sweep()
+        if evicted:
+            logger.debug("Evicted %d expired game sessions", evicted)
@@ -0,0 +1,64 @@
+class TimingWheel:
+    """
+    Hashed timing wheel of deadlines keyed by id.
+
+    Each key lives in the bucket for its deadline tick, so schedule/cancel are O(1)
+    and advance() only visits the buckets for ticks that elapsed since the last call.
+    A sweep therefore costs O(expired + keys sharing those buckets), not O(all keys).
+    Deadlines more than one revolution ahead stay in their bucket until due.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 4096, start: float = 0.0) -> None:
+        if tick_seconds <= 0 or slots <= 0:
+            raise ValueError("tick_seconds and slots must be positive")
+        self._tick_seconds = tick_seconds
+        self._buckets: list[dict[str, float]] = [{} for _ in range(slots)]
+        self._slot_of: dict[str, int] = {}
+        self._cursor = self._tick_of(start)  # earliest tick not yet fully processed
+
+    def _tick_of(self, t: float) -> int:
+        return int(t // self._tick_seconds)
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot_of
+
+    def deadline(self, key: str) -> float | None:
+        slot = self._slot_of.get(key)
+        return None if slot is None else self._buckets[slot][key]
+
+    def schedule(self, key: str, deadline: float) -> None:
+        """Set (or move) the deadline for key. Past deadlines fire on the next advance."""
+        self.cancel(key)
+        tick = max(self._tick_of(deadline), self._cursor)
+        slot = tick % len(self._buckets)
+        self._buckets[slot][key] = deadline
+        self._slot_of[key] = slot
+
+    def cancel(self, key: str) -> None:
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            del self._buckets[slot][key]
+
+    def advance(self, now: float) -> list[str]:
+        """Remove and return every key whose deadline is <= now."""
+        target = self._tick_of(now)
+        if target < self._cursor:
+            return []
+        n_slots = len(self._buckets)
+        first = self._cursor if target - self._cursor < n_slots else target - n_slots + 1
+        expired: list[str] = []
+        for tick in range(first, target + 1):
+            bucket = self._buckets[tick % n_slots]
+            if not bucket:
+                continue
+            due = [key for key, deadline in bucket.items() if deadline <= now]
+            for key in due:
+                del bucket[key]
+                del self._slot_of[key]
+            expired.extend(due)
+        # The current tick may still hold deadlines later within it; revisit it next time.
+        self._cursor = target
+        return expired
@@ -1,3 +1,5 @@
+import json
+
 from fastapi.testclient import TestClient
 
 from src.app import app
@@ -209,3 +211,314 @@ def test_create_game_validation_odd_card_count_returns_400():
     data = r.json()
     assert data["code"] == "VALIDATION"
     assert "error" in data
+
+
+def test_timer_websocket_pushes_remaining_time():
+    """The timer socket sends the current state immediately, then ticks from the shared hub."""
+    game = _create_game(countdown_seconds=60)
+    with client.websocket_connect(f"/api/games/{game['gameId']}/timer") as ws:
+        first = ws.receive_json()
+        assert first["status"] == "playing"
+        assert 0 < first["remainingSeconds"] <= 60
+        tick = ws.receive_json()
+        assert tick["status"] == "playing"
+        assert tick["remainingSeconds"] <= first["remainingSeconds"]
+
+
+def test_timer_websocket_missing_game_sends_not_found():
+    with client.websocket_connect("/api/games/nonexistent-id/timer") as ws:
+        assert ws.receive_json() == {"error": "NOT_FOUND"}
+
+
+
+def _receive_event(ws) -> dict:
+    """Next pushed state change, skipping timer ticks."""
+    while True:
+        message = ws.receive_json()
+        if "event" in message:
+            return message
+
+
+def test_timer_websocket_pushes_state_changes():
+    """Flips are pushed over the timer socket as they happen, with the full game state."""
+    game = _create_game(card_count=4, max_bad_guesses=1)
+    game_id = game["gameId"]
+    card_ids = [card["id"] for card in game["board"]]
+    with client.websocket_connect(f"/api/games/{game_id}/timer") as ws:
+        assert "event" not in ws.receive_json()
+
+        client.post(f"/api/games/{game_id}/flip", json={"cardId": card_ids[0]})
+        flipped = _receive_event(ws)
+        assert flipped["event"] == "flipped"
+        assert flipped["status"] == "playing"
+        assert flipped["game"]["board"][0]["isFaceUp"] is True
+        assert flipped["game"]["board"][0]["emoji"]
+
+        client.post(f"/api/games/{game_id}/flip", json={"cardId": card_ids[1]})
+        resolved = _receive_event(ws)
+        assert resolved["version"] == flipped["version"] + 1
+        assert resolved["game"]["state"]["turns"] == 1
+        if resolved["event"] == "matched":
+            assert resolved["game"]["board"][1]["isMatched"] is True
+        else:
+            # A mismatch with maxBadGuesses=1 loses the game; the loss ends the stream.
+            assert (resolved["event"], resolved["status"]) == ("lost", "lost")
+
+
+def test_flip_delta_returns_only_changed_cards():
+    """?delta=true returns the flipped cards with versions; the full views carry the version too."""
+    game = _create_game(card_count=8)
+    game_id = game["gameId"]
+    assert game["version"] == 0
+
+    r = client.post(f"/api/games/{game_id}/flip?delta=true", json={"cardId": "card-0"})
+    assert r.status_code == 200
+    first = r.json()
+    assert set(first) == {"gameId", "version", "baseVersion", "cards", "state"}
+    assert (first["baseVersion"], first["version"]) == (0, 1)
+    assert [c["id"] for c in first["cards"]] == ["card-0"]
+    assert first["cards"][0]["isFaceUp"] is True
+
+    second = client.post(f"/api/games/{game_id}/flip?delta=true", json={"cardId": "card-5"}).json()
+    assert (second["baseVersion"], second["version"]) == (1, 2)
+    assert [c["id"] for c in second["cards"]] == ["card-0", "card-5"]
+    assert second["state"]["turns"] == 1
+
+    full = client.get(f"/api/games/{game_id}").json()
+    assert full["version"] == 2
+    by_id = {c["id"]: c for c in full["board"]}
+    for card in second["cards"]:
+        assert by_id[card["id"]]["isMatched"] == card["isMatched"]
+
+
+def test_get_game_conditional_on_etag():
+    """GET carries the state version as ETag; If-None-Match with it returns 304 until a change."""
+    game = _create_game()
+    game_id = game["gameId"]
+
+    r = client.get(f"/api/games/{game_id}")
+    assert r.status_code == 200
+    assert r.headers["ETag"] == 'W/"0"'
+    assert r.headers["Cache-Control"] == "no-cache"
+
+    r = client.get(f"/api/games/{game_id}", headers={"If-None-Match": 'W/"0"'})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["ETag"] == 'W/"0"'
+
+    flip = client.post(f"/api/games/{game_id}/flip", json={"cardId": "card-0"})
+    assert flip.headers["ETag"] == 'W/"1"'
+    assert flip.headers["Cache-Control"] == "no-store"
+
+    r = client.get(f"/api/games/{game_id}", headers={"If-None-Match": 'W/"0"'})
+    assert r.status_code == 200
+    assert r.json()["version"] == 1
+    assert r.headers["ETag"] == 'W/"1"'
+
+
+def test_turn_resolves_both_cards_in_one_request():
+    """POST /turns flips both cards atomically and returns the flip response shape."""
+    game = _create_game(card_count=4)
+    game_id = game["gameId"]
+
+    r = client.post(f"/api/games/{game_id}/turns", json={"cardIds": ["card-0", "card-1"]})
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert "settings" not in data
+    assert data["state"]["turns"] == 1
+    assert data["version"] == 1
+    first, second = data["board"][0], data["board"][1]
+    # Either matched, or a mismatch with both emojis revealed.
+    assert first["emoji"] and second["emoji"]
+    assert first["isMatched"] == second["isMatched"] == (first["emoji"] == second["emoji"])
+
+
+def test_turn_invalid_card_returns_400_and_changes_nothing():
+    game = _create_game(card_count=4)
+    game_id = game["gameId"]
+    r = client.post(f"/api/games/{game_id}/turns", json={"cardIds": ["card-0", "nope"]})
+    assert r.status_code == 400
+    assert r.json()["code"] == "INVALID_FLIP"
+    assert client.get(f"/api/games/{game_id}").json()["version"] == 0
+
+    r = client.post(f"/api/games/{game_id}/turns", json={"cardIds": ["card-0"]})
+    assert r.status_code == 422
+
+
+def test_bulk_create_streams_one_line_per_game():
+    entry = {"cardCount": 4, "countdownSeconds": 60, "flipBackDelayMs": 500}
+    games = [{"userName": f"player{i}", **entry} for i in range(150)]
+    r = client.post("/api/games/bulk", json={"games": games})
+    assert r.status_code == 201
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [line["userName"] for line in lines] == [g["userName"] for g in games]
+    created = client.get(f"/api/games/{lines[-1]['gameId']}").json()
+    assert created["settings"]["userName"] == "player149"
+
+
+def test_bulk_create_rejects_batch_with_invalid_entry():
+    entry = {"userName": "p", "cardCount": 4, "countdownSeconds": 60, "flipBackDelayMs": 500}
+    r = client.post("/api/games/bulk", json={"games": [entry, {**entry, "cardCount": 5}]})
+    assert r.status_code == 400
+    assert "games[1]" in r.json()["error"]
+    assert client.post("/api/games/bulk", json={"games": []}).status_code == 422
+
+
+def test_create_bounds_flip_back_delay_and_max_bad_guesses():
+    body = {"userName": "p", "cardCount": 4, "countdownSeconds": 60}
+    largest = {**body, "flipBackDelayMs": 60_000, "maxBadGuesses": 1_000}
+    assert client.post("/api/games", json=largest).status_code == 201
+    for too_large in ({"flipBackDelayMs": 60_001}, {"maxBadGuesses": 1_001}):
+        entry = {**largest, **too_large}
+        assert client.post("/api/games", json=entry).status_code == 422
+        r = client.post("/api/games/bulk", json={"games": [largest, entry]})
+        assert r.status_code == 422
+    r = client.post("/api/games", json={**body, "flipBackDelayMs": 5_000_000_000})
+    assert r.status_code == 422
+    r = client.post("/api/games", json={**largest, "maxBadGuesses": 2**31})
+    assert r.status_code == 422
+
+
+def test_create_rejects_overlong_user_name():
+    body = {"cardCount": 4, "countdownSeconds": 60, "flipBackDelayMs": 500}
+    r = client.post("/api/games", json={"userName": "a" * 65, **body})
+    assert r.status_code == 422
+    assert client.post("/api/games", json={"userName": "a" * 64, **body}).status_code == 201
+
+
+def test_create_with_seed_deals_the_same_board():
+    body = {"cardCount": 8, "countdownSeconds": 60, "flipBackDelayMs": 500, "seed": 1018}
+    games = [client.post("/api/games", json={"userName": name, **body}).json() for name in "ab"]
+    assert [g["settings"]["seed"] for g in games] == [1018, 1018]
+
+    revealed = []
+    for game in games:
+        r = client.post(f"/api/games/{game['gameId']}/flip", json={"cardId": "card-5"})
+        revealed.append(r.json()["board"][5]["emoji"])
+    assert revealed[0] is not None and revealed[0] == revealed[1]
+
+    assert _create_game()["settings"]["seed"] is None
+    assert client.post("/api/games", json={"userName": "c", **body, "seed": -1}).status_code == 422
+
+
+def _metric(text: str, sample: str) -> float:
+    for line in text.splitlines():
+        name, _, value = line.rpartition(" ")
+        if name == sample:
+            return float(value)
+    return 0.0
+
+
+def test_metrics_count_flips_and_time_routes():
+    game = _create_game(card_count=4, flip_back_delay_ms=0)
+    game_id = game["gameId"]
+    flips = {
+        outcome: f'memory_game_flips_total{{outcome="{outcome}"}}'
+        for outcome in ("first", "match", "mismatch", "invalid")
+    }
+    flip_requests = (
+        "memory_game_http_request_duration_seconds_count"
+        '{method="POST",route="/api/games/{game_id}/flip"}'
+    )
+    before = client.get("/metrics").text
+
+    client.post(f"/api/games/{game_id}/flip", json={"cardId": "card-0"})
+    second = client.post(f"/api/games/{game_id}/flip", json={"cardId": "card-1"}).json()
+    r = client.post(f"/api/games/{game_id}/flip", json={"cardId": "nope"})
+    assert r.status_code == 400
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    after = r.text
+    matched = second["board"][0]["isMatched"]
+    expected = {"first": 1, "match": int(matched), "mismatch": int(not matched), "invalid": 1}
+    for outcome, sample in flips.items():
+        assert _metric(after, sample) - _metric(before, sample) == expected[outcome], outcome
+    assert _metric(after, flip_requests) - _metric(before, flip_requests) == 3
+    assert _metric(after, 'memory_game_games{status="playing"}') >= 1
+    assert "memory_game_build_view_seconds_count" in after
+    assert 'memory_game_serialize_seconds_count{response="flip"}' in after
+    assert "memory_game_timer_websockets 0" in after
+
+
+def _turn(game_id: str, first: str, second: str) -> dict:
+    r = client.post(f"/api/games/{game_id}/turns", json={"cardIds": [first, second]})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _create_seeded(user_name: str, card_count: int, seed: int) -> str:
+    body = {
+        "userName": user_name,
+        "cardCount": card_count,
+        "countdownSeconds": 60,
+        "flipBackDelayMs": 0,
+        "seed": seed,
+    }
+    r = client.post("/api/games", json=body)
+    assert r.status_code == 201, r.text
+    return r.json()["gameId"]
+
+
+def test_leaderboard_ranks_won_games():
+    card_count, seed = 8, 987_654_321  # games with one seed share a board
+
+    # Learn the board: every turn reveals both cards, matched or not.
+    scout = _create_seeded("Scout", card_count, seed)
+    emojis = {}
+    for i in range(0, card_count, 2):
+        board = _turn(scout, f"card-{i}", f"card-{i + 1}")["board"]
+        emojis.update({card["id"]: card["emoji"] for card in board if card["emoji"]})
+    pairs: dict[str, list[str]] = {}
+    for card_id, emoji in emojis.items():
+        pairs.setdefault(emoji, []).append(card_id)
+
+    quick = _create_seeded("Quick", card_count, seed)
+    for first, second in pairs.values():
+        state = _turn(quick, first, second)["state"]
+    assert state["status"] == "won"
+    slow = _create_seeded("Slow", card_count, seed)
+    (a, _), (b, _) = list(pairs.values())[:2]
+    _turn(slow, a, b)  # one mismatch first
+    for first, second in pairs.values():
+        state = _turn(slow, first, second)["state"]
+    assert state["status"] == "won"
+
+    r = client.get(f"/api/leaderboard/{card_count}", params={"limit": 100})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["cardCount"] == card_count and data["total"] >= 2
+    ours = [e for e in data["entries"] if e["gameId"] in (quick, slow)]
+    assert [(e["userName"], e["turns"], e["badGuesses"]) for e in ours] == [
+        ("Quick", 4, 0),
+        ("Slow", 5, 1),
+    ]
+    assert [e["rank"] for e in data["entries"]] == list(range(1, len(data["entries"]) + 1))
+
+    assert client.get("/api/leaderboard/3").status_code == 422
+    assert client.get(f"/api/leaderboard/{card_count}", params={"limit": 0}).status_code == 422
+
+
+def test_list_player_games_pages_with_a_cursor():
+    created = sorted(_create_game(user_name="Paginated Pat")["gameId"] for _ in range(5))
+    _create_game(user_name="Someone Else")
+
+    pages = []
+    params = {"limit": 2}
+    while True:
+        r = client.get("/api/players/Paginated Pat/games", params=params)
+        assert r.status_code == 200, r.text
+        data = r.json()
+        pages.append([game["gameId"] for game in data["games"]])
+        if data["nextCursor"] is None:
+            break
+        params["cursor"] = data["nextCursor"]
+    assert pages == [created[0:2], created[2:4], created[4:5]]
+
+    game = data["games"][0]
+    assert game["settings"]["userName"] == "Paginated Pat"
+    assert game["state"]["status"] == "playing" and "board" not in game
+    assert client.get("/api/players/Nobody/games").json() == {"games": [], "nextCursor": None}
+    assert client.get("/api/players/Pat/games", params={"limit": 0}).status_code == 422
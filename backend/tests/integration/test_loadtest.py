@@ -0,0 +1,35 @@
+import json
+
+from src.loadtest.cli import main
+from src.loadtest.metrics import OPERATIONS, Recorder
+
+
+def test_in_process_load_test_writes_json(tmp_path, capsys):
+    path = tmp_path / "results.json"
+    exit_code = main([
+        "--players", "3",
+        "--rounds", "2",
+        "--cards", "8",
+        "--think-ms", "0",
+        "--json", str(path),
+    ])
+    assert exit_code == 0
+    result = json.loads(path.read_text())
+    assert result["target"] == "in-process"
+    operations = result["operations"]
+    assert list(operations) == list(OPERATIONS)
+    assert operations["create"]["count"] == 3
+    assert operations["restart"]["count"] == 3
+    assert operations["flip"]["count"] >= 3 * 2 * 8  # every card flipped at least once
+    assert all(stats["errors"] == 0 for stats in operations.values())
+    assert "p99 ms" in capsys.readouterr().out
+
+
+def test_percentiles_are_nearest_rank():
+    recorder = Recorder()
+    for ms in range(1, 101):
+        recorder.record("get", ms / 1e3, ok=ms != 100)
+    stats = recorder.summary(elapsed_seconds=2.0)["get"]
+    assert (stats.count, stats.errors, stats.per_second) == (100, 1, 50.0)
+    assert (round(stats.p50_ms), round(stats.p95_ms), round(stats.p99_ms)) == (50, 95, 99)
+    assert recorder.summary(1.0)["tick"].p99_ms == 0.0
@@ -0,0 +1,96 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from websockets.sync.client import connect
+
+BACKEND = Path(__file__).resolve().parents[2]
+GAME = {"userName": "Alice", "cardCount": 4, "countdownSeconds": 60, "flipBackDelayMs": 0}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def nodes():
+    """Two app instances on local ports, plus a third shard whose node is down."""
+    ports = [_free_port() for _ in range(3)]
+    urls = [f"http://127.0.0.1:{port}" for port in ports]
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+            cwd=BACKEND,
+            env={**os.environ, "SHARD_ID": str(shard), "SHARD_NODES": ",".join(urls)},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for shard, port in enumerate(ports[:2])
+    ]
+    try:
+        for url in urls[:2]:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    httpx.get(f"{url}/health").raise_for_status()
+                    break
+                except httpx.TransportError:
+                    assert time.monotonic() < deadline, f"{url} did not start"
+                    time.sleep(0.1)
+        yield urls
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+def test_requests_for_another_shard_are_forwarded(nodes):
+    first, second = nodes[:2]
+    created = httpx.post(f"{second}/api/games", json=GAME).json()
+    game_id = created["gameId"]
+    assert game_id.startswith("s1-")
+
+    r = httpx.get(f"{first}/api/games/{game_id}")
+    assert r.status_code == 200
+    assert r.json()["board"] == created["board"]
+    etag = r.headers["etag"]
+    r = httpx.get(f"{first}/api/games/{game_id}", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+    r = httpx.post(f"{first}/api/games/{game_id}/flip", json={"cardId": "card-0"})
+    assert r.status_code == 200
+    assert httpx.get(f"{second}/api/games/{game_id}").headers["etag"] == 'W/"1"'
+
+    r = httpx.post(f"{first}/api/games/{game_id}/flip", json={"cardId": "card-0"})
+    assert r.status_code == 400 and r.json()["code"] == "INVALID_FLIP"
+    r = httpx.get(f"{first}/api/games/s1-missing")
+    assert r.status_code == 404
+
+
+def test_local_games_and_unsharded_ids_stay_local(nodes):
+    first = nodes[0]
+    game_id = httpx.post(f"{first}/api/games", json=GAME).json()["gameId"]
+    assert game_id.startswith("s0-")
+    assert httpx.get(f"{first}/api/games/{game_id}").status_code == 200
+    assert httpx.get(f"{first}/api/games/not-sharded").status_code == 404
+
+
+def test_websocket_upgrades_are_forwarded(nodes):
+    first, second = nodes[:2]
+    game_id = httpx.post(f"{second}/api/games", json=GAME).json()["gameId"]
+    with connect(f"ws{first.removeprefix('http')}/api/games/{game_id}/timer") as websocket:
+        message = websocket.recv(timeout=5)
+    assert '"status":"playing"' in message.replace(" ", "")
+
+
+def test_unreachable_shard_answers_502(nodes):
+    r = httpx.get(f"{nodes[0]}/api/games/s2-anything")
+    assert r.status_code == 502
+    assert r.json()["code"] == "SHARD_UNAVAILABLE"
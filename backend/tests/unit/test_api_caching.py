@@ -0,0 +1,13 @@
+from src.api.caching import etag, etag_matches
+
+
+def test_etag_matches_weak_strong_lists_and_star():
+    assert etag(3) == 'W/"3"'
+    assert etag_matches('W/"3"', 3)
+    assert etag_matches('"3"', 3)
+    assert etag_matches('W/"1", W/"3"', 3)
+    assert etag_matches("*", 3)
+    assert not etag_matches('W/"2"', 3)
+    assert not etag_matches('W/"33"', 3)
+    assert not etag_matches(None, 3)
+    assert not etag_matches("", 3)
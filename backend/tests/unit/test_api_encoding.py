@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from src.api.encoding import encode_flip, encode_flip_delta, encode_game
+from src.api.schemas import build_flip_delta_response, build_flip_response, build_response
+from src.domain.game import build_public_delta, build_public_view, create_game, flip_card
+from src.domain.types import GameSession, InternalCard, Settings
+
+
+def _model_json(model) -> bytes:
+    """What FastAPI sends for a response model."""
+    return json.dumps(
+        model.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def _views():
+    settings = Settings(
+        user_name='Zoë "the \\ champ"\n',
+        card_count=8,
+        countdown_seconds=60,
+        flip_back_delay_ms=800,
+        max_bad_guesses=None,
+    )
+    session = create_game("g1", settings, now=1700000000.123456)
+    yield build_public_view(session)
+    session, _ = flip_card(session, "card-0", now=1700000001.0)
+    yield build_public_view(session)
+    session, pair = flip_card(session, "card-1", now=1700000002.0)
+    yield build_public_view(session, reveal_emoji=dict(pair) if pair else None)
+
+    custom = GameSession(
+        game_id="g2",
+        user_name="bob",
+        settings=Settings(
+            user_name="bob",
+            card_count=4,
+            countdown_seconds=30,
+            flip_back_delay_ms=0,
+            max_bad_guesses=2,
+        ),
+        board=[
+            InternalCard("c0", "🦊"),
+            InternalCard("c1", "🦊"),
+            InternalCard("c2", "🐶"),
+            InternalCard("c3", "🐶"),
+        ],
+        status="won",
+        started_at=1000.0,
+        turns=2,
+        bad_guesses=0,
+        flipped_card_ids=[],
+        matched_card_ids={"c0", "c1", "c2", "c3"},
+    )
+    yield build_public_view(custom)
+
+
+@pytest.mark.parametrize("view", list(_views()))
+def test_fast_encoding_matches_response_models(view):
+    assert encode_game(view) == _model_json(build_response(view))
+    assert encode_flip(view) == _model_json(build_flip_response(view))
+    assert encode_game(view) == build_response(view).model_dump_json().encode()
+
+
+def test_fast_delta_encoding_matches_response_model():
+    session = create_game("g1", Settings("bob", 8, 60, 800, None), now=1700000000.5)
+    session, _ = flip_card(session, "card-2", now=1700000001.0)
+    delta = build_public_delta(session, 0b100100, base_version=3)
+    assert encode_flip_delta(delta) == _model_json(build_flip_delta_response(delta))
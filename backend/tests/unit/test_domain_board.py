@@ -0,0 +1,129 @@
+import random
+
+import pytest
+
+from src.domain.board import Board, CardSet, InternalCard, parse_card_index
+from src.domain.game import build_public_view, create_game, flip_card
+from src.domain.types import GameSession, Settings
+
+
+def _settings(card_count: int = 8) -> Settings:
+    return Settings(
+        user_name="alice",
+        card_count=card_count,
+        countdown_seconds=60,
+        flip_back_delay_ms=800,
+    )
+
+
+# --- Board ---
+
+
+def test_parse_card_index_accepts_only_canonical_ids():
+    assert parse_card_index("card-0") == 0
+    assert parse_card_index("card-42") == 42
+    assert parse_card_index("card-01") is None
+    assert parse_card_index("card--1") is None
+    assert parse_card_index("card-") is None
+    assert parse_card_index("c0") is None
+
+
+def test_board_index_of_is_bounded_by_board_size():
+    board = Board(bytes([0, 0, 1, 1]))
+    assert board.index_of("card-3") == 3
+    assert board.index_of("card-4") is None
+    assert board[2] == InternalCard("card-2", board.emoji(2))
+
+
+def test_board_from_cards_keeps_custom_ids_and_emojis():
+    board = Board.from_cards(
+        [InternalCard("c0", "🦊"), InternalCard("c1", "🐶"), InternalCard("c2", "🦊")]
+    )
+    assert board.ids == ("c0", "c1", "c2")
+    assert board.index_of("c2") == 2
+    assert board.index_of("card-2") is None
+    assert board.symbol(0) == board.symbol(2) != board.symbol(1)
+    assert [c.emoji for c in board] == ["🦊", "🐶", "🦊"]
+
+
+def test_board_from_canonical_cards_uses_compact_form():
+    random.seed(1)
+    session = create_game("g1", _settings(), now=1000.0)
+    rebuilt = Board.from_cards(list(session.board))
+    assert rebuilt.ids is None
+    assert rebuilt == session.board
+
+
+# --- CardSet ---
+
+
+def test_card_set_behaves_as_set_of_ids():
+    board = Board(bytes([0, 0, 1, 1]))
+    cards = CardSet(board).with_index(3).with_index(1)
+    assert len(cards) == 2
+    assert "card-1" in cards and "card-3" in cards
+    assert "card-0" not in cards and "nope" not in cards
+    assert list(cards) == ["card-1", "card-3"]
+    assert cards == {"card-1", "card-3"}
+    assert cards.first() == 1
+    assert CardSet.from_ids(board, ["card-3", "card-1"]).mask == cards.mask
+
+
+def test_card_set_from_unknown_id_raises():
+    with pytest.raises(ValueError):
+        CardSet.from_ids(Board(bytes([0, 0])), ["card-9"])
+
+
+# --- Session on top of the engine ---
+
+
+def test_session_accepts_list_board_and_id_collections():
+    session = GameSession(
+        game_id="g1",
+        user_name="alice",
+        settings=_settings(card_count=4),
+        board=[
+            InternalCard("c0", "🦊"),
+            InternalCard("c1", "🦊"),
+            InternalCard("c2", "🐶"),
+            InternalCard("c3", "🐶"),
+        ],
+        status="playing",
+        started_at=1000.0,
+        turns=0,
+        bad_guesses=0,
+        flipped_card_ids=["c2"],
+        matched_card_ids={"c0", "c1"},
+    )
+    assert isinstance(session.board, Board)
+    session, _ = flip_card(session, "c3", now=1000.0)
+    assert session.status == "won"
+    assert session.matched_card_ids == {"c0", "c1", "c2", "c3"}
+    view = build_public_view(session)
+    assert [c.id for c in view.board] == ["c0", "c1", "c2", "c3"]
+    assert all(c.is_matched and c.emoji for c in view.board)
+
+
+def test_mismatch_reveal_uses_board_emojis():
+    board = [InternalCard(f"card-{i}", e) for i, e in enumerate("🍎🍌🍎🍌")]
+    session = GameSession(
+        game_id="g1",
+        user_name="alice",
+        settings=_settings(card_count=4),
+        board=board,
+        status="playing",
+        started_at=1000.0,
+        turns=0,
+        bad_guesses=0,
+        flipped_card_ids=[],
+    )
+    session, _ = flip_card(session, "card-0", now=1000.0)
+    session, mismatch_pair = flip_card(session, "card-1", now=1000.0)
+    assert mismatch_pair == [("card-0", "🍎"), ("card-1", "🍌")]
+    view = build_public_view(session, reveal_emoji=dict(mismatch_pair))
+    assert [(c.is_face_up, c.emoji) for c in view.board] == [
+        (True, "🍎"),
+        (True, "🍌"),
+        (False, None),
+        (False, None),
+    ]
@@ -3,13 +3,19 @@ from collections import Counter
 
 import pytest
 
+from src.domain.board import Board
 from src.domain.game import (
     apply_countdown_if_expired,
+    build_public_delta,
     build_public_view,
     create_game,
+    create_games,
     flip_card,
     get_remaining_seconds,
+    intern_board,
+    play_turn,
     restart_game,
+    seeded_board,
 )
 from src.domain.types import Settings
 from src.errors import InvalidSettings, InvalidFlip
@@ -21,6 +27,7 @@ def _default_settings(
     countdown_seconds: int = 60,
     flip_back_delay_ms: int = 800,
     max_bad_guesses: int | None = None,
+    seed: int | None = None,
 ) -> Settings:
     return Settings(
         user_name=user_name,
@@ -28,6 +35,7 @@ def _default_settings(
         countdown_seconds=countdown_seconds,
         flip_back_delay_ms=flip_back_delay_ms,
         max_bad_guesses=max_bad_guesses,
+        seed=seed,
     )
 
 
@@ -309,3 +317,156 @@ def test_public_view_shows_emoji_when_face_up_or_matched():
             assert card.emoji is not None
         else:
             assert card.emoji is None
+
+
+# --- In-place mutation ---
+
+
+def test_flip_card_does_not_modify_input_session():
+    random.seed(1010)
+    session = create_game("g1", _default_settings(), now=1000.0)
+    id1, id2 = _find_two_matching_card_ids(session)
+    first, _ = flip_card(session, id1, now=1000.0)
+    second, _ = flip_card(first, id2, now=1000.0)
+    assert len(session.flipped_card_ids) == 0
+    assert first.flipped_card_ids == {id1}
+    assert len(first.matched_card_ids) == 0
+    assert second.matched_card_ids == {id1, id2}
+
+
+def test_transaction_rolls_back_in_place_changes_on_error():
+    from src.domain.game import flip_card_in_place
+    from src.domain.transaction import SessionTransaction
+
+    random.seed(1111)
+    session = create_game("g1", _default_settings(), now=1000.0)
+    id1, id2 = _find_two_matching_card_ids(session)
+    flip_card_in_place(session, id1, now=1000.0)
+    before = (session.turns, session.flipped_card_ids, session.matched_card_ids)
+
+    with pytest.raises(RuntimeError):
+        with SessionTransaction(session):
+            flip_card_in_place(session, id2, now=1000.0)
+            assert session.turns == 1
+            raise RuntimeError("save failed")
+
+    assert (session.turns, session.flipped_card_ids, session.matched_card_ids) == before
+
+    with pytest.raises(InvalidFlip):
+        with SessionTransaction(session):
+            flip_card_in_place(session, id1, now=1000.0)
+    assert (session.turns, session.flipped_card_ids, session.matched_card_ids) == before
+
+    with SessionTransaction(session):
+        flip_card_in_place(session, id2, now=1000.0)
+    assert session.matched_card_ids == {id1, id2}
+
+
+def test_public_delta_matches_full_view_for_changed_cards():
+    random.seed(11)
+    session = create_game("g1", _default_settings(card_count=8), now=1000.0)
+    rng = random.Random(2)
+    while session.status == "playing":
+        card_id = f"card-{rng.randrange(8)}"
+        before = session.flipped_card_ids.mask
+        try:
+            updated, pair = flip_card(session, card_id, now=1001.0)
+        except InvalidFlip:
+            continue
+        changed = before | 1 << updated.board.index_of(card_id)
+        reveal = dict(pair) if pair else None
+        delta = build_public_delta(updated, changed, base_version=7, reveal_emoji=reveal)
+        full = build_public_view(updated, reveal_emoji=reveal)
+
+        assert [c.id for c in delta.cards] == [
+            c.id for i, c in enumerate(full.board) if changed >> i & 1
+        ]
+        assert delta.cards == [c for c in full.board if c.id in {d.id for d in delta.cards}]
+        assert delta.state == full.state
+        assert delta.base_version == 7
+        session = updated
+
+
+def test_play_turn_matches_two_single_flips():
+    random.seed(5)
+    session = create_game("g1", _default_settings(card_count=8), now=1000.0)
+    a, b = _find_two_matching_card_ids(session)
+    emoji_a = next(c.emoji for c in session.board if c.id == a)
+    other = next(c.id for c in session.board if c.emoji != emoji_a)
+
+    turned, pair = play_turn(session, a, b, now=1001.0)
+    flipped, _ = flip_card(session, a, now=1001.0)
+    flipped, _ = flip_card(flipped, b, now=1001.0)
+    assert pair is None
+    assert turned == flipped
+    assert turned.turns == 1 and set(turned.matched_card_ids) == {a, b}
+
+    turned, pair = play_turn(session, a, other, now=1001.0)
+    assert [card_id for card_id, _ in pair] == [a, other]
+    assert turned.bad_guesses == 1 and not turned.flipped_card_ids
+
+
+def test_play_turn_rejects_invalid_turns_without_changes():
+    random.seed(5)
+    session = create_game("g1", _default_settings(card_count=8), now=1000.0)
+    for first, second in (("card-0", "card-0"), ("card-0", "nope"), ("nope", "card-0")):
+        with pytest.raises(InvalidFlip):
+            play_turn(session, first, second, now=1001.0)
+
+    mid_turn, _ = flip_card(session, "card-0", now=1001.0)
+    with pytest.raises(InvalidFlip, match="turn is already in progress"):
+        play_turn(mid_turn, "card-1", "card-2", now=1001.0)
+
+
+def test_create_games_validates_all_entries_first():
+    entries = [(f"g{i}", _default_settings(card_count=4 + 2 * i)) for i in range(5)]
+    sessions = create_games(entries, now=1000.0)
+    assert [s.game_id for s in sessions] == [f"g{i}" for i in range(5)]
+    for session, (_, settings) in zip(sessions, entries):
+        assert len(session.board) == settings.card_count
+        assert all(n % 2 == 0 for n in Counter(session.board.codes).values())
+        assert session.started_at == 1000.0
+
+    bad = entries[:2] + [("bad", _default_settings(card_count=5))]
+    with pytest.raises(InvalidSettings, match=r"games\[2\]: card_count must be even"):
+        create_games(bad)
+
+
+def test_seeded_games_share_one_board():
+    a = create_game("g1", _default_settings(user_name="alice", seed=20261018), now=1000.0)
+    b = create_game("g2", _default_settings(user_name="bob", seed=20261018), now=1000.0)
+    c = create_game("g3", _default_settings(seed=20261019), now=1000.0)
+    assert a.board is b.board
+    assert c.board != a.board
+    assert all(n % 2 == 0 for n in Counter(a.board.codes).values())
+
+    # Playing one game does not touch the shared board; restart deals it again.
+    id1, _ = _find_two_matching_card_ids(a)
+    a, _ = flip_card(a, id1, now=1001.0)
+    a = restart_game(a, now=2000.0)
+    assert a.board is b.board
+    assert not a.flipped_card_ids
+
+    bulk = create_games([("g4", _default_settings(seed=20261018)), ("g5", _default_settings())])
+    assert bulk[0].board is b.board
+
+
+def test_intern_board_only_swaps_identical_copies():
+    shared = seeded_board(7, 8)
+    assert intern_board(7, Board(shared.codes)) is shared
+    other = Board(bytes([0, 0, 1, 1, 2, 2, 3, 3]))
+    assert other != shared
+    assert intern_board(7, other) is other
+
+
+def test_create_game_rejects_negative_seed():
+    with pytest.raises(InvalidSettings, match="seed"):
+        create_game("g1", _default_settings(seed=-1))
+
+
+def test_create_game_bounds_flip_back_delay_and_max_bad_guesses():
+    create_game("g1", _default_settings(flip_back_delay_ms=60_000, max_bad_guesses=1_000))
+    with pytest.raises(InvalidSettings, match="flip_back_delay_ms"):
+        create_game("g1", _default_settings(flip_back_delay_ms=60_001))
+    with pytest.raises(InvalidSettings, match="max_bad_guesses"):
+        create_game("g1", _default_settings(max_bad_guesses=1_001))
@@ -0,0 +1,72 @@
+from starlette.routing import Route
+
+from src.api.metrics import route_template
+from src.metrics import Registry
+
+
+def test_render_counters_and_histograms():
+    registry = Registry()
+    flips = registry.counter("flips", "Card flips", labels=("outcome",))
+    flips.labels("match").inc()
+    flips.labels("match").inc(2)
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    series = latency.labels()
+    for value in (0.05, 0.1, 0.5, 3.0):
+        series.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP flips Card flips",
+        "# TYPE flips counter",
+        'flips_total{outcome="match"} 3',
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 2',  # bounds are inclusive
+        'latency_seconds_bucket{le="1.0"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 3.65",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_render_collected_metrics_and_escape_label_values():
+    registry = Registry()
+    registry.gauge(
+        "games", "Games by status", lambda: {"playing": 2, 'a"b\\c\n': 1}, label="status"
+    )
+    registry.gauge("evicted_total", "Evicted games", lambda: {"": 7}, kind="counter")
+
+    assert registry.render().splitlines() == [
+        "# HELP games Games by status",
+        "# TYPE games gauge",
+        'games{status="playing"} 2',
+        'games{status="a\\"b\\\\c\\n"} 1',
+        "# HELP evicted_total Evicted games",
+        "# TYPE evicted_total counter",
+        "evicted_total 7",
+    ]
+
+
+def test_series_are_created_once_per_label_values():
+    registry = Registry()
+    family = registry.counter("requests", "Requests", labels=("method",))
+    assert family.labels("GET") is family.labels("GET")
+    assert family.labels("GET") is not family.labels("POST")
+
+
+def _scope(path: str, route: Route, **path_params: str) -> dict:
+    return {"path": path, "route": route, "path_params": path_params}
+
+
+def test_route_template_puts_the_include_prefix_before_the_route_path():
+    flip = Route("/games/{game_id}/flip", lambda request: None, methods=["POST"])
+    scope = _scope("/api/games/s1-abc/flip", flip, game_id="s1-abc")
+    assert route_template(scope) == "/api/games/{game_id}/flip"
+    health = Route("/health", lambda request: None)
+    assert route_template(_scope("/health", health)) == "/health"
+
+
+def test_route_template_keeps_literal_segments_equal_to_a_parameter():
+    game = Route("/games/{game_id}", lambda request: None)
+    assert route_template(_scope("/api/games/games", game, game_id="games")) == (
+        "/api/games/{game_id}"
+    )
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import types
+
+from src import profiling
+from src.api.profiling import ProfilingMiddleware
+from src.domain.game import create_game
+from src.domain.types import Settings
+
+
+def _session():
+    settings = Settings(user_name="alice", card_count=8, countdown_seconds=60, flip_back_delay_ms=0)
+    return create_game("g1", settings, now=1000.0)
+
+
+def test_spans_record_only_inside_a_profile():
+    module = types.SimpleNamespace(step=lambda session: session.game_id)
+
+    async def fetch():
+        return "done"
+
+    module.fetch = fetch
+    profiling.instrument(module, ["step"], "domain.", session_arg=True)
+    profiling.instrument(module, ["fetch"], "repository.")
+
+    assert module.step(_session()) == "g1"  # no profile: a plain call
+    profile, token = profiling.start()
+    try:
+        module.step(_session())
+        module.step(_session())
+        assert asyncio.run(module.fetch()) == "done"
+    finally:
+        profiling.stop(token)
+    module.step(_session())
+
+    assert profile.card_count == 8
+    assert {name: calls for name, (_, calls) in profile.spans.items()} == {
+        "domain.step": 2,
+        "repository.fetch": 1,
+    }
+    assert "domain.step " in profile.breakdown() and " x2" in profile.breakdown()
+
+
+_flip = profiling.span("domain.flip", lambda session: None, session_arg=True)
+
+
+async def _app(scope, receive, send):
+    _flip(_session())
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def _call(middleware, headers=()):
+    scope = {"type": "http", "method": "POST", "path": "/flip", "headers": list(headers)}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(_message):
+        pass
+
+    asyncio.run(middleware(scope, receive, send))
+
+
+def test_middleware_logs_and_dumps_slow_profiled_requests(tmp_path, caplog):
+    middleware = ProfilingMiddleware(_app, directory=str(tmp_path), slow_ms=0)
+    with caplog.at_level(logging.WARNING, logger="src.api.profiling"):
+        _call(middleware)  # not sampled
+        assert not caplog.records and not list(tmp_path.iterdir())
+
+        _call(middleware, [(b"x-profile", b"1")])
+
+    [record] = caplog.records
+    message = record.getMessage()
+    assert "Slow request POST unmatched" in message
+    assert "card_count=8" in message
+    assert "domain.flip " in message
+    [dump] = tmp_path.iterdir()
+    assert dump.name.endswith("POST_unmatched.prof")
+
+
+def test_middleware_samples_by_rate_and_skips_fast_requests(tmp_path, caplog):
+    with caplog.at_level(logging.WARNING, logger="src.api.profiling"):
+        _call(ProfilingMiddleware(_app, directory=str(tmp_path), sample_rate=1.0, slow_ms=0))
+        _call(ProfilingMiddleware(_app, directory=str(tmp_path), sample_rate=1.0, slow_ms=1e6))
+        _call(ProfilingMiddleware(_app, directory=str(tmp_path), slow_ms=0), [(b"x-profile", b"0")])
+    assert len(caplog.records) == 1
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.domain.board import Board
+from src.domain.game import restart_game_in_place
+from src.domain.types import Settings
+from src.errors import GameNotFound, InvalidFlip
+from src.locks import StripedLock
+from src.services.async_game import AsyncGameService
+from src.services.events import GameEventBus
+from src.services.game import GameService
+from src.storage.async_repository import InlineAsyncRepository, ThreadedAsyncRepository, to_async
+from src.storage.journal import GameJournal
+from src.storage.memory import MemoryGameRepository
+from src.storage.shared import SharedMemoryGameRepository
+from src.storage.sqlite import SqliteGameRepository
+
+
+def _settings(countdown_seconds: int = 60) -> Settings:
+    return Settings(
+        user_name="alice",
+        card_count=4,
+        countdown_seconds=countdown_seconds,
+        flip_back_delay_ms=800,
+        max_bad_guesses=None,
+    )
+
+
+async def _play(service: AsyncGameService) -> None:
+    await service.create_game("g1", _settings(countdown_seconds=10), now=1000.0)
+    view = await service.flip_card("g1", "card-0", now=1001.0)
+    assert view.version == 1 and view.board[0].is_face_up
+    with pytest.raises(InvalidFlip):
+        await service.flip_card("g1", "card-0", now=1001.0)
+    delta = await service.flip_card_delta("g1", "card-1", now=1002.0)
+    assert (delta.base_version, delta.version) == (1, 2)
+    assert {card.id for card in delta.cards} == {"card-0", "card-1"}
+    timer = await service.get_timer("g1", now=1010.0)
+    assert timer.status == "lost"
+    assert await service.get_game_if_changed("g1", lambda v: v == 3, now=1011.0) == (3, None)
+    view = await service.restart_game("g1", now=2000.0)
+    assert view.version == 4 and view.state.status == "playing"
+    with pytest.raises(GameNotFound):
+        await service.get_game("missing")
+
+
+def test_to_async_picks_inline_for_memory(tmp_path):
+    assert isinstance(to_async(MemoryGameRepository()), InlineAsyncRepository)
+    sqlite = SqliteGameRepository(str(tmp_path / "games.db"))
+    shared = SharedMemoryGameRepository(str(tmp_path / "games.slots"), slots=8)
+    try:
+        assert isinstance(to_async(sqlite), ThreadedAsyncRepository)
+        assert isinstance(to_async(shared), ThreadedAsyncRepository)
+    finally:
+        sqlite.close()
+        shared.close()
+
+
+def test_inline_service_never_leaves_the_loop_thread():
+    repo = MemoryGameRepository()
+    loop_thread = None
+    save = repo.save
+
+    def checked_save(session, **kwargs):
+        assert threading.current_thread() is loop_thread
+        save(session, **kwargs)
+
+    repo.save = checked_save
+
+    async def scenario():
+        nonlocal loop_thread
+        loop_thread = threading.current_thread()
+        await _play(AsyncGameService(to_async(repo)))
+
+    asyncio.run(scenario())
+
+
+def test_threaded_service_over_sqlite(tmp_path):
+    repo = SqliteGameRepository(str(tmp_path / "games.db"))
+    try:
+        asyncio.run(_play(AsyncGameService(to_async(repo))))
+        assert repo.find_by_id("g1").version == 4
+    finally:
+        repo.close()
+
+
+def test_shares_sessions_with_sync_service():
+    repo = MemoryGameRepository()
+    locks = StripedLock()
+    bus = GameEventBus()
+    events = []
+    bus.subscribe("g1", events.append)
+    sync_service = GameService(repo, locks=locks, events=bus)
+    service = AsyncGameService(to_async(repo), locks=locks, events=bus)
+    sync_service.create_game("g1", _settings(), now=1000.0)
+    restart_game_in_place(repo.find_by_id("g1"), now=1000.0, board=Board(bytes([0, 1, 0, 1])))
+
+    async def scenario():
+        await service.play_turn("g1", "card-0", "card-2", now=1001.0)
+        return await service.play_turn("g1", "card-1", "card-3", now=1002.0)
+
+    view = asyncio.run(scenario())
+    assert view.state.status == "won"
+    assert sync_service.get_game("g1").version == 2
+    assert [event.kind for event in events] == ["matched", "won"]
+
+
+def test_awaits_journal_durability(tmp_path):
+    journal = GameJournal(str(tmp_path))
+    journal.start()
+    try:
+        repo = MemoryGameRepository()
+        service = AsyncGameService(to_async(repo), journal=journal)
+
+        async def scenario():
+            await service.create_game("g1", _settings(), now=1000.0)
+            batches = service.create_games([("g2", _settings()), ("g3", _settings())], now=1000.0)
+            assert [len(batch) async for batch in batches] == [2]
+            await service.flip_card("g1", "card-0", now=1001.0)
+
+        asyncio.run(scenario())
+    finally:
+        journal.close()
+    recovered = MemoryGameRepository()
+    assert GameJournal(str(tmp_path)).recover(recovered).sessions == 3
+    assert recovered.find_by_id("g1").version == 1
@@ -0,0 +1,119 @@
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import pytest
+
+from src.domain.game import create_game, flip_card
+from src.domain.types import Settings
+from src.errors import InvalidFlip, VersionConflict
+from src.services.game import GameService
+from src.storage.memory import MemoryGameRepository
+
+
+@pytest.fixture(autouse=True)
+def _frequent_thread_switches():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _settings(card_count: int = 100) -> Settings:
+    return Settings(
+        user_name="alice",
+        card_count=card_count,
+        countdown_seconds=120,
+        flip_back_delay_ms=0,
+    )
+
+
+def _hammer(service: GameService, game_id: str, card_count: int, flips: int, seed: int) -> int:
+    """Flip random cards; return how many flips the service accepted."""
+    rng = random.Random(seed)
+    accepted = 0
+    for _ in range(flips):
+        try:
+            service.flip_card(game_id, f"card-{rng.randrange(card_count)}")
+        except InvalidFlip:
+            continue
+        accepted += 1
+    return accepted
+
+
+def _assert_no_lost_flips(repo: MemoryGameRepository, game_id: str, accepted: int) -> None:
+    # Every accepted flip either turned a card face-up or resolved a turn.
+    session = repo.find_by_id(game_id)
+    assert 2 * session.turns + len(session.flipped_card_ids) == accepted
+    assert session.version == accepted
+
+
+def test_concurrent_flips_on_one_game_are_not_lost():
+    repo = MemoryGameRepository()
+    service = GameService(repo)
+    service.create_game("g1", _settings())
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = pool.map(lambda seed: _hammer(service, "g1", 100, 300, seed), range(16))
+        accepted = sum(results)
+
+    assert accepted > 0
+    _assert_no_lost_flips(repo, "g1", accepted)
+
+
+def test_concurrent_flips_on_many_games_are_not_lost():
+    repo = MemoryGameRepository()
+    service = GameService(repo)
+    game_ids = [f"g{i}" for i in range(32)]
+    for game_id in game_ids:
+        service.create_game(game_id, _settings(card_count=20))
+
+    def play(n: int) -> tuple[str, int]:
+        game_id = game_ids[n % len(game_ids)]
+        return game_id, _hammer(service, game_id, 20, 100, n)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(play, range(128)))
+
+    accepted: dict[str, int] = {}
+    for game_id, count in results:
+        accepted[game_id] = accepted.get(game_id, 0) + count
+    for game_id in game_ids:
+        _assert_no_lost_flips(repo, game_id, accepted[game_id])
+
+
+def test_save_with_stale_version_raises_conflict():
+    repo = MemoryGameRepository()
+    session = create_game("g1", _settings(card_count=4), now=1000.0)
+    repo.save(session)
+    session.version = 1
+    repo.save(session, expected_version=0)
+    with pytest.raises(VersionConflict):
+        repo.save(session, expected_version=0)
+
+
+def test_service_retries_after_conflicting_external_write():
+    repo = MemoryGameRepository()
+    service = GameService(repo)
+    service.create_game("g1", _settings(card_count=4))
+    committed = replace(repo.find_by_id("g1"))
+    original_save = repo.save
+    calls = []
+
+    def racing_save(session, *, expected_version=None):
+        if not calls:
+            # Another writer flips card-1 and commits first, so this save conflicts once.
+            external, _ = flip_card(committed, "card-1")
+            external.version = committed.version + 1
+            original_save(external, expected_version=committed.version)
+        calls.append(expected_version)
+        original_save(session, expected_version=expected_version)
+
+    repo.save = racing_save
+    service.flip_card("g1", "card-0")
+
+    session = repo.find_by_id("g1")
+    assert calls == [0, 1]
+    assert session.turns == 1  # external card-1, then the retried card-0, resolved a turn
+    assert session.version == 2
@@ -0,0 +1,78 @@
+import time
+from dataclasses import replace
+
+from src import metrics
+from src.domain.types import Settings
+from src.services.board_pool import BoardPool
+from src.services.game import GameService
+from src.storage.memory import MemoryGameRepository
+
+
+def _settings(countdown_seconds: int = 60) -> Settings:
+    return Settings(
+        user_name="alice",
+        card_count=4,
+        countdown_seconds=countdown_seconds,
+        flip_back_delay_ms=800,
+        max_bad_guesses=None,
+    )
+
+
+def test_get_game_if_changed_skips_view_for_current_version():
+    repo = MemoryGameRepository()
+    service = GameService(repo)
+    service.create_game("g1", _settings(countdown_seconds=10), now=1000.0)
+
+    assert service.get_game_if_changed("g1", lambda v: v == 0, now=1001.0) == (0, None)
+    version, view = service.get_game_if_changed("g1", lambda v: False, now=1001.0)
+    assert version == 0 and view.version == 0
+
+    # Expiry is a change: the version moves and the view is built.
+    version, view = service.get_game_if_changed("g1", lambda v: v == 0, now=1011.0)
+    assert version == 1 and view.state.status == "lost"
+
+
+def test_turn_cut_short_by_the_countdown_counts_only_the_first_flip():
+    service = GameService(MemoryGameRepository())
+    service.create_game("g1", _settings(countdown_seconds=10), now=1000.0)
+    counters = (metrics.FLIP_FIRST, metrics.FLIP_MATCH, metrics.FLIP_MISMATCH)
+    before = [counter.value for counter in counters]
+
+    view = service.play_turn("g1", "card-0", "card-1", now=1011.0)
+
+    assert view.state.status == "lost"
+    assert [counter.value - b for counter, b in zip(counters, before)] == [1, 0, 0]
+
+
+def test_board_pool_supplies_unseeded_boards():
+    pool = BoardPool(size=4, card_counts=[4])
+    assert pool.take(4) is None  # nothing generated yet
+    pool.fill()
+    assert pool.available(4) == 4
+    assert pool.take(6) is None  # card count not pooled
+
+    repo = MemoryGameRepository()
+    service = GameService(repo, boards=pool)
+    service.create_game("g1", _settings(), now=1000.0)
+    service.restart_game("g1", now=1001.0)
+    assert pool.available(4) == 2
+
+    service.create_game("g2", replace(_settings(), seed=42), now=1000.0)
+    assert pool.available(4) == 2  # seeded games use their shared board
+
+
+def test_board_pool_refills_in_background():
+    pool = BoardPool(size=8, card_counts=[4, 6])
+    pool.start()
+    try:
+        deadline = time.monotonic() + 5
+        while pool.available(6) < 8 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.available(4) == pool.available(6) == 8
+        for _ in range(6):
+            assert len(pool.take(4)) == 4
+        while pool.available(4) < 8 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.available(4) == 8
+    finally:
+        pool.close()
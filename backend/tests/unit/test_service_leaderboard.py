@@ -0,0 +1,80 @@
+from src.domain.game import create_game
+from src.domain.types import Settings
+from src.services.game import GameService
+from src.services.leaderboard import Leaderboard
+from src.storage.memory import MemoryGameRepository
+
+
+def _settings(card_count: int = 4, user_name: str = "alice") -> Settings:
+    return Settings(
+        user_name=user_name,
+        card_count=card_count,
+        countdown_seconds=60,
+        flip_back_delay_ms=0,
+        max_bad_guesses=None,
+    )
+
+
+def _won(game_id: str, turns: int, bad_guesses: int, card_count: int = 4, user_name="alice"):
+    session = create_game(game_id, _settings(card_count, user_name), now=1000.0)
+    session.status = "won"
+    session.turns = turns
+    session.bad_guesses = bad_guesses
+    return session
+
+
+def test_leaderboard_ranks_by_turns_then_bad_guesses_then_time():
+    leaderboard = Leaderboard()
+    leaderboard.record_win(_won("slow", turns=3, bad_guesses=1), now=1090.0)
+    leaderboard.record_win(_won("fast", turns=3, bad_guesses=1), now=1010.0)
+    leaderboard.record_win(_won("careless", turns=3, bad_guesses=2), now=1005.0)
+    leaderboard.record_win(_won("best", turns=2, bad_guesses=0), now=1100.0)
+    leaderboard.record_win(_won("other-board", turns=1, bad_guesses=0, card_count=6), now=1001.0)
+
+    top = leaderboard.top(4, 10)
+    assert [entry.game_id for entry in top] == ["best", "fast", "slow", "careless"]
+    assert top[1].seconds == 10.0
+    assert [entry.game_id for entry in leaderboard.top(4, 2)] == ["best", "fast"]
+    assert leaderboard.size(4) == 4
+    assert [entry.game_id for entry in leaderboard.top(6, 10)] == ["other-board"]
+    assert leaderboard.top(8, 10) == [] and leaderboard.size(8) == 0
+
+
+def test_bounded_leaderboard_keeps_only_the_best():
+    leaderboard = Leaderboard(max_entries=2)
+    leaderboard.record_win(_won("a", turns=5, bad_guesses=0), now=1010.0)
+    leaderboard.record_win(_won("b", turns=4, bad_guesses=0), now=1010.0)
+    leaderboard.record_win(_won("c", turns=6, bad_guesses=0), now=1010.0)  # ranks below both
+    assert [entry.game_id for entry in leaderboard.top(4, 10)] == ["b", "a"]
+    leaderboard.record_win(_won("d", turns=2, bad_guesses=0), now=1010.0)
+    assert [entry.game_id for entry in leaderboard.top(4, 10)] == ["d", "b"]
+    assert leaderboard.size(4) == 2
+
+
+def _play_to_win(
+    service: GameService, repo: MemoryGameRepository, game_id: str, now: float
+) -> None:
+    session = repo.find_by_id(game_id)
+    by_symbol: dict[int, list[str]] = {}
+    for index in range(len(session.board)):
+        by_symbol.setdefault(session.board.symbol(index), []).append(session.board.card_id(index))
+    for first, second in by_symbol.values():
+        service.play_turn(game_id, first, second, now=now)
+
+
+def test_service_records_wins_and_restarts_keep_them():
+    leaderboard = Leaderboard()
+    repo = MemoryGameRepository()
+    service = GameService(repo, leaderboard=leaderboard)
+    service.create_game("g1", _settings(), now=1000.0)
+    service.flip_card("g1", "card-0", now=1001.0)  # not a win: nothing recorded
+    assert leaderboard.size(4) == 0
+
+    service.restart_game("g1", now=1002.0)
+    _play_to_win(service, repo, "g1", now=1012.0)
+    [entry] = leaderboard.top(4, 10)
+    assert (entry.game_id, entry.user_name, entry.turns, entry.bad_guesses) == ("g1", "alice", 2, 0)
+    assert entry.seconds == 10.0
+
+    service.restart_game("g1", now=1020.0)
+    assert leaderboard.size(4) == 1
@@ -0,0 +1,19 @@
+from src.sharding import new_game_id, parse_nodes, shard_of
+
+
+def test_game_ids_carry_their_shard():
+    game_id = new_game_id(3)
+    assert game_id.startswith("s3-")
+    assert shard_of(game_id) == 3
+    assert new_game_id(3) != game_id
+
+
+def test_ids_without_a_shard():
+    assert shard_of("0b7c2a1e-5d1f-4c55-9a0e-2f7b1c3d4e5f") is None
+    assert shard_of("bulk") is None
+    assert shard_of("s-1") is None
+
+
+def test_parse_nodes():
+    assert parse_nodes("") == []
+    assert parse_nodes("http://a:8000/, http://b:8000") == ["http://a:8000", "http://b:8000"]
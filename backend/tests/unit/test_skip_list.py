@@ -0,0 +1,52 @@
+import random
+
+from src.skip_list import SkipList
+
+
+def test_skip_list_stays_sorted_through_inserts_and_removes():
+    rng = random.Random(7)
+    skip_list = SkipList(rng=rng)
+    reference: dict[int, str] = {}
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if rng.random() < 0.3:
+            assert skip_list.remove(key) == (key in reference)
+            reference.pop(key, None)
+        else:
+            skip_list.insert(key, str(key))
+            reference[key] = str(key)
+        assert len(skip_list) == len(reference)
+    expected = sorted(reference.items())
+    assert list(skip_list) == expected
+    assert skip_list.first(5) == expected[:5]
+    cursor = expected[10][0]
+    assert skip_list.after(cursor, 5) == expected[11:16]
+    assert skip_list.after(cursor + 0.5, 5) == expected[11:16]
+    assert skip_list.after(expected[-1][0], 5) == []
+    assert skip_list.last() == expected[-1]
+    assert skip_list.pop_last() == expected[-1]
+    assert skip_list.last() == expected[-2]
+
+
+def test_skip_list_from_sorted_matches_inserts():
+    rng = random.Random(3)
+    items = [(key, str(key)) for key in sorted(rng.sample(range(10_000), 500))]
+    skip_list = SkipList.from_sorted(items, rng=rng)
+    assert len(skip_list) == 500 and list(skip_list) == items
+    assert skip_list.last() == items[-1]
+    assert skip_list.after(items[99][0], 3) == items[100:103]
+    skip_list.insert(-1, "first")
+    assert skip_list.remove(items[-1][0]) and skip_list.last() == items[-2]
+    assert skip_list.first(2) == [(-1, "first"), items[0]]
+    assert len(SkipList.from_sorted([])) == 0 and SkipList.from_sorted([]).last() is None
+
+
+def test_skip_list_empty_and_replace():
+    skip_list = SkipList()
+    assert skip_list.last() is None and skip_list.pop_last() is None
+    assert skip_list.first(3) == []
+    skip_list.insert(1, "a")
+    skip_list.insert(1, "b")
+    assert list(skip_list) == [(1, "b")]
+    assert skip_list.pop_last() == (1, "b")
+    assert len(skip_list) == 0 and skip_list.last() is None
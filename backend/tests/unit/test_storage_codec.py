@@ -0,0 +1,110 @@
+import pickle
+import random
+from dataclasses import replace
+
+import pytest
+
+from src.domain.board import InternalCard
+from src.domain.game import create_game, flip_card
+from src.domain.types import GameSession, Settings
+from src.storage.codec import (
+    FORMAT_VERSION,
+    decode_session,
+    encode_session,
+    peek_game_id,
+    peek_status,
+    peek_user_name,
+    peek_version,
+)
+
+
+def _settings(card_count: int = 8, user_name: str = "alice", **overrides) -> Settings:
+    return Settings(
+        user_name=user_name,
+        card_count=card_count,
+        countdown_seconds=60,
+        flip_back_delay_ms=800,
+        **overrides,
+    )
+
+
+def _played(card_count: int, flips: int, **overrides) -> GameSession:
+    random.seed(3)
+    session = create_game("g1", _settings(card_count, **overrides), now=1000.0)
+    for i in range(flips):
+        session, _ = flip_card(session, f"card-{i % card_count}", now=1001.0 + i)
+    return session
+
+
+@pytest.mark.parametrize(
+    "session",
+    [
+        _played(4, 0),
+        _played(20, 7, max_bad_guesses=9),
+        _played(100, 51),
+        _played(12, 3, seed=42),
+        replace(_played(8, 2, user_name="émile 🎲"), status="lost", game_id="s3-ünïcode"),
+    ],
+    ids=["new", "bad-guess-limit", "100-cards", "seeded", "lost-unicode"],
+)
+def test_round_trip(session):
+    data = encode_session(session)
+    decoded, end = decode_session(data)
+    assert decoded == session
+    assert end == len(data)
+    assert decoded.settings == session.settings
+    assert peek_version(data) == session.version
+    assert peek_status(data) == session.status
+    assert peek_game_id(data) == session.game_id
+    assert peek_user_name(data) == session.user_name
+
+
+def test_round_trip_custom_symbols_and_ids():
+    cards = [InternalCard(f"c{i}", emoji) for i, emoji in enumerate("🐶🐱🐶🐱")]
+    session = GameSession(
+        game_id="g1",
+        user_name="bob",
+        settings=_settings(4, "bob"),
+        board=cards,
+        status="playing",
+        started_at=1000.0,
+        turns=1,
+        bad_guesses=0,
+        flipped_card_ids={"c2"},
+        matched_card_ids={"c0", "c2"},
+        version=5,
+    )
+    decoded, _ = decode_session(b"padding" + encode_session(session), offset=7)
+    assert decoded == session
+    assert decoded.board.ids == ("c0", "c1", "c2", "c3")
+
+
+def test_encodings_are_tagged_with_the_format_version():
+    data = encode_session(_played(8, 0))
+    assert data[:4] == b"MGS" + bytes([FORMAT_VERSION])
+    with pytest.raises(ValueError, match="Unsupported session format"):
+        decode_session(b"MGS\xff" + data[4:])
+
+
+def test_rejects_encodings_without_the_prefix():
+    data = encode_session(_played(20, 5))[4:]
+    with pytest.raises(ValueError, match="Not an encoded session"):
+        decode_session(data)
+    with pytest.raises(ValueError, match="Not an encoded session"):
+        peek_game_id(data)
+
+
+def test_rejects_input_shorter_than_the_prefix():
+    data = encode_session(_played(8, 0))
+    for size in range(4):
+        with pytest.raises(ValueError, match="Not an encoded session"):
+            decode_session(data[:size])
+    with pytest.raises(ValueError, match="Not an encoded session"):
+        peek_version(data, offset=len(data) - 2)
+
+
+def test_smaller_than_pickle_at_100_cards():
+    session = _played(100, 51)
+    size = len(encode_session(session))
+    assert size < 300
+    assert size * 4 < len(pickle.dumps(session))
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import random
+import threading
+from dataclasses import replace
+
+import pytest
+
+from src.domain.game import create_game
+from src.domain.types import GameSession, InternalCard, Settings
+from src.errors import InvalidFlip
+from src.services.game import GameService
+from src.storage.codec import decode_session, encode_session
+from src.storage.journal import GameJournal
+from src.storage.memory import MemoryGameRepository
+
+
+def _settings(card_count: int = 8, max_bad_guesses: int | None = 3) -> Settings:
+    return Settings(
+        user_name="alice",
+        card_count=card_count,
+        countdown_seconds=60,
+        flip_back_delay_ms=800,
+        max_bad_guesses=max_bad_guesses,
+    )
+
+
+def _play(service: GameService, game_ids: list[str], steps: int, now: float) -> float:
+    rng = random.Random(7)
+    for _ in range(steps):
+        now += 1.0
+        game_id = rng.choice(game_ids)
+        roll = rng.random()
+        if roll < 0.05:
+            service.restart_game(game_id, now=now)
+        elif roll < 0.08:
+            try:
+                service.play_turn(game_id, *rng.sample([f"card-{i}" for i in range(8)], 2), now=now)
+            except InvalidFlip:
+                pass
+        elif roll < 0.1:
+            service.get_game(game_id, now=now + 120.0)  # expires the game
+        else:
+            try:
+                service.flip_card(game_id, f"card-{rng.randrange(8)}", now=now)
+            except InvalidFlip:
+                pass
+    return now
+
+
+def _sessions(repo: MemoryGameRepository) -> dict[str, GameSession]:
+    return {game_id: repo.find_by_id(game_id) for game_id in repo.game_ids()}
+
+
+def _recover(directory) -> tuple[MemoryGameRepository, object]:
+    repo = MemoryGameRepository()
+    stats = GameJournal(str(directory)).recover(repo)
+    return repo, stats
+
+
+@pytest.fixture
+def journaled(tmp_path):
+    random.seed(3)
+    repo = MemoryGameRepository()
+    journal = GameJournal(str(tmp_path))
+    journal.start()
+    service = GameService(repo, journal=journal)
+    yield repo, journal, service
+    journal.close()
+
+
+def test_codec_round_trip():
+    session = create_game("g1", _settings(), now=1000.0)
+    assert decode_session(encode_session(session)) == (session, len(encode_session(session)))
+
+    custom = GameSession(
+        game_id="g2",
+        user_name="alice",
+        settings=_settings(card_count=4, max_bad_guesses=None),
+        board=[
+            InternalCard("c0", "🦊"),
+            InternalCard("c1", "🦊"),
+            InternalCard("c2", "🐶"),
+            InternalCard("c3", "🐶"),
+        ],
+        status="won",
+        started_at=1000.0,
+        turns=2,
+        bad_guesses=0,
+        flipped_card_ids=[],
+        matched_card_ids={"c0", "c1", "c2", "c3"},
+        version=9,
+    )
+    data = b"xx" + encode_session(custom)
+    assert decode_session(data, 2) == (custom, len(data))
+
+    seeded = create_game("g3", replace(_settings(), seed=2**40), now=1000.0)
+    decoded, _ = decode_session(encode_session(seeded))
+    assert decoded == seeded and decoded.board is seeded.board
+
+
+def test_recover_replays_log(journaled, tmp_path):
+    repo, journal, service = journaled
+    game_ids = [f"g{i}" for i in range(5)]
+    for game_id in game_ids:
+        service.create_game(game_id, _settings(), now=1000.0)
+    _play(service, game_ids, 300, now=1000.0)
+    journal.close()
+
+    recovered, stats = _recover(tmp_path)
+    assert _sessions(recovered) == _sessions(repo)
+    assert stats.sessions == 5
+    assert stats.snapshot_sessions == 0
+
+
+def test_recover_from_snapshot_and_tail(journaled, tmp_path):
+    repo, journal, service = journaled
+    game_ids = [f"g{i}" for i in range(5)]
+    for game_id in game_ids:
+        service.create_game(game_id, _settings(), now=1000.0)
+    now = _play(service, game_ids, 200, now=1000.0)
+    assert service.checkpoint() == 5
+    assert journal.events_since_snapshot == 0
+    service.restart_game("g0", now=now + 1)
+    journal.close()
+
+    recovered, stats = _recover(tmp_path)
+    assert _sessions(recovered) == _sessions(repo)
+    assert stats.snapshot_sessions == 5
+    assert stats.events_replayed == 1
+    assert sorted(os.listdir(tmp_path))[-1].startswith("snapshot-")
+
+
+def test_recover_stops_at_torn_tail(journaled, tmp_path):
+    repo, journal, service = journaled
+    service.create_game("g1", _settings(), now=1000.0)
+    service.flip_card("g1", "card-0", now=1001.0)
+    before = repo.find_by_id("g1").version
+    service.flip_card("g1", "card-1", now=1002.0)
+    journal.close()
+
+    (segment,) = [p for p in tmp_path.iterdir() if p.name.startswith("segment-")]
+    segment.write_bytes(segment.read_bytes()[:-3])
+
+    recovered, stats = _recover(tmp_path)
+    assert stats.events_replayed == 2
+    assert recovered.find_by_id("g1").version == before
+
+
+def test_wait_durable_resolves_once_the_record_is_on_disk(tmp_path):
+    journal = GameJournal(str(tmp_path))
+    journal.start()
+    try:
+        session = create_game("g1", _settings(), now=1000.0)
+
+        async def scenario():
+            lsn = journal.record_create(session, wait=False)
+            await asyncio.wait_for(journal.wait_durable(lsn), timeout=5)
+            return lsn
+
+        assert asyncio.run(scenario()) == 1
+        segments = [name for name in os.listdir(tmp_path) if name.endswith(".log")]
+        assert os.path.getsize(tmp_path / segments[0]) > 0
+    finally:
+        journal.close()
+
+
+def test_service_waits_for_the_fsync_after_releasing_the_game_lock(tmp_path):
+    repo = MemoryGameRepository()
+    GameService(repo).create_game("g1", _settings(), now=1000.0)
+    journal = GameJournal(str(tmp_path))  # not started yet: nothing becomes durable
+    service = GameService(repo, journal=journal)
+    flipper = threading.Thread(target=service.flip_card, args=("g1", "card-0"))
+    flipper.start()
+    try:
+        while repo.find_by_id("g1").version == 0:
+            flipper.join(0.01)
+        assert flipper.is_alive()  # waiting for the journal...
+        lock = service._locks("g1")
+        assert lock.acquire(timeout=5)  # ...without holding the game's lock
+        lock.release()
+    finally:
+        journal.start()
+        flipper.join()
+        journal.close()
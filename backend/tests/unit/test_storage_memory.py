@@ -0,0 +1,145 @@
+from dataclasses import replace
+
+from src.domain.game import create_game
+from src.domain.types import Settings
+from src.storage.memory import MemoryGameRepository, RetentionPolicy
+from src.storage.timing_wheel import TimingWheel
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _session(game_id: str, started_at: float = 1000.0, countdown_seconds: int = 60):
+    settings = Settings(
+        user_name="alice",
+        card_count=4,
+        countdown_seconds=countdown_seconds,
+        flip_back_delay_ms=0,
+    )
+    return create_game(game_id, settings, now=started_at)
+
+
+# --- Timing wheel ---
+
+
+def test_timing_wheel_fires_only_due_keys():
+    wheel = TimingWheel(tick_seconds=1.0, slots=8, start=0.0)
+    wheel.schedule("a", 2.5)
+    wheel.schedule("b", 5.0)
+    wheel.schedule("c", 20.0)  # more than one revolution ahead
+    assert wheel.advance(2.0) == []
+    assert wheel.advance(3.0) == ["a"]
+    assert wheel.advance(5.0) == ["b"]
+    assert wheel.advance(19.9) == []
+    assert wheel.advance(100.0) == ["c"]
+    assert len(wheel) == 0
+
+
+def test_timing_wheel_reschedule_and_cancel():
+    wheel = TimingWheel(tick_seconds=1.0, slots=8, start=0.0)
+    wheel.schedule("a", 2.0)
+    wheel.schedule("a", 6.0)
+    wheel.schedule("b", 3.0)
+    wheel.cancel("b")
+    assert wheel.advance(4.0) == []
+    assert wheel.deadline("a") == 6.0
+    assert wheel.advance(6.0) == ["a"]
+
+
+def test_timing_wheel_past_deadline_fires_on_next_advance():
+    wheel = TimingWheel(tick_seconds=1.0, slots=8, start=10.0)
+    wheel.schedule("late", 1.0)
+    assert wheel.advance(10.0) == ["late"]
+
+
+# --- Retention ---
+
+
+def test_repository_without_retention_keeps_everything():
+    repo = MemoryGameRepository()
+    repo.save(_session("g1"))
+    assert repo.sweep(now=1e12) == 0
+    assert repo.find_by_id("g1") is not None
+
+
+def test_finished_games_evicted_after_finished_ttl():
+    clock = FakeClock(1000.0)
+    repo = MemoryGameRepository(
+        RetentionPolicy(finished_ttl_seconds=300, idle_ttl_seconds=3600), clock=clock
+    )
+    session = _session("g1")
+    repo.save(session)
+    clock.now = 1010.0
+    repo.save(replace(session, status="won"))
+
+    assert repo.sweep(now=1300.0) == 0
+    assert repo.sweep(now=1310.0) == 1
+    assert repo.find_by_id("g1") is None
+    stats = repo.stats()
+    assert (stats.size, stats.evicted_finished, stats.evicted_idle) == (0, 1, 0)
+
+
+def test_idle_playing_games_evicted_after_countdown_plus_idle_ttl():
+    clock = FakeClock(1000.0)
+    repo = MemoryGameRepository(
+        RetentionPolicy(finished_ttl_seconds=300, idle_ttl_seconds=600), clock=clock
+    )
+    repo.save(_session("idle", started_at=1000.0, countdown_seconds=60))
+    repo.save(_session("fresh", started_at=1500.0, countdown_seconds=60))
+
+    assert repo.sweep(now=1659.0) == 0
+    assert repo.sweep(now=1660.0) == 1
+    assert repo.find_by_id("idle") is None
+    assert repo.find_by_id("fresh") is not None
+    assert repo.stats().evicted_idle == 1
+
+
+def test_deleted_games_are_not_counted_as_evicted():
+    clock = FakeClock(1000.0)
+    repo = MemoryGameRepository(
+        RetentionPolicy(finished_ttl_seconds=1, idle_ttl_seconds=1), clock=clock
+    )
+    repo.save(_session("g1"))
+    repo.delete("g1")
+    assert repo.sweep(now=1e6) == 0
+    assert repo.stats().size == 0
+
+
+def test_count_by_status():
+    repo = MemoryGameRepository()
+    repo.save(_session("g1"))
+    repo.save(_session("g2"))
+    repo.save(replace(_session("g3"), status="won"))
+    assert repo.count_by_status() == {"playing": 2, "won": 1, "lost": 0}
+
+
+def test_indexes_follow_saves_deletes_and_evictions():
+    clock = FakeClock(1000.0)
+    repo = MemoryGameRepository(
+        RetentionPolicy(finished_ttl_seconds=10, idle_ttl_seconds=10), clock=clock
+    )
+    for i in range(5):
+        repo.save(_session(f"a{i}"))
+    repo.save(replace(_session("b0"), user_name="bob"))
+    assert repo.find_ids_by("user_name", "alice", limit=3) == ["a0", "a1", "a2"]
+    assert repo.find_ids_by("user_name", "alice", after="a2", limit=3) == ["a3", "a4"]
+    assert repo.find_ids_by("user_name", "carol", limit=3) == []
+
+    session = repo.find_by_id("a1")
+    session.status = "won"  # stored sessions are mutated in place, then saved
+    repo.save(session)
+    assert repo.find_ids_by("status", "won", limit=10) == ["a1"]
+    assert "a1" not in repo.find_ids_by("status", "playing", limit=10)
+    assert repo.count_by_status() == {"playing": 5, "won": 1, "lost": 0}
+
+    repo.delete("a0")
+    assert repo.find_ids_by("user_name", "alice", limit=10) == ["a1", "a2", "a3", "a4"]
+    clock.now = 1015.0
+    assert repo.sweep() == 1  # a1, finished at 1000
+    assert repo.find_ids_by("user_name", "alice", limit=10) == ["a2", "a3", "a4"]
+    assert repo.find_ids_by("status", "won", limit=10) == []
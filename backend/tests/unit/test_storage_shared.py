@@ -0,0 +1,225 @@
+import multiprocessing
+import random
+from dataclasses import replace
+
+import pytest
+
+from src.domain.constants import (
+    BOARD_SEED_MAX,
+    CARD_COUNT_MAX,
+    COUNTDOWN_SECONDS_MAX,
+    FLIP_BACK_DELAY_MS_MAX,
+    MAX_BAD_GUESSES_MAX,
+    USER_NAME_MAX,
+)
+from src.domain.game import create_game
+from src.domain.types import Settings
+from src.errors import StoreFull, VersionConflict
+from src.services.game import GameService
+from src.storage.repository import RetentionPolicy
+from src.storage.shared import SharedMemoryGameRepository
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _session(game_id: str, started_at: float = 1000.0, user_name: str = "alice"):
+    settings = Settings(
+        user_name=user_name,
+        card_count=4,
+        countdown_seconds=60,
+        flip_back_delay_ms=0,
+    )
+    return create_game(game_id, settings, now=started_at)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "games.slots")
+
+
+def test_round_trip_and_delete(path):
+    repo = SharedMemoryGameRepository(path, slots=64)
+    session = _session("g1")
+    repo.save(session)
+    found = repo.find_by_id("g1")
+    assert found == session and found is not session
+    assert repo.game_ids() == ["g1"]
+    repo.delete("g1")
+    assert repo.find_by_id("g1") is None
+    assert repo.stats().size == 0
+    repo.close()
+
+
+def test_compare_and_swap_save(path):
+    repo = SharedMemoryGameRepository(path, slots=64)
+    session = _session("g1")
+    with pytest.raises(VersionConflict):
+        repo.save(session, expected_version=0)  # not stored yet
+    repo.save(session)
+    repo.save(replace(session, version=1), expected_version=0)
+    with pytest.raises(VersionConflict):
+        repo.save(replace(session, version=1), expected_version=0)
+    assert repo.find_by_id("g1").version == 1
+    repo.close()
+
+
+def test_instances_on_one_file_share_games(path):
+    first = SharedMemoryGameRepository(path, slots=64)
+    second = SharedMemoryGameRepository(path, slots=64)
+    first.save(_session("g1"))
+    assert second.find_by_id("g1") == first.find_by_id("g1")
+    second.delete("g1")
+    assert first.find_by_id("g1") is None
+    first.close()
+    second.close()
+
+
+def test_rejects_file_with_other_layout(path):
+    SharedMemoryGameRepository(path, slots=64).close()
+    with pytest.raises(ValueError):
+        SharedMemoryGameRepository(path, slots=128)
+
+
+def test_freed_entries_are_reused_and_probing_skips_them(path):
+    repo = SharedMemoryGameRepository(path, slots=8)
+    for round_ in range(20):  # far more inserts than slots
+        game_ids = [f"g{round_}-{i}" for i in range(6)]
+        for game_id in game_ids:
+            repo.save(_session(game_id))
+        repo.delete(game_ids[0])
+        assert all(repo.find_by_id(game_id) for game_id in game_ids[1:])
+        for game_id in game_ids[1:]:
+            repo.delete(game_id)
+    assert repo.stats().size == 0
+    repo.close()
+
+
+def test_full_store_and_oversized_sessions(path):
+    repo = SharedMemoryGameRepository(path, slots=8, slot_bytes=256)
+    for i in range(6):  # 75% of 8 slots
+        repo.save(_session(f"g{i}"))
+    with pytest.raises(StoreFull):
+        repo.save(_session("g6"))
+    repo.save(_session("g0"))  # updates still fit
+    with pytest.raises(StoreFull):
+        repo.save(_session("big", user_name="a" * 256))
+    repo.close()
+
+
+def test_largest_valid_session_fits_a_default_slot(path):
+    settings = Settings(
+        user_name="\N{GRINNING FACE}" * USER_NAME_MAX,  # 4 UTF-8 bytes each
+        card_count=CARD_COUNT_MAX,
+        countdown_seconds=COUNTDOWN_SECONDS_MAX,
+        flip_back_delay_ms=FLIP_BACK_DELAY_MS_MAX,
+        max_bad_guesses=MAX_BAD_GUESSES_MAX,
+        seed=BOARD_SEED_MAX,
+    )
+    repo = SharedMemoryGameRepository(path, slots=8)
+    session = create_game(f"s99-{'0' * 36}", settings, now=1000.0)
+    repo.save(session)
+    assert repo.find_by_id(session.game_id) == session
+    repo.close()
+
+
+def test_sweep_evicts_by_retention(path):
+    clock = FakeClock(1000.0)
+    repo = SharedMemoryGameRepository(
+        path,
+        RetentionPolicy(finished_ttl_seconds=300, idle_ttl_seconds=3600),
+        slots=64,
+        clock=clock,
+    )
+    playing = _session("playing")
+    finished = _session("finished")
+    repo.save(playing)
+    repo.save(finished)
+    clock.now = 1010.0
+    repo.save(replace(finished, status="won"))
+    clock.now = 1100.0
+    repo.save(replace(finished, status="won", version=1))  # keeps its first expiry
+
+    assert repo.sweep(now=1309.0) == 0
+    assert repo.sweep(now=1310.0) == 1
+    assert repo.find_by_id("finished") is None
+    assert repo.sweep(now=1000.0 + 60 + 3600) == 1
+    stats = repo.stats()
+    assert (stats.size, stats.evicted_finished, stats.evicted_idle) == (0, 1, 1)
+    repo.close()
+
+
+def _flip_in_child(path: str, card_ids: list[str]) -> None:
+    repo = SharedMemoryGameRepository(path, slots=64)
+    service = GameService(repo)
+    for card_id in card_ids:
+        service.flip_card("g1", card_id, now=1001.0)
+    repo.close()
+
+
+def test_other_processes_see_and_update_games(path):
+    repo = SharedMemoryGameRepository(path, slots=64)
+    GameService(repo).create_game("g1", _session("g1").settings, now=1000.0)
+    child = multiprocessing.Process(target=_flip_in_child, args=(path, ["card-0"]))
+    child.start()
+    child.join()
+    assert child.exitcode == 0
+    session = repo.find_by_id("g1")
+    assert session.version == 1 and set(session.flipped_card_ids) == {"card-0"}
+    repo.close()
+
+
+def test_count_by_status(path):
+    repo = SharedMemoryGameRepository(path, slots=64)
+    repo.save(_session("g1"))
+    repo.save(replace(_session("g2"), status="won"))
+    repo.save(replace(_session("g3"), status="won"))
+    repo.delete("g1")
+    assert repo.count_by_status() == {"playing": 0, "won": 2, "lost": 0}
+    repo.close()
+
+
+def test_find_ids_by(path):
+    repo = SharedMemoryGameRepository(path, slots=64)
+    for i in range(5):
+        repo.save(_session(f"a{i}"))
+    repo.save(_session("b0", user_name="bob"))
+    repo.save(replace(_session("a3"), status="lost"))
+    repo.delete("a1")
+    assert repo.find_ids_by("user_name", "alice", limit=3) == ["a0", "a2", "a3"]
+    assert repo.find_ids_by("user_name", "alice", after="a3", limit=3) == ["a4"]
+    assert repo.find_ids_by("status", "lost", limit=3) == ["a3"]
+    assert repo.find_ids_by("user_name", "bob", limit=3) == ["b0"]
+    repo.close()
+
+
+def test_find_ids_by_follows_saves_and_deletes_from_every_instance(path):
+    first = SharedMemoryGameRepository(path, slots=64)
+    second = SharedMemoryGameRepository(path, slots=64)
+    rng = random.Random(3)
+    stored = {}  # game id -> (user name, status)
+    for step in range(400):
+        repo = rng.choice((first, second))
+        game_id = f"g{rng.randrange(40)}"
+        if game_id in stored and rng.random() < 0.3:
+            repo.delete(game_id)
+            del stored[game_id]
+            continue
+        user_name, _ = stored.get(game_id, (rng.choice("abc"), None))
+        status = rng.choice(("playing", "won", "lost"))
+        repo.save(replace(_session(game_id, user_name=user_name), status=status))
+        stored[game_id] = (user_name, status)
+        for index, field in (("user_name", 0), ("status", 1)):
+            for value in ("a", "b", "c", "playing", "won", "lost"):
+                expected = sorted(g for g, entry in stored.items() if entry[field] == value)
+                assert repo.find_ids_by(index, value, limit=64) == expected, step
+    assert first.find_ids_by("user_name", "a", after="g3", limit=2) == sorted(
+        g for g, (user_name, _) in stored.items() if user_name == "a" and g > "g3"
+    )[:2]
+    first.close()
+    second.close()
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import struct
+from dataclasses import replace
+
+import pytest
+
+from src.domain.game import create_game
+from src.domain.types import Settings
+from src.services.game import GameService
+from src.storage.memory import MemoryGameRepository
+from src.storage.repository import RetentionPolicy
+from src.storage.snapshot import read_snapshot, restore_snapshot
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _session(game_id: str, user_name: str = "alice", started_at: float = 1000.0):
+    settings = Settings(
+        user_name=user_name,
+        card_count=4,
+        countdown_seconds=60,
+        flip_back_delay_ms=0,
+    )
+    return create_game(game_id, settings, now=started_at)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "games.snap")
+
+
+def test_restore_marks_games_that_ran_out_of_time_lost(path):
+    repo = MemoryGameRepository()
+    repo.save(_session("fresh", started_at=1050.0))
+    repo.save(_session("stale", started_at=1000.0))
+    repo.save(replace(_session("won", user_name="bob", started_at=900.0), status="won"))
+    assert GameService(repo).save_snapshot(path) == 3
+
+    restored = MemoryGameRepository()
+    stats = restore_snapshot(path, restored, now=1080.0)  # stale's countdown ended at 1060
+    assert (stats.sessions, stats.expired) == (3, 1)
+    assert restored.find_by_id("fresh") == repo.find_by_id("fresh")
+    assert restored.find_by_id("won") == repo.find_by_id("won")
+    stale = restored.find_by_id("stale")
+    assert stale.status == "lost" and stale.version == repo.find_by_id("stale").version + 1
+    assert restored.find_ids_by("user_name", "alice", limit=10) == ["fresh", "stale"]
+    assert restored.find_ids_by("status", "lost", limit=10) == ["stale"]
+    assert restored.count_by_status() == {"playing": 1, "won": 1, "lost": 1}
+
+    restored.delete("fresh")  # the bulk-built indexes take updates like any other
+    restored.save(replace(_session("later"), status="won"))
+    assert restored.find_ids_by("user_name", "alice", limit=10) == ["later", "stale"]
+    assert restored.find_ids_by("status", "won", limit=10) == ["later", "won"]
+
+
+def test_restored_games_are_scheduled_for_eviction(path):
+    repo = MemoryGameRepository()
+    repo.save(_session("playing"))
+    repo.save(replace(_session("won"), status="won"))
+    GameService(repo).save_snapshot(path)
+
+    clock = FakeClock(1000.0)
+    restored = MemoryGameRepository(
+        RetentionPolicy(finished_ttl_seconds=30, idle_ttl_seconds=30), clock=clock
+    )
+    restore_snapshot(path, restored, now=1000.0)
+    assert restored.sweep(now=1031.0) == 1  # won: restored at 1000 with a 30s TTL
+    assert restored.find_by_id("won") is None
+    assert restored.sweep(now=1091.0) == 1  # playing: countdown ends at 1060, then 30s idle
+    assert restored.stats().size == 0
+
+
+def test_restore_without_a_snapshot_loads_nothing(path):
+    repo = MemoryGameRepository()
+    assert restore_snapshot(path, repo).sessions == 0
+    assert repo.stats().size == 0
+
+
+def test_load_needs_an_empty_store(path):
+    repo = MemoryGameRepository()
+    repo.save(_session("g1"))
+    GameService(repo).save_snapshot(path)
+    with pytest.raises(ValueError):
+        restore_snapshot(path, repo)
+
+
+def test_rejects_other_files(path):
+    with open(path, "wb") as f:
+        f.write(b"MGSLOT01" + bytes(32))
+    with pytest.raises(ValueError, match="Not a snapshot file"):
+        read_snapshot(path)
+
+
+def test_rejects_truncated_files(path):
+    repo = MemoryGameRepository()
+    repo.save(_session("g1"))
+    repo.save(_session("g2"))
+    GameService(repo).save_snapshot(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    for size in range(16, len(data)):  # every cut past the file header
+        with open(path, "wb") as f:
+            f.write(data[:size])
+        with pytest.raises(ValueError, match="Truncated snapshot file"):
+            read_snapshot(path)
+
+
+def test_failed_shutdown_snapshot_is_logged_and_teardown_continues(path, monkeypatch, caplog):
+    from src import app
+
+    class FailingService:
+        def save_snapshot(self, snapshot_path: str) -> int:
+            raise struct.error("argument out of range")
+
+    class Pool:
+        closed = False
+
+        def start(self) -> None:
+            pass
+
+        def close(self) -> None:
+            self.closed = True
+
+    pool = Pool()
+    monkeypatch.setattr(app, "get_snapshot_path", lambda: path)
+    monkeypatch.setattr(app, "get_journal", lambda: None)
+    monkeypatch.setattr(app, "get_board_pool", lambda: pool)
+    monkeypatch.setattr(app, "get_game_service", FailingService)
+
+    async def run():
+        async with app.lifespan(app.app):
+            pass
+
+    with caplog.at_level(logging.ERROR, logger="src.app"):
+        asyncio.run(run())
+    assert pool.closed
+    assert "Saving the game snapshot" in caplog.text
@@ -0,0 +1,134 @@
+import random
+from dataclasses import replace
+
+import pytest
+
+from src.domain.game import create_game, flip_card
+from src.domain.types import GameSession, InternalCard, Settings
+from src.errors import VersionConflict
+from src.storage.repository import RetentionPolicy
+from src.storage.sqlite import SqliteGameRepository
+
+
+def _settings(card_count: int = 8, max_bad_guesses: int | None = 3) -> Settings:
+    return Settings(
+        user_name="alice",
+        card_count=card_count,
+        countdown_seconds=60,
+        flip_back_delay_ms=800,
+        max_bad_guesses=max_bad_guesses,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repository = SqliteGameRepository(str(tmp_path / "games.db"))
+    yield repository
+    repository.close()
+
+
+def test_round_trip_preserves_session(repo):
+    random.seed(5)
+    session = create_game("g1", _settings(), now=1000.0)
+    session, _ = flip_card(session, "card-3", now=1001.0)
+    repo.save(session)
+    loaded = repo.find_by_id("g1")
+    assert loaded == session
+    assert loaded.board.ids is None
+    assert repo.find_by_id("missing") is None
+
+
+def test_round_trip_custom_board(repo):
+    session = GameSession(
+        game_id="g1",
+        user_name="alice",
+        settings=_settings(card_count=4, max_bad_guesses=None),
+        board=[
+            InternalCard("c0", "🦊"),
+            InternalCard("c1", "🦊"),
+            InternalCard("c2", "🐶"),
+            InternalCard("c3", "🐶"),
+        ],
+        status="playing",
+        started_at=1000.0,
+        turns=1,
+        bad_guesses=0,
+        flipped_card_ids=["c2"],
+        matched_card_ids={"c0", "c1"},
+    )
+    repo.save(session)
+    assert repo.find_by_id("g1") == session
+
+
+def test_compare_and_swap_save(repo):
+    session = create_game("g1", _settings(), now=1000.0)
+    repo.save(session)
+    repo.save(replace(session, turns=1, version=1), expected_version=0)
+    with pytest.raises(VersionConflict) as exc_info:
+        repo.save(replace(session, turns=2, version=1), expected_version=0)
+    assert exc_info.value.actual == 1
+    assert repo.find_by_id("g1").turns == 1
+    with pytest.raises(VersionConflict):
+        repo.save(replace(session, game_id="nope", version=1), expected_version=0)
+
+
+def test_delete_and_sweep(tmp_path):
+    now = [1000.0]
+    repo = SqliteGameRepository(
+        str(tmp_path / "games.db"),
+        RetentionPolicy(finished_ttl_seconds=300, idle_ttl_seconds=600),
+        clock=lambda: now[0],
+    )
+    repo.save(create_game("idle", _settings(), now=1000.0))
+    repo.save(create_game("gone", _settings(), now=1000.0))
+    repo.delete("gone")
+    won = replace(create_game("won", _settings(), now=1000.0), status="won")
+    repo.save(won)
+    now[0] = 2000.0
+    repo.save(won)  # saving a finished game again keeps its original expiry
+
+    assert repo.sweep(now=1299.0) == 0
+    assert repo.sweep(now=1300.0) == 1
+    assert repo.sweep(now=1660.0) == 1
+    stats = repo.stats()
+    assert (stats.size, stats.evicted_finished, stats.evicted_idle) == (0, 1, 1)
+    repo.close()
+
+
+def test_save_many_stores_all_sessions(repo):
+    sessions = [create_game(f"g{i}", _settings(), now=1000.0) for i in range(20)]
+    repo.save_many(sessions)
+    assert sorted(repo.game_ids()) == sorted(s.game_id for s in sessions)
+    assert repo.find_by_id("g7") == sessions[7]
+
+
+def test_round_trip_seeded_board_is_shared(repo):
+    session = create_game("g1", replace(_settings(), seed=99), now=1000.0)
+    repo.save(session)
+    loaded = repo.find_by_id("g1")
+    assert loaded == session
+    assert loaded.board is session.board
+
+
+def test_count_by_status(repo):
+    repo.save(create_game("g1", _settings(), now=1000.0))
+    repo.save(replace(create_game("g2", _settings(), now=1000.0), status="lost"))
+    assert repo.count_by_status() == {"playing": 1, "won": 0, "lost": 1}
+
+
+def test_find_ids_by_pages_through_an_index(repo):
+    for i in range(5):
+        repo.save(create_game(f"a{i}", _settings(), now=1000.0))
+    repo.save(replace(create_game("b0", _settings(), now=1000.0), user_name="bob"))
+    repo.save(replace(create_game("a2", _settings(), now=1000.0), status="won"))
+    assert repo.find_ids_by("user_name", "alice", limit=3) == ["a0", "a1", "a2"]
+    assert repo.find_ids_by("user_name", "alice", after="a2", limit=3) == ["a3", "a4"]
+    assert repo.find_ids_by("status", "won", limit=3) == ["a2"]
+    repo.delete("a2")
+    assert repo.find_ids_by("status", "won", limit=3) == []
+    plan = repo._connection().execute(
+        "EXPLAIN QUERY PLAN SELECT game_id FROM games WHERE user_name = ? AND game_id > ? "
+        "ORDER BY game_id LIMIT ?",
+        ("alice", "", 3),
+    ).fetchall()
+    assert "games_user_name" in str(plan)
@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+from src.domain.board import Board
+from src.domain.game import restart_game_in_place
+from src.domain.types import Settings
+from src.services.events import GameEventBus
+from src.services.game import GameService
+from src.services.timer_hub import GAME_GONE, TimerHub
+from src.storage.memory import MemoryGameRepository
+
+
+def _settings(countdown_seconds: int = 60) -> Settings:
+    return Settings(
+        user_name="alice",
+        card_count=4,
+        countdown_seconds=countdown_seconds,
+        flip_back_delay_ms=800,
+        max_bad_guesses=None,
+    )
+
+
+def test_get_timer_persists_expiry():
+    repo = MemoryGameRepository()
+    service = GameService(repo)
+    service.create_game("g1", _settings(countdown_seconds=10), now=1000.0)
+    state = service.get_timer("g1", now=1005.0)
+    assert (state.remaining_seconds, state.status) == (5, "playing")
+    state = service.get_timer("g1", now=1010.0)
+    assert (state.remaining_seconds, state.status) == (0, "lost")
+    assert repo.find_by_id("g1").status == "lost"
+
+
+def test_hub_fans_out_per_game_and_drops_finished_games():
+    repo = MemoryGameRepository()
+    service = GameService(repo)
+    now = time.time()
+    service.create_game("g1", _settings(), now=now)
+    service.create_game("g2", _settings(), now=now)
+    calls = []
+    get_timer = service.get_timer
+    service.get_timer = lambda game_id: calls.append(game_id) or get_timer(game_id)
+    hub = TimerHub(service, interval_seconds=0.01)
+
+    async def scenario():
+        a = hub.subscribe("g1")
+        b = hub.subscribe("g1")
+        c = hub.subscribe("g2")
+        gone = hub.subscribe("missing")
+        assert hub.subscriber_count() == 4
+
+        first_a, first_b, first_c = await asyncio.gather(a.get(), b.get(), c.get())
+        assert first_a == first_b and first_a.status == "playing"
+        assert first_c.status == "playing"
+        assert await gone.get() is GAME_GONE
+        assert calls.count("g1") == 1  # computed once per game per tick
+
+        hub.unsubscribe("g1", a)
+        repo.find_by_id("g2").status = "won"
+        while (await c.get()).status != "won":
+            pass
+        assert hub.subscriber_count() == 1  # only b is left
+        hub.unsubscribe("g1", b)
+        hub.unsubscribe("g1", b)  # unsubscribing twice is a no-op
+        assert hub.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def _create_fixed_game(service: GameService, repo: MemoryGameRepository) -> list[str]:
+    """Create g1 with the board (A, B, A, B); returns its card ids."""
+    service.create_game("g1", _settings(), now=time.time())
+    restart_game_in_place(repo.find_by_id("g1"), board=Board(bytes([0, 1, 0, 1])))
+    return list(repo.find_by_id("g1").board.card_ids)
+
+
+def test_service_publishes_event_kinds():
+    repo = MemoryGameRepository()
+    bus = GameEventBus()
+    service = GameService(repo, events=bus)
+    a, c, b, d = _create_fixed_game(service, repo)
+    events = []
+    bus.subscribe("g1", events.append)
+
+    service.flip_card("g1", a)
+    service.flip_card("g1", c)
+    service.flip_card("g1", a)
+    service.flip_card("g1", b)
+    service.flip_card("g1", c)
+    service.flip_card("g1", d)
+    service.restart_game("g1")
+    service.get_game("g1", now=time.time() + 120)
+
+    assert [e.kind for e in events] == [
+        "flipped", "mismatched", "flipped", "matched", "flipped", "won", "restarted", "lost",
+    ]
+    assert [e.version for e in events] == list(range(1, 9))
+    mismatch = {card.id: card.emoji for card in events[1].view.board if card.is_face_up}
+    assert set(mismatch) == {a, c} and all(mismatch.values())
+
+
+def test_hub_pushes_events_between_ticks():
+    repo = MemoryGameRepository()
+    bus = GameEventBus()
+    service = GameService(repo, events=bus)
+    a, c, b, d = _create_fixed_game(service, repo)
+    hub = TimerHub(service, events=bus, interval_seconds=60)
+
+    async def scenario():
+        queue = hub.subscribe("g1")
+        for card_id in (a, b, c, d):
+            await asyncio.to_thread(service.flip_card, "g1", card_id)
+        kinds = [(await queue.get()).kind for _ in range(4)]
+        assert kinds == ["flipped", "matched", "flipped", "won"]
+        assert hub.subscriber_count() == 0
+        assert not bus.has_subscribers("g1")
+
+    asyncio.run(scenario())
+